@@ -9,6 +9,7 @@ extern "C" {
 #endif
 
 #include "pycore_freelist.h"   // _PyFreeListState
+#include "pycore_lock.h"       // PyMutex
 
 /* GC information is stored BEFORE the object structure. */
 typedef struct {
@@ -332,6 +333,14 @@ struct _gc_runtime_state {
     /* Which of the old spaces is the visited space */
     int visited_space;
 
+    /* Are the objects tallied by type? See gc.enable_type_stats() */
+    int type_stats_enabled;
+    /* Dict of the statistics of the current cycle, keyed by the names of
+       the types so that they are not kept alive, or NULL */
+    PyObject *type_stats_pending;
+    /* Dict of the statistics of the last complete cycle, or NULL */
+    PyObject *type_stats;
+
 #ifdef Py_GIL_DISABLED
     /* This is the number of objects that survived the last full
        collection. It approximates the number of long lived objects
@@ -356,6 +365,9 @@ struct _gc_runtime_state {
         /* Set enabled=1 when the first background thread is created. */
         int enable_on_thread_created;
     } immortalize;
+
+    /* Protects type_stats, which is replaced after the collections */
+    PyMutex type_stats_mutex;
 #endif
 };
 
@@ -379,6 +391,9 @@ extern void _PyGC_Unfreeze(PyInterpreterState *interp);
 /* Number of frozen objects */
 extern Py_ssize_t _PyGC_GetFreezeCount(PyInterpreterState *interp);
 
+extern void _PyGC_EnableTypeStats(PyInterpreterState *interp, int enable);
+extern PyObject *_PyGC_GetTypeStats(PyInterpreterState *interp);
+
 extern PyObject *_PyGC_GetObjects(PyInterpreterState *interp, int generation);
 extern PyObject *_PyGC_GetReferrers(PyInterpreterState *interp, PyObject *objs);
 
@@ -56,6 +56,21 @@ struct _import_runtime_state {
            Modules are added there and looked up in _imp.find_extension(). */
         _Py_hashtable_t *hashtable;
     } extensions;
+    struct {
+        /* A lock to guard the cache. */
+        PyMutex mutex;
+        /* The contents of bytecode files read or written by the path based
+           loaders of any interpreter, keyed by path.  Entries are only
+           added while the cache is enabled (see _imp._shared_bytecode()).
+           The loaders validate the data as if it was read from the file. */
+        _Py_hashtable_t *hashtable;
+        /* The oldest and newest entries, see bytecode_cache_value. */
+        struct bytecode_cache_value *first;
+        struct bytecode_cache_value *last;
+        int enabled;
+        /* The total size of the cached data, in bytes. */
+        size_t size;
+    } bytecode;
     /* Package context -- the full module name for package imports */
     const char * pkgcontext;
 };
@@ -100,6 +100,10 @@ struct _tracemalloc_runtime_state {
     /* domain (unsigned int) => traces (_Py_hashtable_t).
        Protected by TABLES_LOCK(). */
     _Py_hashtable_t *domains;
+    /* traceback (traceback_t*) => statistics of the memory blocks allocated
+       at this traceback, or NULL if no checkpoint was taken.
+       Protected by TABLES_LOCK(). */
+    _Py_hashtable_t *stats;
 
     struct tracemalloc_traceback empty_traceback;
 
@@ -164,6 +168,16 @@ extern PyObject* _PyTraceMalloc_GetTracedMemory(void);
 /* Set the peak size of traced memory blocks to the current size */
 extern void _PyTraceMalloc_ResetPeak(void);
 
+/* Start tracking the memory allocated per traceback, and record the current
+   state as the reference of _PyTraceMalloc_GetCheckpointDiff() */
+extern int _PyTraceMalloc_Checkpoint(void);
+
+/* Get the limit tracebacks whose memory changed the most since the last
+   checkpoint as a list of tuples, all of them if limit is negative.  Take a
+   new checkpoint if checkpoint is non-zero. */
+extern PyObject* _PyTraceMalloc_GetCheckpointDiff(Py_ssize_t limit,
+                                                  int checkpoint);
+
 #ifdef __cplusplus
 }
 #endif
@@ -11,6 +11,7 @@
 from .exceptions import *
 from .futures import *
 from .locks import *
+from .profiler import *
 from .protocols import *
 from .runners import *
 from .queues import *
@@ -28,6 +29,7 @@
            exceptions.__all__ +
            futures.__all__ +
            locks.__all__ +
+           profiler.__all__ +
            protocols.__all__ +
            runners.__all__ +
            queues.__all__ +
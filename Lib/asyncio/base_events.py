@@ -438,6 +438,7 @@ def __init__(self):
         self.slow_callback_duration = 0.1
         self._current_handle = None
         self._task_factory = None
+        self._profiler = None
         self._coroutine_origin_tracking_enabled = False
         self._coroutine_origin_tracking_saved_depth = None
 
@@ -1987,7 +1988,12 @@ def _run_once(self):
             elif timeout < 0:
                 timeout = 0
 
+        profiler = self._profiler
+        if profiler is not None:
+            profiler._select_started()
         event_list = self._selector.select(timeout)
+        if profiler is not None:
+            profiler._select_finished()
         self._process_events(event_list)
         # Needed to break cycles when an exception occurs.
         event_list = None
@@ -2017,16 +2023,23 @@ def _run_once(self):
                 try:
                     self._current_handle = handle
                     t0 = self.time()
-                    handle._run()
+                    if profiler is not None:
+                        profiler._run_handle(handle)
+                    else:
+                        handle._run()
                     dt = self.time() - t0
                     if dt >= self.slow_callback_duration:
                         logger.warning('Executing %s took %.3f seconds',
                                        _format_handle(handle), dt)
                 finally:
                     self._current_handle = None
+            elif profiler is not None:
+                profiler._run_handle(handle)
             else:
                 handle._run()
         handle = None  # Needed to break cycles when an exception occurs.
+        if profiler is not None:
+            profiler._iteration_finished()
 
     def _set_coroutine_origin_tracking(self, enabled):
         if bool(enabled) == bool(self._coroutine_origin_tracking_enabled):
@@ -2043,6 +2056,18 @@ def _set_coroutine_origin_tracking(self, enabled):
 
         self._coroutine_origin_tracking_enabled = enabled
 
+    def get_profiler(self):
+        """Return the profiler of the loop, or None."""
+        return self._profiler
+
+    def set_profiler(self, profiler):
+        """Set the profiler of the callbacks and tasks run by the loop.
+
+        profiler should be an asyncio.LoopProfiler, or None to stop
+        profiling.  It is used from the next iteration of the loop.
+        """
+        self._profiler = profiler
+
     def get_debug(self):
         return self._debug
 
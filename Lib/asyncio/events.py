@@ -628,6 +628,14 @@ def get_debug(self):
     def set_debug(self, enabled):
         raise NotImplementedError
 
+    # Profiler management.
+
+    def get_profiler(self):
+        raise NotImplementedError
+
+    def set_profiler(self, profiler):
+        raise NotImplementedError
+
 
 class AbstractEventLoopPolicy:
     """Abstract policy for accessing the event loop."""
@@ -0,0 +1,214 @@
+"""Profiling of the callbacks and tasks run by an event loop."""
+
+__all__ = ('LoopProfiler', 'TaskStats', 'Histogram')
+
+import bisect
+import collections
+import time
+import weakref
+
+from . import tasks
+
+
+# The step and wakeup callbacks of the tasks are bound to them
+_TASK_TYPES = (tasks.Task, tasks._PyTask)
+
+# Upper bounds, in seconds, of the buckets of the histograms
+_BOUNDS = (1e-05, 2e-05, 5e-05, 0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005,
+           0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+
+class Histogram:
+    """Histogram of durations in seconds.
+
+    counts[i] is the number of durations d with bounds[i-1] < d <= bounds[i],
+    the last count is the number of durations longer than the last bound.
+    """
+
+    def __init__(self, bounds=_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} count={self.count} '
+                f'total={self.total:.6f} max={self.max:.6f}>')
+
+    def add(self, duration):
+        """Add a duration to the histogram."""
+        self.counts[bisect.bisect_left(self.bounds, duration)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def as_dict(self):
+        return {
+            'bounds': list(self.bounds),
+            'counts': list(self.counts),
+            'count': self.count,
+            'total': self.total,
+            'max': self.max,
+        }
+
+
+class TaskStats:
+    """Statistics of the steps of a task run by a profiled event loop.
+
+    The wall time goes from the start of the first step of the task to the
+    end of its last step, or to now if the task is not done yet.  It is
+    split into the running time, spent in the steps of the task, and the
+    awaiting time, during which the task waited for a future or for its
+    turn to run.  The CPU time is the part of the running time during which
+    the thread used the CPU, as measured by time.thread_time().
+    """
+
+    def __init__(self, task, start_time):
+        self.name = task.get_name()
+        coro = task.get_coro()
+        self.coro = getattr(coro, '__qualname__', None) or repr(coro)
+        self.start_time = start_time
+        self.end_time = None
+        self.steps = 0
+        self.running_time = 0.0
+        self.cpu_time = 0.0
+        self.max_step_time = 0.0
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} name={self.name!r} '
+                f'coro={self.coro} steps={self.steps} '
+                f'running_time={self.running_time:.6f} '
+                f'awaiting_time={self.awaiting_time:.6f}>')
+
+    @property
+    def done(self):
+        return self.end_time is not None
+
+    @property
+    def wall_time(self):
+        end_time = self.end_time
+        if end_time is None:
+            end_time = time.perf_counter()
+        return end_time - self.start_time
+
+    @property
+    def awaiting_time(self):
+        return max(self.wall_time - self.running_time, 0.0)
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'coro': self.coro,
+            'done': self.done,
+            'steps': self.steps,
+            'wall_time': self.wall_time,
+            'running_time': self.running_time,
+            'awaiting_time': self.awaiting_time,
+            'cpu_time': self.cpu_time,
+            'max_step_time': self.max_step_time,
+        }
+
+
+class LoopProfiler:
+    """Profiler of the callbacks and tasks run by an event loop.
+
+    Install it with loop.set_profiler().  Unlike the debug mode, it does
+    not change the behavior of the loop and only costs a few clock reads
+    per callback.
+
+    The iterations histogram holds the time each iteration of the loop
+    spends running callbacks and processing I/O events, excluding the time
+    waiting for events, which is summed in idle_time.  The callbacks
+    histogram holds the durations of all callbacks, task steps included.
+
+    Callbacks running for at least slow_callback_duration seconds are
+    recorded in slow_callbacks, at most max_slow_callbacks of them, and the
+    statistics of at most max_finished_tasks finished tasks are kept, the
+    oldest ones are discarded first.
+    """
+
+    def __init__(self, *, slow_callback_duration=0.1,
+                 max_slow_callbacks=100, max_finished_tasks=1000):
+        self.slow_callback_duration = slow_callback_duration
+        self._max_slow_callbacks = max_slow_callbacks
+        self._max_finished_tasks = max_finished_tasks
+        self._select_start = 0.0
+        self._iteration_start = 0.0
+        self.reset()
+
+    def reset(self):
+        """Forget all the statistics collected so far."""
+        self.iterations = Histogram()
+        self.callbacks = Histogram()
+        self.idle_time = 0.0
+        self.slow_callbacks = collections.deque(
+            maxlen=self._max_slow_callbacks)
+        # Statistics of the tasks which are not done yet, those of the tasks
+        # destroyed while pending are dropped
+        self._tasks = weakref.WeakKeyDictionary()
+        self._finished_tasks = collections.deque(
+            maxlen=self._max_finished_tasks)
+
+    def task_stats(self):
+        """Return the list of the TaskStats of the tasks which are not done
+        yet, followed by those of the finished tasks."""
+        return [*self._tasks.values(), *self._finished_tasks]
+
+    def as_dict(self):
+        """Return the statistics as a dictionary which can be serialized to
+        JSON."""
+        return {
+            'iterations': self.iterations.as_dict(),
+            'callbacks': self.callbacks.as_dict(),
+            'idle_time': self.idle_time,
+            'slow_callbacks': list(self.slow_callbacks),
+            'tasks': [stats.as_dict() for stats in self.task_stats()],
+        }
+
+    # Methods called by the event loop.
+
+    def _select_started(self):
+        self._select_start = time.perf_counter()
+
+    def _select_finished(self):
+        self._iteration_start = now = time.perf_counter()
+        self.idle_time += now - self._select_start
+
+    def _iteration_finished(self):
+        self.iterations.add(time.perf_counter() - self._iteration_start)
+
+    def _run_handle(self, handle):
+        task = getattr(handle._callback, '__self__', None)
+        if not isinstance(task, _TASK_TYPES):
+            task = None
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            handle._run()
+        finally:
+            cpu_time = time.thread_time() - cpu_start
+            end = time.perf_counter()
+            duration = end - start
+            self.callbacks.add(duration)
+            if task is not None:
+                stats = self._tasks.get(task)
+                if stats is None:
+                    stats = self._tasks[task] = TaskStats(task, start)
+                stats.steps += 1
+                stats.running_time += duration
+                stats.cpu_time += cpu_time
+                if duration > stats.max_step_time:
+                    stats.max_step_time = duration
+                if task.done():
+                    stats.end_time = end
+                    del self._tasks[task]
+                    self._finished_tasks.append(stats)
+            if duration >= self.slow_callback_duration:
+                self.slow_callbacks.append({
+                    'callback': repr(task) if task is not None else str(handle),
+                    'duration': duration,
+                    'cpu_time': cpu_time,
+                    'time': time.time(),
+                })
@@ -50,6 +50,9 @@ def dump_stats(self, file):
         with open(file, 'wb') as f:
             self.create_stats()
             marshal.dump(self.stats, f)
+            # Older readers ignore the optional trailing line statistics.
+            if self.line_stats:
+                marshal.dump(self.line_stats, f)
 
     def create_stats(self):
         self.disable()
@@ -58,6 +61,7 @@ def create_stats(self):
     def snapshot_stats(self):
         entries = self.getstats()
         self.stats = {}
+        self.line_stats = {}
         callersdicts = {}
         # call information
         for entry in entries:
@@ -69,6 +73,15 @@ def snapshot_stats(self):
             callers = {}
             callersdicts[id(entry.code)] = callers
             self.stats[func] = cc, nc, tt, ct, callers
+            # line information, see profile_lines()
+            if entry.lines:
+                lines = self.line_stats.setdefault(func, {})
+                for lineno, hits, time in entry.lines:
+                    if lineno in lines:
+                        prev = lines[lineno]
+                        hits += prev[0]
+                        time += prev[1]
+                    lines[lineno] = hits, time
         # subcall information
         for entry in entries:
             if entry.calls:
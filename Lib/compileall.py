@@ -12,7 +12,9 @@
 """
 import os
 import sys
+import importlib.machinery
 import importlib.util
+import marshal
 import py_compile
 import struct
 import filecmp
@@ -20,7 +22,7 @@
 from functools import partial
 from pathlib import Path
 
-__all__ = ["compile_dir","compile_file","compile_path"]
+__all__ = ["compile_dir","compile_file","compile_path","compile_bundle"]
 
 def _walk_dir(dir, maxlevels, quiet=0):
     if quiet < 2 and isinstance(dir, os.PathLike):
@@ -45,10 +47,71 @@ def _walk_dir(dir, maxlevels, quiet=0):
             yield from _walk_dir(fullname, maxlevels=maxlevels - 1,
                                  quiet=quiet)
 
+def _optimize_levels(optimize):
+    if isinstance(optimize, int):
+        optimize = [optimize]
+    # Use set() to remove duplicates.
+    # Use sorted() to create pyc files in a deterministic order.
+    return sorted(set(optimize))
+
+def _cfiles(fullname, optimize, legacy):
+    opt_cfiles = {}
+    for opt_level in optimize:
+        if legacy:
+            opt_cfiles[opt_level] = fullname + 'c'
+        else:
+            if opt_level >= 0:
+                opt = opt_level if opt_level >= 1 else ''
+                cfile = (importlib.util.cache_from_source(
+                         fullname, optimization=opt))
+                opt_cfiles[opt_level] = cfile
+            else:
+                cfile = importlib.util.cache_from_source(fullname)
+                opt_cfiles[opt_level] = cfile
+    return opt_cfiles
+
+def _is_up_to_date(fullname, opt_cfiles):
+    try:
+        mtime = int(os.stat(fullname).st_mtime)
+        expect = struct.pack('<4sLL', importlib.util.MAGIC_NUMBER,
+                             0, mtime & 0xFFFF_FFFF)
+        for cfile in opt_cfiles.values():
+            with open(cfile, 'rb') as chandle:
+                actual = chandle.read(12)
+            if expect != actual:
+                return False
+    except OSError:
+        return False
+    return True
+
+def _equivalent_levels(fullname, optimize):
+    """Group optimization levels that produce the same bytecode.
+
+    Levels 0 and 1 only differ in the handling of assert statements and
+    __debug__, so a source that mentions neither compiles to the same code
+    for both.
+    """
+    levels = {}
+    for opt_level in optimize:
+        levels.setdefault(
+            sys.flags.optimize if opt_level < 0 else opt_level, []
+        ).append(opt_level)
+    if 0 in levels and 1 in levels:
+        try:
+            with open(fullname, 'rb') as f:
+                source = f.read()
+        except OSError:
+            pass
+        else:
+            if b'assert' not in source and b'__debug__' not in source:
+                levels[0].extend(levels.pop(1))
+    return [sorted(group) for group in levels.values()]
+
 def compile_dir(dir, maxlevels=None, ddir=None, force=False,
                 rx=None, quiet=0, legacy=False, optimize=-1, workers=1,
                 invalidation_mode=None, *, stripdir=None,
-                prependdir=None, limit_sl_dest=None, hardlink_dupes=False):
+                prependdir=None, limit_sl_dest=None, hardlink_dupes=False,
+                timing=False):
     """Byte-compile all modules in the given directory tree.
 
     Arguments (only dir is required):
@@ -72,6 +135,11 @@ def compile_dir(dir, maxlevels=None, ddir=None, force=False,
     limit_sl_dest: ignore symlinks if they are pointing outside of
                    the defined path
     hardlink_dupes: hardlink duplicated pyc files
+    timing:    if True, print the time spent listing, checking and compiling
+
+    Files whose byte-code files are all up-to-date are skipped in a single
+    pass before compilation starts, and the remaining files are handed to
+    the workers in batches.
     """
     ProcessPoolExecutor = None
     if ddir is not None and (stripdir is not None or prependdir is not None):
@@ -94,9 +162,26 @@ def compile_dir(dir, maxlevels=None, ddir=None, force=False,
             from concurrent.futures import ProcessPoolExecutor
     if maxlevels is None:
         maxlevels = sys.getrecursionlimit()
-    files = _walk_dir(dir, quiet=quiet, maxlevels=maxlevels)
+    if timing:
+        from time import perf_counter
+        start = perf_counter()
+    files = list(_walk_dir(dir, quiet=quiet, maxlevels=maxlevels))
+    if timing:
+        listing = perf_counter() - start
+        start = perf_counter()
+    found = len(files)
+    if not force:
+        levels = _optimize_levels(optimize)
+        files = [file for file in files
+                 if not (file[-3:] == '.py' and
+                         _is_up_to_date(file, _cfiles(file, levels, legacy)))]
+    if timing:
+        checking = perf_counter() - start
+        start = perf_counter()
+    # The remaining files failed the up-to-date check above, so compile_file()
+    # is called with force=True to not repeat it.
     success = True
-    if workers != 1 and ProcessPoolExecutor is not None:
+    if workers != 1 and ProcessPoolExecutor is not None and files:
         import multiprocessing
         if multiprocessing.get_start_method() == 'fork':
             mp_context = multiprocessing.get_context('forkserver')
@@ -104,10 +189,13 @@ def compile_dir(dir, maxlevels=None, ddir=None, force=False,
             mp_context = None
         # If workers == 0, let ProcessPoolExecutor choose
         workers = workers or None
+        # Send each worker a few large batches rather than many small ones.
+        cpus = workers or os.process_cpu_count() or 1
+        chunksize = max(4, len(files) // (4 * cpus))
         with ProcessPoolExecutor(max_workers=workers,
                                  mp_context=mp_context) as executor:
             results = executor.map(partial(compile_file,
-                                           ddir=ddir, force=force,
+                                           ddir=ddir, force=True,
                                            rx=rx, quiet=quiet,
                                            legacy=legacy,
                                            optimize=optimize,
@@ -117,16 +205,21 @@ def compile_dir(dir, maxlevels=None, ddir=None, force=False,
                                            limit_sl_dest=limit_sl_dest,
                                            hardlink_dupes=hardlink_dupes),
                                    files,
-                                   chunksize=4)
+                                   chunksize=chunksize)
             success = min(results, default=True)
     else:
         for file in files:
-            if not compile_file(file, ddir, force, rx, quiet,
+            if not compile_file(file, ddir, True, rx, quiet,
                                 legacy, optimize, invalidation_mode,
                                 stripdir=stripdir, prependdir=prependdir,
                                 limit_sl_dest=limit_sl_dest,
                                 hardlink_dupes=hardlink_dupes):
                 success = False
+    if timing:
+        compiling = perf_counter() - start
+        print(f'Timing for {dir!r}: listing {listing:.3f}s ({found} files), '
+              f'checking {checking:.3f}s ({found - len(files)} up to date), '
+              f'compiling {compiling:.3f}s ({len(files)} files)')
     return success
 
 def compile_file(fullname, ddir=None, force=False, rx=None, quiet=0,
@@ -187,12 +280,7 @@ def compile_file(fullname, ddir=None, force=False, rx=None, quiet=0,
         else:
             dfile = os.path.join(prependdir, dfile)
 
-    if isinstance(optimize, int):
-        optimize = [optimize]
-
-    # Use set() to remove duplicates.
-    # Use sorted() to create pyc files in a deterministic order.
-    optimize = sorted(set(optimize))
+    optimize = _optimize_levels(optimize)
 
     if hardlink_dupes and len(optimize) < 2:
         raise ValueError("Hardlinking of duplicated bytecode makes sense "
@@ -207,47 +295,32 @@ def compile_file(fullname, ddir=None, force=False, rx=None, quiet=0,
         if Path(limit_sl_dest).resolve() not in Path(fullname).resolve().parents:
             return success
 
-    opt_cfiles = {}
-
     if os.path.isfile(fullname):
-        for opt_level in optimize:
-            if legacy:
-                opt_cfiles[opt_level] = fullname + 'c'
-            else:
-                if opt_level >= 0:
-                    opt = opt_level if opt_level >= 1 else ''
-                    cfile = (importlib.util.cache_from_source(
-                             fullname, optimization=opt))
-                    opt_cfiles[opt_level] = cfile
-                else:
-                    cfile = importlib.util.cache_from_source(fullname)
-                    opt_cfiles[opt_level] = cfile
+        opt_cfiles = _cfiles(fullname, optimize, legacy)
 
         head, tail = name[:-3], name[-3:]
         if tail == '.py':
-            if not force:
-                try:
-                    mtime = int(os.stat(fullname).st_mtime)
-                    expect = struct.pack('<4sLL', importlib.util.MAGIC_NUMBER,
-                                         0, mtime & 0xFFFF_FFFF)
-                    for cfile in opt_cfiles.values():
-                        with open(cfile, 'rb') as chandle:
-                            actual = chandle.read(12)
-                        if expect != actual:
-                            break
-                    else:
-                        return success
-                except OSError:
-                    pass
+            if not force and _is_up_to_date(fullname, opt_cfiles):
+                return success
             if not quiet:
                 print('Compiling {!r}...'.format(fullname))
             try:
-                for index, opt_level in enumerate(optimize):
-                    cfile = opt_cfiles[opt_level]
+                if len(optimize) > 1:
+                    groups = _equivalent_levels(fullname, optimize)
+                else:
+                    groups = [optimize]
+                for group in groups:
+                    # Compile once per group of equivalent levels and copy
+                    # the result to the other levels of the group.
+                    cfile = opt_cfiles[group[0]]
                     ok = py_compile.compile(fullname, cfile, dfile, True,
-                                            optimize=opt_level,
+                                            optimize=group[0],
                                             invalidation_mode=invalidation_mode)
+                    for opt_level in group[1:]:
+                        _copy_pyc(fullname, cfile, opt_cfiles[opt_level])
+                for index, opt_level in enumerate(optimize):
                     if index > 0 and hardlink_dupes:
+                        cfile = opt_cfiles[opt_level]
                         previous_cfile = opt_cfiles[optimize[index - 1]]
                         if filecmp.cmp(cfile, previous_cfile, shallow=False):
                             os.unlink(cfile)
@@ -278,6 +351,118 @@ def compile_file(fullname, ddir=None, force=False, rx=None, quiet=0,
                     success = False
     return success
 
+def _copy_pyc(fullname, source, cfile):
+    # Write the byte-code file *source* of *fullname* to *cfile*, following
+    # the rules of py_compile.compile().
+    if source == cfile:
+        return
+    if os.path.islink(cfile) or (os.path.exists(cfile) and
+                                 not os.path.isfile(cfile)):
+        raise FileExistsError(f'{cfile} is a symlink or a non-regular file')
+    with open(source, 'rb') as f:
+        data = f.read()
+    mode = importlib._bootstrap_external._calc_mode(fullname)
+    importlib._bootstrap_external._write_atomic(cfile, data, mode)
+
+def compile_bundle(dir, bundle, maxlevels=None, ddir=None, rx=None, quiet=0,
+                   optimize=-1):
+    """Byte-compile all modules in the given directory tree into a bundle.
+
+    The bundle is a single file holding the code objects of all the modules
+    and an index, which importlib.machinery.BundleImporter loads from.
+    Module names are relative to dir; subdirectories are only included if
+    they are regular packages.
+
+    Arguments (only dir and bundle are required):
+
+    dir:       the directory to byte-compile
+    bundle:    the path of the bundle file to write
+    maxlevels: maximum recursion level (default `sys.getrecursionlimit()`)
+    ddir:      the directory that will be prepended to the path to the
+               file as it is compiled into the code objects.
+    rx:        skip files whose path matches this compiled regular expression
+    quiet:     full output with False or 0, errors only with 1,
+               no output with 2
+    optimize:  optimization level or -1 for level of the interpreter
+    """
+    if maxlevels is None:
+        maxlevels = sys.getrecursionlimit()
+    if optimize < 0:
+        optimize = sys.flags.optimize
+    dir = os.fspath(dir)
+    if ddir is None:
+        ddir = os.path.abspath(dir)
+    success = True
+    packages = {}
+    modules = {}
+    blobs = []
+    offset = 24
+    for fullname in _walk_dir(dir, quiet=quiet, maxlevels=maxlevels):
+        if not fullname.endswith('.py'):
+            continue
+        if rx is not None and rx.search(fullname):
+            continue
+        parts = os.path.relpath(fullname, dir)[:-3].split(os.sep)
+        if parts == ['__init__'] or not all(part.isidentifier()
+                                            for part in parts):
+            continue
+        for level in range(1, len(parts)):
+            package = os.path.join(dir, *parts[:level])
+            if package not in packages:
+                packages[package] = os.path.isfile(
+                    os.path.join(package, '__init__.py'))
+            if not packages[package]:
+                break
+        else:
+            is_package = parts[-1] == '__init__' and len(parts) > 1
+            if is_package:
+                del parts[-1]
+            dfile = os.path.join(ddir, os.path.relpath(fullname, dir))
+            if not quiet:
+                print('Compiling {!r}...'.format(fullname))
+            try:
+                loader = importlib.machinery.SourceFileLoader('<compileall>',
+                                                              fullname)
+                source = loader.get_data(fullname)
+                st = os.stat(fullname)
+                code = loader.source_to_code(source, dfile,
+                                             _optimize=optimize)
+            except (SyntaxError, UnicodeError, ValueError, OSError) as e:
+                success = False
+                if quiet >= 2:
+                    continue
+                elif quiet:
+                    print('*** Error compiling {!r}...'.format(fullname))
+                else:
+                    print('*** ', end='')
+                print(e.__class__.__name__ + ':', e)
+                continue
+            data = marshal.dumps(code)
+            modules['.'.join(parts)] = (offset, len(data), dfile, is_package,
+                                        int(st.st_mtime) & 0xFFFF_FFFF,
+                                        st.st_size & 0xFFFF_FFFF)
+            blobs.append(data)
+            offset += len(data)
+    header = (b'PYBUNDLE' + importlib.util.MAGIC_NUMBER +
+              struct.pack('<LQ', optimize, offset))
+    bundle = os.fspath(bundle)
+    tmp = f'{bundle}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(header)
+            f.writelines(blobs)
+            f.write(marshal.dumps(modules))
+        os.replace(tmp, bundle)
+    except OSError as e:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        if quiet < 2:
+            print("Can't write bundle {!r}: {}".format(bundle, e))
+        return False
+    return success
+
 def compile_path(skip_curdir=1, maxlevels=0, force=False, quiet=0,
                  legacy=False, optimize=-1,
                  invalidation_mode=None):
@@ -382,6 +567,13 @@ def main():
     parser.add_argument('--hardlink-dupes', action='store_true',
                         dest='hardlink_dupes',
                         help='Hardlink duplicated pyc files')
+    parser.add_argument('--timing', action='store_true', dest='timing',
+                        help=('print the time spent listing, checking and '
+                              'compiling each directory'))
+    parser.add_argument('--bundle', metavar='FILE', dest='bundle',
+                        help=('write the code of all modules in the given '
+                              'directory to a single bytecode bundle FILE '
+                              'instead of .pyc files'))
 
     args = parser.parse_args()
     compile_dests = args.compile_dest
@@ -410,6 +602,12 @@ def main():
     ):
         parser.error("-d cannot be used in combination with -s or -p")
 
+    if args.bundle is not None:
+        if len(compile_dests) != 1 or not os.path.isdir(compile_dests[0]):
+            parser.error("--bundle requires exactly one directory")
+        if len(args.opt_levels) > 1:
+            parser.error("--bundle supports a single optimization level")
+
     # if flist is provided then load it
     if args.flist:
         try:
@@ -430,6 +628,10 @@ def main():
 
     success = True
     try:
+        if args.bundle is not None:
+            return compile_bundle(compile_dests[0], args.bundle, maxlevels,
+                                  args.ddir, args.rx, args.quiet,
+                                  optimize=args.opt_levels[0])
         if compile_dests:
             for dest in compile_dests:
                 if os.path.isfile(dest):
@@ -451,7 +653,8 @@ def main():
                                        prependdir=args.prependdir,
                                        optimize=args.opt_levels,
                                        limit_sl_dest=args.limit_sl_dest,
-                                       hardlink_dupes=args.hardlink_dupes):
+                                       hardlink_dupes=args.hardlink_dupes,
+                                       timing=args.timing):
                         success = False
             return success
         else:
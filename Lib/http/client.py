@@ -139,6 +139,10 @@
 _is_legal_header_name = re.compile(rb'[^:\s][^:\r\n]*').fullmatch
 _is_illegal_header_value = re.compile(rb'\n(?![ \t])|\r(?![ \t\n])').search
 
+# Field names accepted by the email package's header parser (see
+# email.feedparser.headerRE): printable ASCII except the colon.
+_is_email_header_name = re.compile(r'[\041-\071\073-\176]+').fullmatch
+
 # These characters are not allowed within HTTP URL paths.
 #  See https://tools.ietf.org/html/rfc3986#section-3.3 and the
 #  https://tools.ietf.org/html/rfc3986#appendix-A pchar definition.
@@ -228,6 +232,45 @@ def _read_headers(fp):
             break
     return headers
 
+def _fast_parse_header_lines(header_lines):
+    """Build an HTTPMessage from header lines without the email parser.
+
+    Only well-formed header blocks are handled: every line must be either
+    a "name: value" field or a continuation of the previous field.  The
+    result is the same as what email.parser.Parser produces for such
+    input.  None is returned for anything else (bare CRs, leading
+    continuation lines, lines without a field name, multipart or message
+    content types), so that the caller can fall back to the email parser,
+    which knows how to record defects.
+    """
+    msg = HTTPMessage()
+    name = None
+    for line in header_lines:
+        if line in (b'\r\n', b'\n', b''):
+            break
+        line = line.decode('iso-8859-1')
+        if '\r' in line and (line.find('\r') != len(line) - 2
+                              or not line.endswith('\r\n')):
+            return None
+        if line[0] in ' \t':
+            if name is None:
+                return None
+            value.append(line)
+            continue
+        if name is not None:
+            msg.set_raw(name, ''.join(value).rstrip('\r\n'))
+        i = line.find(':')
+        if i <= 0 or not _is_email_header_name(line, 0, i):
+            return None
+        name = line[:i]
+        value = [line[i+1:].lstrip(' \t')]
+    if name is not None:
+        msg.set_raw(name, ''.join(value).rstrip('\r\n'))
+    if msg.get_content_maintype() in ('multipart', 'message'):
+        return None
+    msg.set_payload('')
+    return msg
+
 def _parse_header_lines(header_lines, _class=HTTPMessage):
     """
     Parses only RFC2822 headers from header lines.
@@ -238,7 +281,15 @@ def _parse_header_lines(header_lines, _class=HTTPMessage):
     So we read the correct bytes here, as bytes, for email Parser
     to parse.
 
+    Well-formed header blocks, which is what nearly every server sends,
+    are turned into a message directly; the email parser is only used
+    for the rest.
+
     """
+    if _class is HTTPMessage:
+        msg = _fast_parse_header_lines(header_lines)
+        if msg is not None:
+            return msg
     hstring = b''.join(header_lines).decode('iso-8859-1')
     return email.parser.Parser(_class=_class).parsestr(hstring)
 
@@ -99,6 +99,7 @@
 import posixpath
 import select
 import shutil
+import signal
 import socket # For gethostbyaddr()
 import socketserver
 import sys
@@ -143,6 +144,14 @@ class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
     daemon_threads = True
 
 
+if hasattr(os, "fork"):
+    class PreForkingHTTPServer(socketserver.PreForkingMixIn,
+                               ThreadingHTTPServer):
+        pass
+
+    __all__.append("PreForkingHTTPServer")
+
+
 class BaseHTTPRequestHandler(socketserver.StreamRequestHandler):
 
     """HTTP request handler base class.
@@ -658,6 +667,10 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
 
     server_version = "SimpleHTTP/" + __version__
     index_pages = ("index.html", "index.htm")
+    # Mapping used to remember the content type, ETag and Last-Modified
+    # value of served files, or None to disable caching.  Entries are
+    # revalidated against the file's size and modification time.
+    file_info_cache = None
     extensions_map = _encodings_map_default = {
         '.gz': 'application/gzip',
         '.Z': 'application/octet-stream',
@@ -673,10 +686,14 @@ def __init__(self, *args, directory=None, **kwargs):
 
     def do_GET(self):
         """Serve a GET request."""
+        self._byte_ranges = None
         f = self.send_head()
         if f:
             try:
-                self.copyfile(f, self.wfile)
+                if self._byte_ranges is None:
+                    self.copyfile(f, self.wfile)
+                else:
+                    self.copy_byte_ranges(f, self.wfile, self._byte_ranges)
             finally:
                 f.close()
 
@@ -718,7 +735,6 @@ def send_head(self):
                     break
             else:
                 return self.list_directory(path)
-        ctype = self.guess_type(path)
         # check for trailing "/" which should return 404. See Issue17324
         # The test for this was added in test_httpserver.py
         # However, some OS platforms accept a trailingSlash as a filename
@@ -735,9 +751,18 @@ def send_head(self):
 
         try:
             fs = os.fstat(f.fileno())
+            ctype, etag, last_modified = self.file_info(path, fs)
             # Use browser cache if possible
-            if ("If-Modified-Since" in self.headers
-                    and "If-None-Match" not in self.headers):
+            if "If-None-Match" in self.headers:
+                # RFC 9110, section 13.1.2: If-None-Match takes precedence
+                # over If-Modified-Since.
+                if self._if_none_match_matches(etag):
+                    self.send_response(HTTPStatus.NOT_MODIFIED)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    f.close()
+                    return None
+            elif "If-Modified-Since" in self.headers:
                 # compare If-Modified-Since and time of last file modification
                 try:
                     ims = email.utils.parsedate_to_datetime(
@@ -763,17 +788,104 @@ def send_head(self):
                             f.close()
                             return None
 
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-type", ctype)
-            self.send_header("Content-Length", str(fs[6]))
-            self.send_header("Last-Modified",
-                self.date_time_string(fs.st_mtime))
+            ranges = None
+            if ("Range" in self.headers and
+                    self._if_range_matches(etag, last_modified)):
+                ranges = _parse_byte_ranges(self.headers["Range"],
+                                            fs.st_size)
+            if ranges == []:
+                self.send_response(
+                    HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", "bytes */%d" % fs.st_size)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                f.close()
+                return None
+            if ranges is None:
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-type", ctype)
+                self.send_header("Content-Length", str(fs[6]))
+            elif len(ranges) == 1:
+                start, end = ranges[0]
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header("Content-type", ctype)
+                self.send_header("Content-Range",
+                                 "bytes %d-%d/%d" % (start, end, fs.st_size))
+                self.send_header("Content-Length", str(end - start + 1))
+                self._byte_ranges = [(None, start, end - start + 1)]
+            else:
+                boundary = os.urandom(16).hex()
+                parts = []
+                length = 0
+                for start, end in ranges:
+                    part_header = (
+                        "\r\n--%s\r\n"
+                        "Content-Type: %s\r\n"
+                        "Content-Range: bytes %d-%d/%d\r\n"
+                        "\r\n" % (boundary, ctype, start, end, fs.st_size)
+                    ).encode('latin-1')
+                    parts.append((part_header, start, end - start + 1))
+                    length += len(part_header) + end - start + 1
+                trailer = ("\r\n--%s--\r\n" % boundary).encode('latin-1')
+                parts.append((trailer, None, 0))
+                length += len(trailer)
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header("Content-type",
+                                 "multipart/byteranges; boundary=" + boundary)
+                self.send_header("Content-Length", str(length))
+                self._byte_ranges = parts
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
             self.end_headers()
             return f
         except:
             f.close()
             raise
 
+    def file_info(self, path, fs):
+        """Return the content type, ETag and Last-Modified value of a file.
+
+        PATH is the path of the file and FS the result of os.stat() on it.
+        The values are taken from self.file_info_cache if it is not None
+        and holds an entry for a file of the same size and modification
+        time.
+        """
+        cache = self.file_info_cache
+        key = (fs.st_mtime_ns, fs.st_size)
+        if cache is not None:
+            info = cache.get(path)
+            if info is not None and info[0] == key:
+                return info[1]
+        info = (self.guess_type(path),
+                '"%x-%x"' % key,
+                self.date_time_string(fs.st_mtime))
+        if cache is not None:
+            cache[path] = (key, info)
+        return info
+
+    def _if_none_match_matches(self, etag):
+        # RFC 9110, section 13.1.2: weak comparison of the entity tags.
+        if_none_match = self.headers.get("If-None-Match", "").strip()
+        if if_none_match == "*":
+            return True
+        etag = etag.removeprefix("W/")
+        for tag in if_none_match.split(","):
+            if tag.strip().removeprefix("W/") == etag:
+                return True
+        return False
+
+    def _if_range_matches(self, etag, last_modified):
+        # RFC 9110, section 13.1.5: ranges are only honoured if the
+        # validator in If-Range (if any) matches the current file.
+        if_range = self.headers.get("If-Range")
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            return if_range == etag
+        return if_range == last_modified
+
     def list_directory(self, path):
         """Helper to produce a directory listing (absent index.html).
 
@@ -875,7 +987,36 @@ def copyfile(self, source, outputfile):
         to copy binary data as well.
 
         """
-        shutil.copyfileobj(source, outputfile)
+        sendfile = getattr(outputfile, 'sendfile', None)
+        if sendfile is not None:
+            # Let the kernel copy the data straight to the socket.
+            sendfile(source, source.tell())
+        else:
+            shutil.copyfileobj(source, outputfile)
+
+    def copy_byte_ranges(self, source, outputfile, ranges):
+        """Copy byte ranges of the SOURCE file object to OUTPUTFILE.
+
+        RANGES is a list of (prefix, offset, count) tuples: the bytes
+        PREFIX (if not None) are written, followed by COUNT bytes of
+        SOURCE from OFFSET.
+        """
+        sendfile = getattr(outputfile, 'sendfile', None)
+        for prefix, offset, count in ranges:
+            if prefix is not None:
+                outputfile.write(prefix)
+            if not count:
+                continue
+            if sendfile is not None:
+                sendfile(source, offset, count)
+                continue
+            source.seek(offset)
+            while count:
+                buf = source.read(min(count, shutil.COPY_BUFSIZE))
+                if not buf:
+                    break
+                outputfile.write(buf)
+                count -= len(buf)
 
     def guess_type(self, path):
         """Guess the type of a file.
@@ -903,6 +1044,68 @@ def guess_type(self, path):
         return 'application/octet-stream'
 
 
+def _parse_byte_ranges(value, size):
+    """Parse the value of a Range header for a representation of SIZE bytes.
+
+    Return a sorted list of non-overlapping (first, last) byte positions,
+    an empty list if no range is satisfiable, or None if the header
+    is invalid or does not use byte units and should be ignored.
+    """
+    unit, sep, specs = value.partition('=')
+    if not sep or unit.strip().lower() != 'bytes':
+        return None
+    ranges = []
+    seen = False
+    for spec in specs.split(','):
+        spec = spec.strip()
+        if not spec:
+            continue
+        seen = True
+        first, sep, last = spec.partition('-')
+        first = first.strip()
+        last = last.strip()
+        if not sep or not _is_digits(last or '0'):
+            return None
+        if first:
+            if not _is_digits(first):
+                return None
+            start = int(first)
+            if last:
+                end = int(last)
+                if end < start:
+                    return None
+            else:
+                end = size - 1
+            if start >= size:
+                continue
+            end = min(end, size - 1)
+        else:
+            # suffix-byte-range-spec: the last N bytes
+            if not last:
+                return None
+            suffix = int(last)
+            if not suffix or not size:
+                continue
+            start = max(size - suffix, 0)
+            end = size - 1
+        ranges.append((start, end))
+    if not seen:
+        return None
+    # Coalesce overlapping and adjacent ranges.
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def _is_digits(s):
+    return s.isascii() and s.isdigit()
+
+
 # Utilities for CGIHTTPRequestHandler
 
 def _url_collapse_path(path):
@@ -1271,6 +1474,10 @@ def test(HandlerClass=BaseHTTPRequestHandler,
             f"Serving HTTP on {host} port {port} "
             f"(http://{url_host}:{port}/) ..."
         )
+        if (isinstance(httpd, socketserver.PreForkingMixIn)
+                and hasattr(signal, 'SIGHUP')):
+            signal.signal(signal.SIGHUP,
+                          lambda signum, frame: httpd.restart_workers())
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
@@ -1294,6 +1501,10 @@ def test(HandlerClass=BaseHTTPRequestHandler,
                         default='HTTP/1.0',
                         help='conform to this HTTP version '
                              '(default: %(default)s)')
+    parser.add_argument('-w', '--workers', type=int, metavar='N',
+                        help='serve from N pre-forked worker processes; '
+                             'send SIGHUP to restart them '
+                             '(default: a single process)')
     parser.add_argument('port', default=8000, type=int, nargs='?',
                         help='bind to this port '
                              '(default: %(default)s)')
@@ -1302,9 +1513,18 @@ def test(HandlerClass=BaseHTTPRequestHandler,
         handler_class = CGIHTTPRequestHandler
     else:
         handler_class = SimpleHTTPRequestHandler
+    if args.workers is not None:
+        if not hasattr(os, "fork"):
+            parser.error('--workers is not supported on this platform')
+        if args.workers < 1:
+            parser.error('--workers must be a positive integer')
+        server_class = PreForkingHTTPServer
+    else:
+        server_class = ThreadingHTTPServer
 
     # ensure dual-stack is not disabled; ref #38907
-    class DualStackServer(ThreadingHTTPServer):
+    class DualStackServer(server_class):
+        workers = args.workers
 
         def server_bind(self):
             # suppress exception when protocol is IPv4
@@ -76,6 +76,28 @@ def _relax_case():
 _relax_case = _make_relax_case()
 
 
+def _make_import_index_dir():
+    if sys.platform.startswith(_CASE_INSENSITIVE_PLATFORMS_STR_KEY):
+        key = 'PYTHONIMPORTINDEX'
+    else:
+        key = b'PYTHONIMPORTINDEX'
+
+    def _import_index_dir():
+        """Return the directory for import index files, or None."""
+        if sys.flags.ignore_environment:
+            return None
+        directory = _os.environ.get(key)
+        if not directory:
+            return None
+        if isinstance(directory, bytes):
+            directory = directory.decode(sys.getfilesystemencoding(),
+                                         sys.getfilesystemencodeerrors())
+        return directory
+    return _import_index_dir
+
+_import_index_dir = _make_import_index_dir()
+
+
 def _pack_uint32(x):
     """Convert a 32-bit integer to little-endian."""
     return (int(x) & 0xFFFFFFFF).to_bytes(4, 'little')
@@ -495,6 +517,11 @@ def _write_atomic(path, data, mode=0o666):
 _PYCACHE = '__pycache__'
 _OPT = 'opt-'
 
+# Directories in which this process created a __pycache__ directory, mapped
+# to their modification times just before and just after; see
+# _PathIndex.save().
+_pycache_parents = {}
+
 SOURCE_SUFFIXES = ['.py']
 if _MS_WINDOWS:
     SOURCE_SUFFIXES.append('.pyw')
@@ -1026,6 +1053,17 @@ def load_module(self, fullname):
         return _bootstrap._load_module_shim(self, fullname)
 
 
+def _shares_bytecode(loader):
+    """Return True if the loader reads and writes its bytecode through the
+    process-wide cache shared by all interpreters.
+
+    Only loaders that read files directly take part, so that the cached
+    contents of a path are always those of the file.
+    """
+    return (_imp._shared_bytecode() and
+            type(loader).get_data is FileLoader.get_data)
+
+
 class SourceLoader(_LoaderBasics):
 
     def path_mtime(self, path):
@@ -1098,6 +1136,7 @@ def get_code(self, fullname):
         source_hash = None
         hash_based = False
         check_source = True
+        shared = _shares_bytecode(self)
         try:
             bytecode_path = cache_from_source(source_path)
         except NotImplementedError:
@@ -1109,11 +1148,18 @@ def get_code(self, fullname):
                 pass
             else:
                 source_mtime = int(st['mtime'])
-                try:
-                    data = self.get_data(bytecode_path)
-                except OSError:
-                    pass
-                else:
+                data = None
+                if shared:
+                    data = _imp._shared_bytecode_get(bytecode_path)
+                if data is None:
+                    try:
+                        data = self.get_data(bytecode_path)
+                    except OSError:
+                        pass
+                    else:
+                        if shared:
+                            _imp._shared_bytecode_set(bytecode_path, data)
+                if data is not None:
                     exc_details = {
                         'name': fullname,
                         'path': bytecode_path,
@@ -1154,8 +1200,10 @@ def get_code(self, fullname):
             source_bytes = self.get_data(source_path)
         code_object = self.source_to_code(source_bytes, source_path)
         _bootstrap._verbose_message('code object from {}', source_path)
-        if (not sys.dont_write_bytecode and bytecode_path is not None and
-                source_mtime is not None):
+        # Bytecode is shared with other interpreters even if it cannot be
+        # written, to spare them from compiling the source again.
+        if ((shared or not sys.dont_write_bytecode) and
+                bytecode_path is not None and source_mtime is not None):
             if hash_based:
                 if source_hash is None:
                     source_hash = _imp.source_hash(_RAW_MAGIC_NUMBER,
@@ -1164,10 +1212,13 @@ def get_code(self, fullname):
             else:
                 data = _code_to_timestamp_pyc(code_object, source_mtime,
                                               len(source_bytes))
-            try:
-                self._cache_bytecode(source_path, bytecode_path, data)
-            except NotImplementedError:
-                pass
+            if shared:
+                _imp._shared_bytecode_set(bytecode_path, data)
+            if not sys.dont_write_bytecode:
+                try:
+                    self._cache_bytecode(source_path, bytecode_path, data)
+                except NotImplementedError:
+                    pass
         return code_object
 
 
@@ -1245,7 +1296,13 @@ def set_data(self, path, data, *, _mode=0o666):
             path_parts.append(part)
         # Create needed directories.
         for part in reversed(path_parts):
+            grandparent = parent
             parent = _path_join(parent, part)
+            if part == _PYCACHE:
+                try:
+                    mtime = _path_stat(grandparent).st_mtime
+                except OSError:
+                    mtime = None
             try:
                 _os.mkdir(parent)
             except FileExistsError:
@@ -1257,6 +1314,12 @@ def set_data(self, path, data, *, _mode=0o666):
                 _bootstrap._verbose_message('could not create {!r}: {!r}',
                                             parent, exc)
                 return
+            if part == _PYCACHE and mtime is not None:
+                try:
+                    _pycache_parents[_path_abspath(grandparent)] = (
+                        mtime, _path_stat(grandparent).st_mtime)
+                except OSError:
+                    pass
         try:
             _write_atomic(path, data, _mode)
             _bootstrap._verbose_message('created {!r}', path)
@@ -1457,6 +1520,129 @@ def get_resource_reader(self, module):
 
 # Finders #####################################################################
 
+class _PathIndex:
+
+    """Persistent record of where top-level modules were found on a path.
+
+    The index is stored in the PYTHONIMPORTINDEX directory, under a name
+    derived from the path it was built for.  It is only used while every
+    entry of the path keeps the modification time it had when the index was
+    loaded, so adding or removing a module anywhere on the path discards it.
+    A hit costs a single stat of the module's file.  Only the most recently
+    written _max_files indexes are kept.
+
+    """
+
+    _version = 1
+    _max_files = 16
+    _loaders = {loader.__name__: loader for loader in
+                (SourceFileLoader, SourcelessFileLoader, ExtensionFileLoader)}
+
+    def __init__(self, directory, path):
+        self._path = path
+        entries = list(path)
+        if '' in entries:
+            entries.append(_os.getcwd())
+        key = '\0'.join(entries).encode('utf-8', 'surrogatepass')
+        digest = _imp.source_hash(_RAW_MAGIC_NUMBER, key).hex()
+        tag = sys.implementation.cache_tag
+        self._directory = directory
+        self._filename = _path_join(directory, f'importindex.{tag}.{digest}')
+        self._mtimes = [self._mtime(entry) for entry in path]
+        self._modules = {}
+        self._dirty = False
+        try:
+            with _io.FileIO(self._filename, 'r') as file:
+                data = marshal.loads(file.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if (type(data) is tuple and len(data) == 4
+                and data[:3] == (self._version, path, self._mtimes)):
+            self._modules = data[3]
+
+    @staticmethod
+    def _mtime(entry):
+        try:
+            return _path_stat(entry or _os.getcwd()).st_mtime
+        except OSError:
+            return -1
+
+    def find_spec(self, fullname):
+        """Return a spec for the indexed module, or None."""
+        try:
+            location, loader_name, is_package = self._modules[fullname]
+        except KeyError:
+            return None
+        if not _path_isfile(location):
+            del self._modules[fullname]
+            self._dirty = True
+            return None
+        loader_class = self._loaders[loader_name]
+        smsl = [_path_split(location)[0]] if is_package else None
+        return spec_from_file_location(fullname, location,
+                                       loader=loader_class(fullname, location),
+                                       submodule_search_locations=smsl)
+
+    def add(self, spec):
+        """Record a spec found by a file-based loader."""
+        loader_name = type(spec.loader).__name__
+        if (loader_name in self._loaders
+                and type(spec.loader) is self._loaders[loader_name]
+                and spec.has_location):
+            is_package = spec.submodule_search_locations is not None
+            self._modules[spec.name] = (spec.origin, loader_name, is_package)
+            self._dirty = True
+
+    def save(self):
+        """Write the index if it has changed."""
+        if not self._dirty:
+            return
+        # Writing bytecode creates __pycache__ directories and so changes
+        # the mtime of the entries, which must not invalidate the index.
+        # The new mtime is only recorded if creating __pycache__ was the
+        # only change: any other change made since the index was loaded is
+        # kept, so the index is discarded by the next process.
+        mtimes = list(self._mtimes)
+        for i, entry in enumerate(self._path):
+            before, after = _pycache_parents.get(
+                _path_abspath(entry or _os.getcwd()), (None, None))
+            if before == mtimes[i] and self._mtime(entry) == after:
+                mtimes[i] = after
+        data = marshal.dumps((self._version, self._path, mtimes,
+                              self._modules))
+        try:
+            _write_atomic(self._filename, data)
+        except OSError:
+            return
+        self._mtimes = mtimes
+        self._dirty = False
+        self._evict()
+
+    def _evict(self):
+        # Remove the least recently written indexes in excess of _max_files
+        prefix = f'importindex.{sys.implementation.cache_tag}.'
+        try:
+            names = [name for name in _os.listdir(self._directory)
+                     if name.startswith(prefix)]
+        except OSError:
+            return
+        if len(names) <= self._max_files:
+            return
+        files = []
+        for name in names:
+            filename = _path_join(self._directory, name)
+            try:
+                files.append((_path_stat(filename).st_mtime, filename))
+            except OSError:
+                pass
+        files.sort(reverse=True)
+        for mtime, filename in files[self._max_files:]:
+            try:
+                _os.unlink(filename)
+            except OSError:
+                pass
+
+
 class PathFinder:
 
     """Meta path finder for sys.path and package __path__ attributes."""
@@ -1475,6 +1661,11 @@ def invalidate_caches():
         # Also invalidate the caches of _NamespacePaths
         # https://bugs.python.org/issue45703
         _NamespacePath._epoch += 1
+        # Persistent indexes are revalidated against the file system
+        PathFinder._save_indexes()
+        PathFinder._indexes.clear()
+        PathFinder._negative_cache.clear()
+        _imp._shared_bytecode_clear()
 
         from importlib.metadata import MetadataPathFinder
         MetadataPathFinder.invalidate_caches()
@@ -1514,16 +1705,75 @@ def _path_importer_cache(cls, path):
             sys.path_importer_cache[path] = finder
         return finder
 
+    # Lookups that found no loader, keyed by module name.  Each value is
+    # (path, finders, mtimes, namespace_path, portion_mtimes), see
+    # _get_cached_spec().
+    _negative_cache = {}
+    _negative_cache_size = 1024
+
+    @classmethod
+    def _get_cached_spec(cls, fullname, path):
+        """Return the namespace_path of a lookup in the negative cache, or None.
+
+        The lookup is only reused while the path, the finders of its entries
+        and the modification times of their directories are unchanged, so
+        that the FileFinders would give the same answers.  The directories
+        of the namespace package portions are checked too, as adding an
+        __init__ file to one of them makes it a regular package.
+        """
+        try:
+            cached_path, finders, mtimes, namespace_path, portion_mtimes = (
+                cls._negative_cache[fullname])
+        except KeyError:
+            return None
+        if cached_path != path:
+            return None
+        for entry, finder, mtime in zip(path, finders, mtimes):
+            if not isinstance(entry, str):
+                continue
+            if cls._path_importer_cache(entry) is not finder:
+                return None
+            if finder is None:
+                continue
+            if finder._path_mtime != mtime:
+                return None
+            try:
+                if _path_stat(finder.path).st_mtime != mtime:
+                    return None
+            except OSError:
+                if mtime != -1:
+                    return None
+        for portion, mtime in zip(namespace_path, portion_mtimes):
+            try:
+                if _path_stat(portion).st_mtime != mtime:
+                    return None
+            except OSError:
+                return None
+        return list(namespace_path)
+
     @classmethod
     def _get_spec(cls, fullname, path, target=None):
         """Find the loader or namespace_path for this module/package name."""
+        path = tuple(path)
+        namespace_path = cls._get_cached_spec(fullname, path)
+        if namespace_path is not None:
+            spec = _bootstrap.ModuleSpec(fullname, None)
+            spec.submodule_search_locations = namespace_path
+            return spec
+        # Only FileFinders can tell whether their answer is still valid
+        finders = []
+        cacheable = True
         # If this ends up being a namespace package, namespace_path is
         #  the list of paths that will become its __path__
         namespace_path = []
         for entry in path:
             if not isinstance(entry, str):
+                finders.append(None)
                 continue
             finder = cls._path_importer_cache(entry)
+            finders.append(finder)
+            if finder is not None and type(finder) is not FileFinder:
+                cacheable = False
             if finder is not None:
                 spec = finder.find_spec(fullname, target)
                 if spec is None:
@@ -1539,18 +1789,65 @@ def _get_spec(cls, fullname, path, target=None):
                 #  on path.
                 namespace_path.extend(portions)
         else:
+            if cacheable:
+                try:
+                    portion_mtimes = tuple(_path_stat(portion).st_mtime
+                                           for portion in namespace_path)
+                except OSError:
+                    cacheable = False
+            if cacheable:
+                mtimes = tuple(-1 if finder is None else finder._path_mtime
+                               for finder in finders)
+                if len(cls._negative_cache) >= cls._negative_cache_size:
+                    cls._negative_cache.clear()
+                cls._negative_cache[fullname] = (
+                    path, tuple(finders), mtimes, tuple(namespace_path),
+                    portion_mtimes)
             spec = _bootstrap.ModuleSpec(fullname, None)
             spec.submodule_search_locations = namespace_path
             return spec
 
+    # Persistent indexes of top-level modules, keyed by sys.path contents
+    _indexes = {}
+    _atexit_registered = False
+
+    @classmethod
+    def _get_index(cls):
+        """Return the persistent index for the current sys.path, if enabled."""
+        directory = _import_index_dir()
+        if directory is None:
+            return None
+        path = tuple(entry for entry in sys.path if isinstance(entry, str))
+        try:
+            return cls._indexes[path]
+        except KeyError:
+            pass
+        if not cls._atexit_registered:
+            import atexit
+            atexit.register(cls._save_indexes)
+            cls._atexit_registered = True
+        index = cls._indexes[path] = _PathIndex(directory, path)
+        return index
+
+    @classmethod
+    def _save_indexes(cls):
+        for index in list(cls._indexes.values()):
+            index.save()
+
     @classmethod
     def find_spec(cls, fullname, path=None, target=None):
         """Try to find a spec for 'fullname' on sys.path or 'path'.
 
         The search is based on sys.path_hooks and sys.path_importer_cache.
         """
+        index = None
         if path is None:
             path = sys.path
+            index = cls._get_index()
+            if index is not None:
+                spec = index.find_spec(fullname)
+                if spec is not None:
+                    return spec
         spec = cls._get_spec(fullname, path, target)
         if spec is None:
             return None
@@ -1565,6 +1862,8 @@ def find_spec(cls, fullname, path=None, target=None):
             else:
                 return None
         else:
+            if index is not None:
+                index.add(spec)
             return spec
 
     @staticmethod
@@ -1720,6 +2019,111 @@ def __repr__(self):
         return f'FileFinder({self.path!r})'
 
 
+# Header of a bytecode bundle: this marker, MAGIC_NUMBER, the optimization
+# level as a 32-bit integer and the offset of the index as a 64-bit integer.
+_BUNDLE_MARKER = b'PYBUNDLE'
+_BUNDLE_HEADER_SIZE = 24
+
+
+class BundleImporter:
+
+    """Meta path finder and loader for modules in a bytecode bundle.
+
+    A bundle, as written by compileall.compile_bundle(), holds the marshalled
+    code of the modules of a directory tree together with an index of them.
+    The file is memory-mapped and code objects are unmarshalled straight from
+    the mapping, so importing a module opens no file.
+
+    If check_source is true, a module is only served from the bundle if its
+    source file still has the modification time and size it was compiled
+    from.
+
+    """
+
+    def __init__(self, path, *, check_source=False):
+        import mmap
+        self.path = _path_abspath(path)
+        self.check_source = check_source
+        with _io.FileIO(self.path, 'r') as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ImportError('empty bytecode bundle', path=self.path)
+        header = self._map[:_BUNDLE_HEADER_SIZE]
+        if (len(header) < _BUNDLE_HEADER_SIZE
+                or header[:8] != _BUNDLE_MARKER):
+            raise ImportError('not a bytecode bundle', path=self.path)
+        if header[8:12] != MAGIC_NUMBER:
+            raise ImportError('bad magic number in bytecode bundle',
+                              path=self.path)
+        self.optimize = _unpack_uint32(header[12:16])
+        with memoryview(self._map) as view:
+            self._modules = marshal.loads(view[_unpack_uint64(header[16:24]):])
+
+    def __repr__(self):
+        return f'BundleImporter({self.path!r})'
+
+    def _entry(self, fullname):
+        try:
+            return self._modules[fullname]
+        except KeyError:
+            raise ImportError(f'{fullname!r} is not in the bundle',
+                              name=fullname) from None
+
+    def find_spec(self, fullname, path=None, target=None):
+        """Return a spec for the module if it is in the bundle."""
+        entry = self._modules.get(fullname)
+        if entry is None or sys.flags.optimize != self.optimize:
+            return None
+        _, _, filename, is_package, mtime, source_size = entry
+        if self.check_source:
+            try:
+                st = _path_stat(filename)
+            except OSError:
+                return None
+            if (int(st.st_mtime) & 0xFFFFFFFF != mtime
+                    or st.st_size & 0xFFFFFFFF != source_size):
+                return None
+        spec = _bootstrap.ModuleSpec(fullname, self, origin=filename,
+                                     is_package=is_package)
+        spec.has_location = True
+        if is_package:
+            spec.submodule_search_locations.append(_path_split(filename)[0])
+        return spec
+
+    def create_module(self, spec):
+        """Use default semantics for module creation."""
+
+    def exec_module(self, module):
+        """Execute the module's code from the bundle."""
+        code = self.get_code(module.__spec__.name)
+        _bootstrap._call_with_frames_removed(exec, code, module.__dict__)
+
+    def get_code(self, fullname):
+        """Return the code object of the module."""
+        offset, size = self._entry(fullname)[:2]
+        with memoryview(self._map) as view:
+            return marshal.loads(view[offset:offset + size])
+
+    def get_source(self, fullname):
+        """Return the source of the module if the source file exists."""
+        filename = self._entry(fullname)[2]
+        try:
+            with _io.open_code(filename) as file:
+                return decode_source(file.read())
+        except OSError:
+            return None
+
+    def get_filename(self, fullname):
+        """Return the path of the module's source file."""
+        return self._entry(fullname)[2]
+
+    def is_package(self, fullname):
+        """Return True if the module is a package."""
+        return self._entry(fullname)[3]
+
+
 class AppleFrameworkLoader(ExtensionFileLoader):
     """A loader for modules that have been packaged as frameworks for
     compatibility with Apple's iOS App Store policies.
@@ -0,0 +1,338 @@
+"""Profile the time spent importing modules.
+
+The profiler records, for every module imported while it is enabled, the
+time spent finding, loading and executing it, and the number of file system
+operations made on its behalf by the path based finders and loaders.  The
+records form a tree that mirrors the nesting of imports, and can be printed,
+or exported as JSON or as collapsed stacks for flame graph tools.
+
+It can also be run as a script::
+
+    python -m importlib.importtime [-o outfile] [-f format] [-m | -c] target [args]
+"""
+
+import _thread
+import builtins
+import sys
+import time
+
+from . import _bootstrap
+from . import _bootstrap_external
+
+__all__ = ['ImportProfiler', 'ImportRecord']
+
+
+class ImportRecord:
+
+    """The profile of one import.
+
+    Times are in nanoseconds.  *cumulative* includes the imports nested in
+    this one (listed in *children*), *exec* includes the nested imports made
+    while the module's code runs, and *load* covers the rest of the loading,
+    such as reading and unmarshalling the code object.
+    """
+
+    __slots__ = ('name', 'children', 'cumulative', 'find', 'load', 'exec',
+                 'stats', 'listdirs', 'reads', 'read_bytes', 'failed')
+
+    def __init__(self, name):
+        self.name = name
+        self.children = []
+        self.cumulative = 0
+        self.find = 0
+        self.load = 0
+        self.exec = 0
+        self.stats = 0
+        self.listdirs = 0
+        self.reads = 0
+        self.read_bytes = 0
+        self.failed = False
+
+    def __repr__(self):
+        return (f'<{type(self).__name__} {self.name!r} '
+                f'cumulative={self.cumulative} self={self.self_time}>')
+
+    @property
+    def self_time(self):
+        """The cumulative time minus that of the nested imports."""
+        return self.cumulative - sum(child.cumulative
+                                     for child in self.children)
+
+    def walk(self, depth=0):
+        """Yield (depth, record) pairs for this record and its descendants,
+        in import order."""
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+    def to_dict(self):
+        """Return the record and its descendants as a JSON compatible dict,
+        with times in microseconds."""
+        return {
+            'name': self.name,
+            'cumulative_us': self.cumulative // 1000,
+            'self_us': self.self_time // 1000,
+            'find_us': self.find // 1000,
+            'load_us': self.load // 1000,
+            'exec_us': self.exec // 1000,
+            'stats': self.stats,
+            'listdirs': self.listdirs,
+            'reads': self.reads,
+            'read_bytes': self.read_bytes,
+            'failed': self.failed,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+
+class ImportProfiler:
+
+    """Record the imports made by the current thread.
+
+    Only one profiler can be enabled at a time.  The profiler can be used
+    as a context manager, which enables it on entry and disables it on exit.
+    The top-level imports are the children of *root*.
+
+    The wrappers installed by the profiler are not frozen importlib code, so
+    the interpreter does not remove them, or the importlib frames that they
+    split, from the tracebacks of exceptions raised by imported modules.
+    """
+
+    def __init__(self):
+        self.root = ImportRecord(None)
+        self._stack = [self.root]
+        self._thread = None
+        self._saved = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def enable(self):
+        """Start recording imports made by the current thread."""
+        if self._saved is not None:
+            raise RuntimeError('profiler is already enabled')
+        if hasattr(_bootstrap._find_and_load, '__wrapped__'):
+            raise RuntimeError('another import profiler is enabled')
+        self._thread = _thread.get_ident()
+        self._saved = []
+        self._patch(_bootstrap, '_find_and_load', self._wrap_import)
+        self._patch(_bootstrap, '_find_spec', self._wrap_timer('find'))
+        self._patch(_bootstrap, '_load_unlocked', self._wrap_timer('load'))
+        self._patch(_bootstrap, '_call_with_frames_removed', self._wrap_exec)
+        self._patch(_bootstrap_external, '_path_stat',
+                    self._wrap_counter('stats'))
+        self._patch(_bootstrap_external.FileFinder, '_fill_cache',
+                    self._wrap_counter('listdirs'))
+        self._patch(_bootstrap_external.FileLoader, 'get_data',
+                    self._wrap_read)
+
+    def disable(self):
+        """Stop recording imports."""
+        if self._saved is None:
+            return
+        for owner, name, original in reversed(self._saved):
+            setattr(owner, name, original)
+        self._saved = None
+
+    def _patch(self, owner, name, make_wrapper):
+        original = getattr(owner, name)
+        wrapper = make_wrapper(original)
+        wrapper.__wrapped__ = original
+        self._saved.append((owner, name, original))
+        setattr(owner, name, wrapper)
+
+    def _wrap_import(self, original):
+        stack = self._stack
+        clock = time.perf_counter_ns
+
+        def _find_and_load(name, import_):
+            if _thread.get_ident() != self._thread:
+                return original(name, import_)
+            record = ImportRecord(name)
+            stack[-1].children.append(record)
+            stack.append(record)
+            start = clock()
+            try:
+                return original(name, import_)
+            except BaseException:
+                record.failed = True
+                raise
+            finally:
+                record.cumulative += clock() - start
+                record.load -= record.exec
+                stack.pop()
+        return _find_and_load
+
+    def _wrap_timer(self, field):
+        stack = self._stack
+        clock = time.perf_counter_ns
+
+        def make(original):
+            def wrapper(*args, **kwargs):
+                if _thread.get_ident() != self._thread:
+                    return original(*args, **kwargs)
+                record = stack[-1]
+                start = clock()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    setattr(record, field,
+                            getattr(record, field) + clock() - start)
+            return wrapper
+        return make
+
+    def _wrap_exec(self, original):
+        stack = self._stack
+        clock = time.perf_counter_ns
+
+        def _call_with_frames_removed(f, *args, **kwds):
+            if f is not builtins.exec or _thread.get_ident() != self._thread:
+                return original(f, *args, **kwds)
+            record = stack[-1]
+            start = clock()
+            try:
+                return original(f, *args, **kwds)
+            finally:
+                record.exec += clock() - start
+        return _call_with_frames_removed
+
+    def _wrap_counter(self, field):
+        stack = self._stack
+
+        def make(original):
+            def wrapper(*args, **kwargs):
+                if _thread.get_ident() == self._thread:
+                    record = stack[-1]
+                    setattr(record, field, getattr(record, field) + 1)
+                return original(*args, **kwargs)
+            return wrapper
+        return make
+
+    def _wrap_read(self, original):
+        stack = self._stack
+
+        def get_data(loader, path):
+            data = original(loader, path)
+            if _thread.get_ident() == self._thread:
+                record = stack[-1]
+                record.reads += 1
+                record.read_bytes += len(data)
+            return data
+        return get_data
+
+    def print_tree(self, file=None):
+        """Print the recorded imports as an indented tree, with times in
+        microseconds."""
+        if file is None:
+            file = sys.stdout
+        print(' cumulative |       self |       find |       load |       exec'
+              ' | stats | listdirs | reads | module', file=file)
+        for depth, record in self.root.walk():
+            if record is self.root:
+                continue
+            name = record.name + (' (failed)' if record.failed else '')
+            print(f'{record.cumulative // 1000:>11} '
+                  f'|{record.self_time // 1000:>11} '
+                  f'|{record.find // 1000:>11} '
+                  f'|{record.load // 1000:>11} '
+                  f'|{record.exec // 1000:>11} '
+                  f'|{record.stats:>6} '
+                  f'|{record.listdirs:>9} '
+                  f'|{record.reads:>6} '
+                  f'| {"  " * (depth - 1)}{name}', file=file)
+
+    def collapsed(self):
+        """Return the self time of every import, in microseconds, as
+        collapsed stacks (one ``parent;child value`` line per import)
+        suitable for flame graph tools."""
+        lines = []
+
+        def visit(record, prefix):
+            stack = f'{prefix};{record.name}' if prefix else record.name
+            value = record.self_time // 1000
+            if value > 0:
+                lines.append(f'{stack} {value}')
+            for child in record.children:
+                visit(child, stack)
+
+        for child in self.root.children:
+            visit(child, '')
+        return ''.join(line + '\n' for line in lines)
+
+    def to_json(self, **kwargs):
+        """Return the top-level imports as a JSON array.  Keyword arguments
+        are passed to json.dumps()."""
+        import json
+        return json.dumps([child.to_dict() for child in self.root.children],
+                          **kwargs)
+
+
+def main(args=None):
+    import argparse
+    import os
+    import runpy
+
+    parser = argparse.ArgumentParser(
+        prog='python -m importlib.importtime',
+        description='Profile the imports made by a script, module or '
+                    'command.')
+    parser.add_argument('-o', '--outfile',
+                        help='write the report to OUTFILE instead of stdout')
+    parser.add_argument('-f', '--format', default='tree',
+                        choices=('tree', 'json', 'collapsed'),
+                        help='report format (default: %(default)s)')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-m', dest='module', action='store_true',
+                       help='run TARGET as a library module')
+    group.add_argument('-c', dest='command', action='store_true',
+                       help='run TARGET as a command string')
+    parser.add_argument('target', help='script, module name or command')
+    parser.add_argument('args', nargs=argparse.REMAINDER,
+                        help='arguments passed to TARGET')
+    options = parser.parse_args(args)
+
+    # The profiled code may chdir, so resolve the output path now.
+    if options.outfile is not None:
+        options.outfile = os.path.abspath(options.outfile)
+
+    profiler = ImportProfiler()
+    try:
+        if options.command:
+            sys.argv[:] = ['-c', *options.args]
+            code = compile(options.target, '<string>', 'exec')
+            with profiler:
+                exec(code, {'__name__': '__main__'})
+        elif options.module:
+            sys.argv[:] = [options.target, *options.args]
+            with profiler:
+                runpy.run_module(options.target, run_name='__main__',
+                                 alter_sys=True)
+        else:
+            sys.argv[:] = [options.target, *options.args]
+            sys.path.insert(0, os.path.dirname(options.target))
+            with profiler:
+                runpy.run_path(options.target, run_name='__main__')
+    except SystemExit:
+        pass
+
+    if options.outfile is None:
+        _write_report(profiler, options.format, sys.stdout)
+    else:
+        with open(options.outfile, 'w', encoding='utf-8') as file:
+            _write_report(profiler, options.format, file)
+
+
+def _write_report(profiler, format, file):
+    if format == 'json':
+        file.write(profiler.to_json(indent=2) + '\n')
+    elif format == 'collapsed':
+        file.write(profiler.collapsed())
+    else:
+        profiler.print_tree(file)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,7 @@
 from ._bootstrap_external import ExtensionFileLoader
 from ._bootstrap_external import AppleFrameworkLoader
 from ._bootstrap_external import NamespaceLoader
+from ._bootstrap_external import BundleImporter
 
 
 def all_suffixes():
@@ -764,7 +764,9 @@ def mtime(self):
 
     @method_cache
     def lookup(self, mtime):
-        return Lookup(self)
+        lookup = Lookup(self)
+        _MetadataIndex.update(self, lookup, mtime)
+        return lookup
 
 
 class Lookup:
@@ -818,6 +820,104 @@ def search(self, prepared: Prepared):
         return itertools.chain(infos, eggs)
 
 
+class _MetadataIndex:
+    """
+    Persistent record of the distributions found in a directory.
+
+    When the PYTHONIMPORTINDEX environment variable names a directory,
+    the name, version and entry points of every distribution in a path
+    are saved there, keyed on the path's modification time. Later
+    processes answer those queries from the index instead of reading
+    and parsing each distribution's metadata files.
+    """
+
+    version = 1
+
+    records: dict = {}
+    """Index records by metadata path, consulted by PathDistribution."""
+
+    @staticmethod
+    def directory():
+        from importlib._bootstrap_external import _import_index_dir
+
+        return _import_index_dir()
+
+    @classmethod
+    def update(cls, path: FastPath, lookup: Lookup, mtime) -> None:
+        """
+        Load or rebuild the index for ``path`` and publish its records.
+        """
+        directory = cls.directory()
+        if directory is None or mtime is None:
+            return
+        root = os.path.abspath(path.root or '.')
+        if not os.path.isdir(root):
+            return
+        paths = {
+            os.path.basename(str(child)): child
+            for child in lookup.search(Prepared(None))
+        }
+        for child in paths.values():
+            cls.records.pop(str(child), None)
+        filename = os.path.join(directory, cls._filename(root))
+        dists = cls._load(filename, root, mtime)
+        if dists is None:
+            dists = cls._build(paths)
+            cls._save(filename, root, mtime, dists)
+        for stem, record in dists.items():
+            if stem in paths:
+                cls.records[str(paths[stem])] = record
+
+    @staticmethod
+    def _filename(root):
+        from importlib.util import source_hash
+
+        key = source_hash(os.fsencode(root)).hex()
+        return f'metadata.{key}.json'
+
+    @classmethod
+    def _load(cls, filename, root, mtime):
+        try:
+            with open(filename, encoding='utf-8') as file:
+                data = json.load(file)
+            if (data['version'], data['root'], data['mtime']) == (
+                cls.version,
+                root,
+                mtime,
+            ):
+                return data['dists']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    @staticmethod
+    def _build(paths):
+        dists = {}
+        for stem, child in paths.items():
+            dist = PathDistribution(child)
+            try:
+                metadata = dist.metadata
+                entry_points = [
+                    (ep.name, ep.value, ep.group) for ep in dist.entry_points
+                ]
+            except (OSError, ValueError, TypeError):
+                continue
+            name, version = metadata['Name'], metadata['Version']
+            if name is None or version is None:
+                continue
+            dists[stem] = dict(name=name, version=version, entry_points=entry_points)
+        return dists
+
+    @classmethod
+    def _save(cls, filename, root, mtime, dists):
+        from importlib._bootstrap_external import _write_atomic
+
+        data = dict(version=cls.version, root=root, mtime=mtime, dists=dists)
+        with suppress(OSError):
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            _write_atomic(filename, json.dumps(data).encode('utf-8'))
+
+
 class Prepared:
     """
     A prepared search query for metadata on a possibly-named package.
@@ -894,6 +994,7 @@ def _search_paths(cls, name, paths):
     @classmethod
     def invalidate_caches(cls) -> None:
         FastPath.__new__.cache_clear()
+        _MetadataIndex.records.clear()
 
 
 class PathDistribution(Distribution):
@@ -921,6 +1022,36 @@ def read_text(self, filename: str | os.PathLike[str]) -> Optional[str]:
     def locate_file(self, path: str | os.PathLike[str]) -> SimplePath:
         return self._path.parent / path
 
+    @property
+    def _record(self):
+        """
+        Performance optimization: the persistent index record for
+        this distribution, if any (see ``PYTHONIMPORTINDEX``).
+        """
+        return _MetadataIndex.records.get(str(self._path))
+
+    @property
+    def name(self) -> str:
+        """Return the 'Name' metadata for the distribution package."""
+        record = self._record
+        return record['name'] if record else super().name
+
+    @property
+    def version(self) -> str:
+        """Return the 'Version' metadata for the distribution package."""
+        record = self._record
+        return record['version'] if record else super().version
+
+    @property
+    def entry_points(self) -> EntryPoints:
+        """Return EntryPoints for this distribution."""
+        record = self._record
+        if not record:
+            return super().entry_points
+        return EntryPoints(
+            EntryPoint(*params)._for(self) for params in record['entry_points']
+        )
+
     @property
     def _normalized_name(self):
         """
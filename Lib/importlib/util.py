@@ -1,9 +1,11 @@
 """Utility code for constructing importers, etc."""
 from ._abc import Loader
+from ._bootstrap import BuiltinImporter
 from ._bootstrap import module_from_spec
 from ._bootstrap import _resolve_name
 from ._bootstrap import spec_from_loader
 from ._bootstrap import _find_spec
+from ._bootstrap_external import ExtensionFileLoader
 from ._bootstrap_external import MAGIC_NUMBER
 from ._bootstrap_external import _RAW_MAGIC_NUMBER
 from ._bootstrap_external import cache_from_source
@@ -22,6 +24,16 @@ def source_hash(source_bytes):
     return _imp.source_hash(_RAW_MAGIC_NUMBER, source_bytes)
 
 
+def shared_bytecode(enable=None):
+    """Enable or disable the in-memory cache of bytecode files shared by
+    all interpreters, which saves reading and compiling the modules again.
+
+    Return whether the cache was enabled.  If *enable* is None, the setting
+    is not changed.
+    """
+    return _imp._shared_bytecode(enable)
+
+
 def resolve_name(name, package):
     """Resolve a relative module name to an absolute one."""
     if not name.startswith('.'):
@@ -270,3 +282,70 @@ def exec_module(self, module):
         loader_state['is_loading'] = False
         module.__spec__.loader_state = loader_state
         module.__class__ = _LazyModule
+
+
+class LazyFinder:
+
+    """A meta path finder which makes the modules it finds load lazily.
+
+    The finder asks the other finders on sys.meta_path for a spec and wraps
+    the loader in a LazyLoader.  Only modules named in *include* (or all
+    modules if it is None) and not named in *exclude* are made lazy; naming
+    a package also covers its submodules.  Built-in and extension modules,
+    and specs which carry loader state, are always loaded eagerly.
+
+    Used as a context manager, the finder is placed first on sys.meta_path
+    for the duration of the block.
+    """
+
+    def __init__(self, *, include=None, exclude=()):
+        self.include = None if include is None else frozenset(include)
+        self.exclude = frozenset(exclude)
+        self.deferred = []
+
+    def _matches(self, names, fullname):
+        while fullname not in names:
+            fullname, dot, _ = fullname.rpartition('.')
+            if not dot:
+                return False
+        return True
+
+    def find_spec(self, fullname, path=None, target=None):
+        if self._matches(self.exclude, fullname):
+            return None
+        if self.include is not None and not self._matches(self.include,
+                                                          fullname):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        if (loader is None or spec.loader_state is not None
+                or not hasattr(loader, 'exec_module')
+                or isinstance(loader, (LazyLoader, ExtensionFileLoader))
+                or loader is BuiltinImporter):
+            return spec
+        spec.loader = LazyLoader(loader)
+        self.deferred.append(fullname)
+        return spec
+
+    def loaded(self):
+        """Return the names of the deferred modules that have been loaded."""
+        return [name for name in self.deferred
+                if name in sys.modules
+                and not isinstance(sys.modules[name], _LazyModule)]
+
+    def __enter__(self):
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *args):
+        try:
+            sys.meta_path.remove(self)
+        except ValueError:
+            pass
@@ -25,13 +25,17 @@
 import time
 import marshal
 import re
+import linecache
+import array
+import heapq
+import math
 
 from enum import StrEnum, _simple_enum
 from functools import cmp_to_key
 from dataclasses import dataclass
 from typing import Dict
 
-__all__ = ["Stats", "SortKey", "FunctionProfile", "StatsProfile"]
+__all__ = ["Stats", "SortKey", "FunctionProfile", "StatsProfile", "CompactStats"]
 
 @_simple_enum(StrEnum)
 class SortKey:
@@ -125,6 +129,7 @@ def init(self, arg):
         self.max_name_len = 0
         self.top_level = set()
         self.stats = {}
+        self.line_stats = {}
         self.sort_arg_dict = {}
         self.load_stats(arg)
         try:
@@ -141,6 +146,13 @@ def load_stats(self, arg):
         elif isinstance(arg, str):
             with open(arg, 'rb') as f:
                 self.stats = marshal.load(f)
+                # The line statistics optionally follow the statistics.
+                try:
+                    self.line_stats = marshal.load(f)
+                except EOFError:
+                    pass
+            if _is_compact_data(self.stats):
+                self.stats = CompactStats._from_data(self.stats).to_dict()
             try:
                 file_stats = os.stat(arg)
                 arg = time.ctime(file_stats.st_mtime) + "    " + arg
@@ -151,6 +163,9 @@ def load_stats(self, arg):
             arg.create_stats()
             self.stats = arg.stats
             arg.stats = {}
+            if hasattr(arg, 'line_stats'):
+                self.line_stats = arg.line_stats
+                arg.line_stats = {}
         if not self.stats:
             raise TypeError("Cannot create or construct a %r object from %r"
                             % (self.__class__, arg))
@@ -190,12 +205,17 @@ def add(self, *arg_list):
                 else:
                     old_func_stat = (0, 0, 0, 0, {},)
                 self.stats[func] = add_func_stats(old_func_stat, stat)
+
+            for func, lines in item.line_stats.items():
+                add_line_stats(self.line_stats.setdefault(func, {}), lines)
         return self
 
     def dump_stats(self, filename):
         """Write the profile data to a file we know how to load back."""
         with open(filename, 'wb') as f:
             marshal.dump(self.stats, f)
+            if self.line_stats:
+                marshal.dump(self.line_stats, f)
 
     # list the tuple indices and directions for sorting,
     # along with some printable description
@@ -299,6 +319,12 @@ def strip_dirs(self):
         for func in old_top:
             new_top.add(func_strip_path(func))
 
+        old_line_stats = self.line_stats
+        self.line_stats = {}
+        for func, lines in old_line_stats.items():
+            add_line_stats(self.line_stats.setdefault(func_strip_path(func), {}),
+                           lines)
+
         self.max_name_len = max_name_len
 
         self.fcn_list = None
@@ -458,6 +484,39 @@ def print_callers(self, *amount):
             print(file=self.stream)
         return self
 
+    def print_lines(self, *amount):
+        """Print the line statistics of the functions whose lines were
+        profiled, see cProfile.Profile.profile_lines(), next to their
+        source.  The arguments restrict the functions as for print_stats().
+        """
+        width, list = self.get_print_list(amount)
+        for func in list:
+            if func in self.line_stats:
+                self.print_func_lines(func)
+        return self
+
+    def print_func_lines(self, func):
+        lines = self.line_stats[func]
+        filename, firstlineno, funcname = func
+        total = sum(tt for hits, tt in lines.values())
+        print("Line statistics of %s, total time: %s"
+              % (func_std_string(func), f8(total).strip()), file=self.stream)
+        print(file=self.stream)
+        print('   Line      Hits     Time  Per hit  % Time  Line contents',
+              file=self.stream)
+        for lineno in range(min(firstlineno, min(lines)), max(lines) + 1):
+            source = linecache.getline(filename, lineno).rstrip()
+            if lineno in lines:
+                hits, tt = lines[lineno]
+                percent = 100 * tt / total if total else 0.0
+                print('%7d %9d %s %s %7.1f  %s'
+                      % (lineno, hits, f8(tt), f8(tt / hits) if hits
+                         else ' ' * 8, percent, source), file=self.stream)
+            else:
+                print('%7d %35s  %s' % (lineno, '', source), file=self.stream)
+        print(file=self.stream)
+        print(file=self.stream)
+
     def print_call_heading(self, name_size, column_title):
         print("Function ".ljust(name_size) + column_title, file=self.stream)
         # print sub-header only if we have new-style callers
@@ -517,6 +576,301 @@ def print_line(self, func):  # hack: should print percentages
             print(f8(ct/cc), end=' ', file=self.stream)
         print(func_std_string(func), file=self.stream)
 
+class CompactStats:
+    """Profile statistics stored in flat arrays, for aggregating many runs.
+
+    Each function is numbered once, and its call counts and times, and those
+    of its caller edges, are kept in arrays indexed by these numbers rather
+    than in a tuple and a dictionary per function.  Profiles are merged into
+    the arrays one at a time by add(), so aggregating many files only needs
+    memory for the result and for the file being read.
+
+    The arguments of the constructor and of add() can be file names of
+    profile data (as written by Profile.dump_stats(), Stats.dump_stats() or
+    CompactStats.dump()), Stats or CompactStats instances, or profiler
+    objects.  Use Stats(compact_stats) for the full reports.
+    """
+
+    def __init__(self, *args):
+        self._funcs = []
+        self._index = {}
+        # Per function: primitive calls, calls, internal and cumulative time
+        self._cc = array.array('q')
+        self._nc = array.array('q')
+        self._tt = array.array('d')
+        self._ct = array.array('d')
+        # 1 for the functions that have statistics of their own, 0 for
+        # those only seen as callers
+        self._listed = array.array('b')
+        # Per (callee, caller) edge, found by callee * 2**32 + caller
+        self._edges = {}
+        self._edge_callee = array.array('q')
+        self._edge_caller = array.array('q')
+        self._edge_nc = array.array('q')
+        self._edge_cc = array.array('q')
+        self._edge_tt = array.array('d')
+        self._edge_ct = array.array('d')
+        # True if callers were plain call counts, as profile records them
+        self._count_callers = False
+        self.files = []
+        self.add(*args)
+
+    def __len__(self):
+        return self._listed.count(1)
+
+    def __contains__(self, func):
+        index = self._index.get(func)
+        return index is not None and self._listed[index] == 1
+
+    @property
+    def total_tt(self):
+        return math.fsum(self._tt)
+
+    @property
+    def total_calls(self):
+        return sum(self._nc)
+
+    @property
+    def prim_calls(self):
+        return sum(self._cc)
+
+    def _func_index(self, func):
+        try:
+            return self._index[func]
+        except KeyError:
+            index = self._index[func] = len(self._funcs)
+            self._funcs.append(func)
+            self._cc.append(0)
+            self._nc.append(0)
+            self._tt.append(0.0)
+            self._ct.append(0.0)
+            self._listed.append(0)
+            return index
+
+    def _edge_index(self):
+        # The index of the edges is only built when merging into data
+        # that was loaded from a file.
+        if self._edges is None:
+            self._edges = {(callee << 32) | caller: edge for edge, (callee, caller)
+                           in enumerate(zip(self._edge_callee,
+                                            self._edge_caller))}
+        return self._edges
+
+    def _add_edge(self, callee, caller, nc, cc, tt, ct):
+        edges = self._edge_index()
+        key = (callee << 32) | caller
+        edge = edges.get(key)
+        if edge is None:
+            edges[key] = len(self._edge_callee)
+            self._edge_callee.append(callee)
+            self._edge_caller.append(caller)
+            self._edge_nc.append(nc)
+            self._edge_cc.append(cc)
+            self._edge_tt.append(tt)
+            self._edge_ct.append(ct)
+        else:
+            self._edge_nc[edge] += nc
+            self._edge_cc[edge] += cc
+            self._edge_tt[edge] += tt
+            self._edge_ct[edge] += ct
+
+    def add(self, *args):
+        """Merge the statistics of each argument, one at a time."""
+        for arg in args:
+            if isinstance(arg, CompactStats):
+                self._add_compact(arg)
+                self.files += arg.files
+            elif isinstance(arg, (str, os.PathLike)):
+                with open(arg, 'rb') as f:
+                    data = marshal.load(f)
+                if _is_compact_data(data):
+                    self._add_compact(CompactStats._from_data(data))
+                else:
+                    self._add_dict(data)
+                self.files.append(os.fspath(arg))
+            elif isinstance(arg, Stats):
+                self._add_dict(arg.stats)
+                self.files += arg.files
+            elif hasattr(arg, 'create_stats'):
+                arg.create_stats()
+                self._add_dict(arg.stats)
+            else:
+                raise TypeError(f"cannot add {arg!r} to {type(self).__name__}")
+        return self
+
+    def _add_dict(self, stats):
+        # This is the bottleneck of merging many profiles, hence the
+        # inlined lookups.
+        index_of = self._index
+        func_index = self._func_index
+        add_edge = self._add_edge
+        edges = self._edge_index()
+        f_cc, f_nc, f_tt, f_ct = self._cc, self._nc, self._tt, self._ct
+        listed = self._listed
+        e_nc, e_cc = self._edge_nc, self._edge_cc
+        e_tt, e_ct = self._edge_tt, self._edge_ct
+        for func, (cc, nc, tt, ct, callers) in stats.items():
+            index = index_of.get(func)
+            if index is None:
+                index = func_index(func)
+            f_cc[index] += cc
+            f_nc[index] += nc
+            f_tt[index] += tt
+            f_ct[index] += ct
+            listed[index] = 1
+            base = index << 32
+            for caller, value in callers.items():
+                caller_index = index_of.get(caller)
+                if caller_index is None:
+                    caller_index = func_index(caller)
+                if type(value) is not tuple:
+                    # format used by profile
+                    self._count_callers = True
+                    value = (value, value, 0, 0)
+                edge = edges.get(base | caller_index)
+                if edge is None:
+                    add_edge(index, caller_index, *value)
+                else:
+                    nc2, cc2, tt2, ct2 = value
+                    e_nc[edge] += nc2
+                    e_cc[edge] += cc2
+                    e_tt[edge] += tt2
+                    e_ct[edge] += ct2
+
+    def _add_compact(self, other):
+        indexes = [self._func_index(func) for func in other._funcs]
+        for i, index in enumerate(indexes):
+            self._cc[index] += other._cc[i]
+            self._nc[index] += other._nc[i]
+            self._tt[index] += other._tt[i]
+            self._ct[index] += other._ct[i]
+            self._listed[index] |= other._listed[i]
+        edges = self._edge_index()
+        add_edge = self._add_edge
+        e_nc, e_cc = self._edge_nc, self._edge_cc
+        e_tt, e_ct = self._edge_tt, self._edge_ct
+        for callee, caller, nc, cc, tt, ct in zip(
+                other._edge_callee, other._edge_caller, other._edge_nc,
+                other._edge_cc, other._edge_tt, other._edge_ct):
+            callee = indexes[callee]
+            caller = indexes[caller]
+            edge = edges.get((callee << 32) | caller)
+            if edge is None:
+                add_edge(callee, caller, nc, cc, tt, ct)
+            else:
+                e_nc[edge] += nc
+                e_cc[edge] += cc
+                e_tt[edge] += tt
+                e_ct[edge] += ct
+        self._count_callers |= other._count_callers
+
+    _arrays = ('_cc', '_nc', '_tt', '_ct', '_listed', '_edge_callee', '_edge_caller',
+               '_edge_nc', '_edge_cc', '_edge_tt', '_edge_ct')
+
+    def dump(self, filename):
+        """Write the statistics to a file in the compact format.
+
+        The file can be read by CompactStats and Stats.
+        """
+        data = (_COMPACT_MAGIC, _COMPACT_VERSION, sys.byteorder,
+                self._funcs, self._count_callers,
+                *(getattr(self, name).tobytes() for name in self._arrays))
+        with open(filename, 'wb') as f:
+            marshal.dump(data, f)
+
+    @classmethod
+    def _from_data(cls, data):
+        if data[1] != _COMPACT_VERSION:
+            raise ValueError(f"unsupported compact stats version {data[1]}")
+        self = cls()
+        byteorder, funcs, self._count_callers = data[2:5]
+        self._funcs = [tuple(func) for func in funcs]
+        self._index = {func: index for index, func in enumerate(self._funcs)}
+        for name, raw in zip(self._arrays, data[5:], strict=True):
+            values = getattr(self, name)
+            values.frombytes(raw)
+            if byteorder != sys.byteorder:
+                values.byteswap()
+        self._edges = None
+        return self
+
+    _sort_columns = {
+        'calls': '_nc', 'ncalls': '_nc', 'pcalls': '_cc',
+        'time': '_tt', 'tottime': '_tt',
+        'cumulative': '_ct', 'cumtime': '_ct',
+    }
+
+    def top(self, n, sort='tottime'):
+        """Return the n functions with the largest value of sort.
+
+        sort is one of 'calls', 'pcalls', 'time' and 'cumulative' (or
+        their SortKey equivalents and aliases).  The result is a list of
+        (func, cc, nc, tt, ct) tuples.  Callers are not looked at.
+        """
+        if isinstance(sort, SortKey):
+            sort = sort.value
+        try:
+            column = getattr(self, self._sort_columns[sort])
+        except KeyError:
+            raise ValueError(f"cannot select the top functions by {sort!r}")
+        listed = self._listed
+        indexes = heapq.nlargest(n, (i for i in range(len(self._funcs))
+                                     if listed[i]),
+                                 key=column.__getitem__)
+        return [(self._funcs[i], self._cc[i], self._nc[i], self._tt[i],
+                 self._ct[i]) for i in indexes]
+
+    def _callers_of(self, index):
+        callers = {}
+        for edge, callee in enumerate(self._edge_callee):
+            if callee == index:
+                caller = self._funcs[self._edge_caller[edge]]
+                if self._count_callers:
+                    callers[caller] = self._edge_nc[edge]
+                else:
+                    callers[caller] = (self._edge_nc[edge],
+                                       self._edge_cc[edge],
+                                       self._edge_tt[edge],
+                                       self._edge_ct[edge])
+        return callers
+
+    def get(self, func):
+        """Return the (cc, nc, tt, ct, callers) statistics of func, in the
+        format of Stats.stats."""
+        index = self._index[func]
+        if not self._listed[index]:
+            raise KeyError(func)
+        return (self._cc[index], self._nc[index], self._tt[index],
+                self._ct[index], self._callers_of(index))
+
+    def to_dict(self):
+        """Return all the statistics in the format of Stats.stats."""
+        callers = [{} for _ in self._funcs]
+        funcs = self._funcs
+        for edge, (callee, caller) in enumerate(zip(self._edge_callee,
+                                                    self._edge_caller)):
+            if self._count_callers:
+                value = self._edge_nc[edge]
+            else:
+                value = (self._edge_nc[edge], self._edge_cc[edge],
+                         self._edge_tt[edge], self._edge_ct[edge])
+            callers[callee][funcs[caller]] = value
+        return {func: (self._cc[i], self._nc[i], self._tt[i], self._ct[i],
+                       callers[i])
+                for i, func in enumerate(funcs) if self._listed[i]}
+
+    def create_stats(self):
+        # Allows Stats(compact_stats)
+        self.stats = self.to_dict()
+
+
+_COMPACT_MAGIC = 'pstats.CompactStats'
+_COMPACT_VERSION = 1
+
+def _is_compact_data(data):
+    return (isinstance(data, tuple) and len(data) > 2
+            and data[0] == _COMPACT_MAGIC)
+
 class TupleComp:
     """This class provides a generic function for comparing any two tuples.
     Each instance records a list of tuple-indices (from most significant
@@ -573,6 +927,15 @@ def add_func_stats(target, source):
     return (cc+t_cc, nc+t_nc, tt+t_tt, ct+t_ct,
               add_callers(t_callers, callers))
 
+def add_line_stats(target, source):
+    """Add the hit counts and times of the lines of source to target."""
+    for lineno, (hits, tt) in source.items():
+        if lineno in target:
+            old_hits, old_tt = target[lineno]
+            target[lineno] = old_hits + hits, old_tt + tt
+        else:
+            target[lineno] = hits, tt
+
 def add_callers(target, source):
     """Combine two caller lists in a single list."""
     new_callers = {}
@@ -0,0 +1,352 @@
+"""Statistical profiler for Python programs.
+
+Unlike the deterministic profilers of the profile and cProfile modules,
+which hook every call and return, the sampling profiler takes snapshots of
+the stacks of the running threads at regular intervals from a background
+thread.  The cost is paid per sample rather than per call, so it stays low
+enough to profile production workloads, at the price of statistical rather
+than exact results.
+
+Samples are aggregated into a tree of stacks (a trie keyed by code objects)
+which can be exported as collapsed stacks, the input of flame graph tools,
+or turned into statistics that the pstats module can read.
+
+It can also be run as a script::
+
+    python -m sampleprofile [-i interval] [-o outfile] [-s sort] [--collapsed] [-m module | scriptfile] [arg] ...
+"""
+
+import sys
+import threading
+import time
+
+__all__ = ["run", "runctx", "SamplingProfiler"]
+
+
+def run(statement, filename=None, sort=-1, interval=0.01):
+    """Run statement under the sampling profiler, and print or save the
+    results, like profile.run()."""
+    import __main__
+    dict = __main__.__dict__
+    return runctx(statement, dict, dict, filename, sort, interval)
+
+def runctx(statement, globals, locals, filename=None, sort=-1, interval=0.01):
+    """Run statement under the sampling profiler with the given globals and
+    locals, and print or save the results, like profile.runctx()."""
+    prof = SamplingProfiler(interval)
+    try:
+        prof.runctx(statement, globals, locals)
+    except SystemExit:
+        pass
+    finally:
+        if filename is not None:
+            prof.dump_stats(filename)
+        else:
+            prof.print_stats(sort)
+
+
+class _Node:
+    """A node of the stack tree.
+
+    *count* is the number of samples whose stack went through this node and
+    *time* the wall clock time they stand for, in seconds.
+    """
+
+    __slots__ = ('code', 'count', 'time', 'children')
+
+    def __init__(self, code):
+        self.code = code
+        self.count = 0
+        self.time = 0.0
+        self.children = {}
+
+
+def label(code):
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+class SamplingProfiler:
+    """SamplingProfiler(interval=0.01, *, all_threads=True, max_overhead=0.01)
+
+    Builds a profiler that samples the stacks of all threads, or only of the
+    thread that enables it if all_threads is false, every interval seconds.
+    If max_overhead is not None, the interval is lengthened when taking a
+    sample costs more than that fraction of the elapsed time.
+    """
+
+    def __init__(self, interval=0.01, *, all_threads=True, max_overhead=0.01):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if max_overhead is not None and not 0 < max_overhead < 1:
+            raise ValueError("max_overhead must be between 0 and 1")
+        self.interval = interval
+        self.all_threads = all_threads
+        self.max_overhead = max_overhead
+        self.root = _Node(None)
+        self.samples = 0
+        self.sampling_time = 0.0
+        self.elapsed = 0.0
+        self._target = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def enable(self):
+        """Start sampling in a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("the profiler is already enabled")
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='sampleprofile')
+        self._thread.start()
+
+    def disable(self):
+        """Stop sampling."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        clock = time.perf_counter
+        started = last = clock()
+        wait = self.interval
+        while not self._stop.wait(wait):
+            start = clock()
+            self.sample(start - last)
+            last = start
+            spent = clock() - start
+            self.sampling_time += spent
+            self.elapsed = last - started
+            wait = self.interval
+            if self.max_overhead is not None:
+                wait = max(wait, spent / self.max_overhead - spent)
+
+    def sample(self, weight=None):
+        """Take one sample of the stacks of the profiled threads, standing
+        for weight seconds (the interval by default)."""
+        if weight is None:
+            weight = self.interval
+        frames = sys._current_frames()
+        if not self.all_threads:
+            target = self._target
+            if target is None:
+                target = threading.get_ident()
+            frames = {target: frames[target]} if target in frames else {}
+        sampler = self._thread.ident if self._thread is not None else None
+        root = self.root
+        for thread_id, frame in frames.items():
+            if thread_id == sampler:
+                continue
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            node = root
+            node.count += 1
+            node.time += weight
+            for code in reversed(codes):
+                child = node.children.get(code)
+                if child is None:
+                    child = node.children[code] = _Node(code)
+                child.count += 1
+                child.time += weight
+                node = child
+        self.samples += 1
+
+    @property
+    def overhead(self):
+        """The fraction of the elapsed time spent taking samples."""
+        if not self.elapsed:
+            return 0.0
+        return self.sampling_time / self.elapsed
+
+    def _walk(self):
+        # Yield (node, parent node, depth) in depth-first order, without
+        # recursion since stacks can be deeper than the recursion limit.
+        todo = [(child, None, 1) for child in
+                reversed(self.root.children.values())]
+        while todo:
+            node, parent, depth = todo.pop()
+            yield node, parent, depth
+            todo.extend((child, node, depth + 1) for child in
+                        reversed(node.children.values()))
+
+    def collapsed(self):
+        """Return the samples as collapsed stacks: one line per distinct
+        stack, made of its frames separated by semicolons, a space and the
+        number of samples in which it was the whole stack."""
+        lines = []
+        path = []
+        for node, parent, depth in self._walk():
+            code = node.code
+            del path[depth - 1:]
+            path.append(f'{code.co_filename}:{code.co_firstlineno}'
+                        f'({code.co_qualname})')
+            count = node.count - sum(child.count for child in
+                                     node.children.values())
+            if count > 0:
+                lines.append(f'{";".join(path)} {count}')
+        return ''.join(line + '\n' for line in lines)
+
+    def create_stats(self):
+        self.disable()
+        self.snapshot_stats()
+
+    def snapshot_stats(self):
+        """Build a pstats compatible dictionary in self.stats.
+
+        Call counts are sample counts and times are estimated from them.
+        """
+        self.stats = {}
+        # The number of active frames of each function on the current stack,
+        # to count recursive functions once per sample.
+        active = {}
+        stack = []
+        for node, parent, depth in self._walk():
+            while len(stack) >= depth:
+                active[stack.pop()] -= 1
+            func = label(node.code)
+            nested = sum(child.count for child in node.children.values())
+            nested_time = sum(child.time for child in node.children.values())
+            tt = node.time - nested_time
+            primitive = not active.get(func)
+            cc = node.count if primitive else 0
+            ct = node.time if primitive else 0.0
+            try:
+                prev_cc, prev_nc, prev_tt, prev_ct, callers = self.stats[func]
+            except KeyError:
+                prev_cc = prev_nc = 0
+                prev_tt = prev_ct = 0.0
+                callers = {}
+            self.stats[func] = (prev_cc + cc, prev_nc + node.count,
+                                prev_tt + tt, prev_ct + ct, callers)
+            if parent is not None:
+                caller = label(parent.code)
+                nc, pcc, ptt, pct = callers.get(caller, (0, 0, 0.0, 0.0))
+                callers[caller] = (nc + node.count, pcc + cc, ptt + tt,
+                                   pct + ct)
+            active[func] = active.get(func, 0) + 1
+            stack.append(func)
+
+    def print_stats(self, sort=-1):
+        import pstats
+        if not self.root.children:
+            print("No samples were taken.")
+            return
+        if not isinstance(sort, tuple):
+            sort = (sort,)
+        pstats.Stats(self).strip_dirs().sort_stats(*sort).print_stats()
+
+    def dump_stats(self, file):
+        import marshal
+        with open(file, 'wb') as f:
+            self.create_stats()
+            marshal.dump(self.stats, f)
+
+    # The following methods mirror those of cProfile.Profile.
+
+    def run(self, cmd):
+        import __main__
+        dict = __main__.__dict__
+        return self.runctx(cmd, dict, dict)
+
+    def runctx(self, cmd, globals, locals):
+        self.enable()
+        try:
+            exec(cmd, globals, locals)
+        finally:
+            self.disable()
+        return self
+
+    def runcall(self, func, /, *args, **kw):
+        self.enable()
+        try:
+            return func(*args, **kw)
+        finally:
+            self.disable()
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+
+def main():
+    import argparse
+    import importlib.machinery
+    import io
+    import os
+    import pstats
+    import runpy
+
+    parser = argparse.ArgumentParser(
+        prog='python -m sampleprofile',
+        description='Profile a script or module by sampling its stacks.')
+    parser.add_argument('-i', '--interval', type=float, default=0.01,
+                        help='sampling interval in seconds '
+                             '(default: %(default)s)')
+    parser.add_argument('-o', '--outfile',
+                        help='save stats (or collapsed stacks) to OUTFILE')
+    parser.add_argument('-s', '--sort', default=2,
+                        choices=sorted(pstats.Stats.sort_arg_dict_default),
+                        help='sort order when printing to stdout')
+    parser.add_argument('--collapsed', action='store_true',
+                        help='output collapsed stacks for flame graphs')
+    parser.add_argument('-m', dest='module', action='store_true',
+                        help='profile a library module')
+    parser.add_argument('target', help='script file or module name')
+    parser.add_argument('args', nargs=argparse.REMAINDER,
+                        help='arguments passed to the program')
+    options = parser.parse_args()
+
+    # The script that we're profiling may chdir, so capture the absolute path
+    # to the output file at startup.
+    if options.outfile is not None:
+        options.outfile = os.path.abspath(options.outfile)
+
+    sys.argv[:] = [options.target, *options.args]
+    if options.module:
+        code = "run_module(modname, run_name='__main__', alter_sys=True)"
+        globs = {
+            'run_module': runpy.run_module,
+            'modname': options.target,
+        }
+    else:
+        progname = options.target
+        sys.path.insert(0, os.path.dirname(progname))
+        with io.open_code(progname) as fp:
+            code = compile(fp.read(), progname, 'exec')
+        spec = importlib.machinery.ModuleSpec(name='__main__', loader=None,
+                                              origin=progname)
+        globs = {
+            '__spec__': spec,
+            '__file__': spec.origin,
+            '__name__': spec.name,
+            '__package__': None,
+            '__cached__': None,
+        }
+
+    prof = SamplingProfiler(options.interval)
+    try:
+        prof.runctx(code, globs, None)
+    except SystemExit:
+        pass
+    if options.collapsed:
+        if options.outfile is None:
+            sys.stdout.write(prof.collapsed())
+        else:
+            with open(options.outfile, 'w', encoding='utf-8') as f:
+                f.write(prof.collapsed())
+    elif options.outfile is not None:
+        prof.dump_stats(options.outfile)
+    else:
+        prof.print_stats(options.sort)
+
+# When invoked as main program, invoke the profiler on a script
+if __name__ == '__main__':
+    main()
@@ -75,6 +75,8 @@
 import _sitebuiltins
 import io
 import stat
+import _imp
+import marshal
 
 # Prefixes for site-packages; add additional prefixes like /usr/local here
 PREFIXES = [sys.prefix, sys.exec_prefix]
@@ -94,6 +96,93 @@ def _trace(message):
         print(message, file=sys.stderr)
 
 
+# Set by main() when -X sitetime is given.
+_timing = False
+
+def _clock():
+    import time
+    return time.perf_counter_ns()
+
+# Time spent in the .pth files reported since the start of the current
+# phase, excluded from the self time of the phase.
+_nested_time = 0
+
+def _report_time(label, start, nested=False):
+    """Print the microseconds elapsed since *start*, less the time of the
+    nested steps reported meanwhile, and return a new start."""
+    global _nested_time
+    elapsed = _clock() - start
+    if not nested:
+        elapsed -= _nested_time
+        _nested_time = 0
+    print(f"site time: {elapsed // 1000:>10} | {label}", file=sys.stderr)
+    now = _clock()
+    if nested:
+        _nested_time += now - start
+    return now
+
+
+class _StartupSnapshot:
+    """Listings of site directories and contents of .pth files.
+
+    The snapshot is loaded from and saved to the directory named by the
+    PYTHONIMPORTINDEX environment variable.  An entry is only used while the
+    directory or file it was read from keeps its modification time and size.
+    """
+
+    _version = 1
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.cached = {}
+        self.entries = {}
+        try:
+            with open(filename, 'rb') as f:
+                data = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if (type(data) is tuple and len(data) == 2
+                and data[0] == self._version and type(data[1]) is dict):
+            self.cached = data[1]
+
+    @classmethod
+    def load(cls):
+        """Return the snapshot for this interpreter, or None if disabled."""
+        import _frozen_importlib_external as _bootstrap_external
+        directory = _bootstrap_external._import_index_dir()
+        if directory is None:
+            return None
+        key = sys.executable.encode('utf-8', 'surrogatepass')
+        digest = _imp.source_hash(_bootstrap_external._RAW_MAGIC_NUMBER,
+                                  key).hex()
+        tag = sys.implementation.cache_tag
+        return cls(os.path.join(directory, f'site.{tag}.{digest}'))
+
+    def get(self, path, st):
+        entry = self.cached.get(path)
+        if entry is not None and entry[:2] == (st.st_mtime_ns, st.st_size):
+            self.entries[path] = entry
+            return entry[2]
+        return None
+
+    def set(self, path, st, value):
+        self.entries[path] = (st.st_mtime_ns, st.st_size, value)
+
+    def save(self):
+        if self.entries == self.cached:
+            return
+        import _frozen_importlib_external as _bootstrap_external
+        try:
+            _bootstrap_external._write_atomic(
+                self.filename, marshal.dumps((self._version, self.entries)))
+        except OSError:
+            pass
+
+
+# The snapshot in use while main() runs.
+_snapshot = None
+
+
 def makepath(*paths):
     dir = os.path.join(*paths)
     try:
@@ -178,23 +267,37 @@ def addpackage(sitedir, name, known_paths):
         _trace(f"Skipping hidden .pth file: {fullname!r}")
         return
     _trace(f"Processing .pth file: {fullname!r}")
-    try:
-        with io.open_code(fullname) as f:
-            pth_content = f.read()
-    except OSError:
-        return
+    if _timing:
+        start = _clock()
+    lines = None
+    if _snapshot is not None:
+        # Validate the contents of the target of a symbolic link
+        try:
+            st = os.stat(fullname)
+        except OSError:
+            return
+        lines = _snapshot.get(fullname, st)
+    if lines is None:
+        try:
+            with io.open_code(fullname) as f:
+                pth_content = f.read()
+        except OSError:
+            return
 
-    try:
-        pth_content = pth_content.decode()
-    except UnicodeDecodeError:
-        # Fallback to locale encoding for backward compatibility.
-        # We will deprecate this fallback in the future.
-        import locale
-        pth_content = pth_content.decode(locale.getencoding())
-        _trace(f"Cannot read {fullname!r} as UTF-8. "
-               f"Using fallback encoding {locale.getencoding()!r}")
-
-    for n, line in enumerate(pth_content.splitlines(), 1):
+        try:
+            pth_content = pth_content.decode()
+        except UnicodeDecodeError:
+            # Fallback to locale encoding for backward compatibility.
+            # We will deprecate this fallback in the future.
+            import locale
+            pth_content = pth_content.decode(locale.getencoding())
+            _trace(f"Cannot read {fullname!r} as UTF-8. "
+                   f"Using fallback encoding {locale.getencoding()!r}")
+        lines = pth_content.splitlines()
+        if _snapshot is not None:
+            _snapshot.set(fullname, st, lines)
+
+    for n, line in enumerate(lines, 1):
         if line.startswith("#"):
             continue
         if line.strip() == "":
@@ -217,6 +320,8 @@ def addpackage(sitedir, name, known_paths):
                     print('  '+line, file=sys.stderr)
             print("\nRemainder of file ignored", file=sys.stderr)
             break
+    if _timing:
+        _report_time(f"  {fullname}", start, nested=True)
     if reset:
         known_paths = None
     return known_paths
@@ -235,13 +340,23 @@ def addsitedir(sitedir, known_paths=None):
     if not sitedircase in known_paths:
         sys.path.append(sitedir)        # Add path component
         known_paths.add(sitedircase)
-    try:
-        names = os.listdir(sitedir)
-    except OSError:
-        return
-    names = [name for name in names
-             if name.endswith(".pth") and not name.startswith(".")]
-    for name in sorted(names):
+    names = None
+    if _snapshot is not None:
+        try:
+            st = os.stat(sitedir)
+        except OSError:
+            return
+        names = _snapshot.get(sitedir, st)
+    if names is None:
+        try:
+            names = os.listdir(sitedir)
+        except OSError:
+            return
+        names = sorted(name for name in names
+                       if name.endswith(".pth") and not name.startswith("."))
+        if _snapshot is not None:
+            _snapshot.set(sitedir, st, names)
+    for name in names:
         addpackage(sitedir, name, known_paths)
     if reset:
         known_paths = None
@@ -637,28 +752,51 @@ def main():
     This function is called automatically when this module is imported,
     unless the python interpreter was started with the -S flag.
     """
-    global ENABLE_USER_SITE
+    global ENABLE_USER_SITE, _snapshot, _timing
 
+    _timing = 'sitetime' in sys._xoptions
+    if _timing:
+        print("site time: self [us] | phase", file=sys.stderr)
+        start = _clock()
+    _snapshot = _StartupSnapshot.load()
     orig_path = sys.path[:]
     known_paths = removeduppaths()
     if orig_path != sys.path:
         # removeduppaths() might make sys.path absolute.
         # fix __file__ and __cached__ of already imported modules too.
         abs_paths()
+    if _timing:
+        start = _report_time("removeduppaths", start)
 
     known_paths = venv(known_paths)
+    if _timing:
+        start = _report_time("venv", start)
     if ENABLE_USER_SITE is None:
         ENABLE_USER_SITE = check_enableusersite()
     known_paths = addusersitepackages(known_paths)
+    if _timing:
+        start = _report_time("addusersitepackages", start)
     known_paths = addsitepackages(known_paths)
+    if _timing:
+        start = _report_time("addsitepackages", start)
+    if _snapshot is not None:
+        _snapshot.save()
+        _snapshot = None
     setquit()
     setcopyright()
     sethelper()
     if not sys.flags.isolated:
         enablerlcompleter()
+    if _timing:
+        start = _report_time("builtins", start)
     execsitecustomize()
+    if _timing:
+        start = _report_time("sitecustomize", start)
     if ENABLE_USER_SITE:
         execusercustomize()
+        if _timing:
+            start = _report_time("usercustomize", start)
+    _timing = False
 
 # Prevent extending of sys.path when python was started with -S and
 # site is imported later.
@@ -126,6 +126,7 @@ class will essentially render the service "deaf" while one request is
 import socket
 import selectors
 import os
+import queue
 import sys
 import threading
 from io import BufferedIOBase
@@ -136,7 +137,8 @@ class will essentially render the service "deaf" while one request is
            "BaseRequestHandler", "StreamRequestHandler",
            "DatagramRequestHandler", "ThreadingMixIn"]
 if hasattr(os, "fork"):
-    __all__.extend(["ForkingUDPServer","ForkingTCPServer", "ForkingMixIn"])
+    __all__.extend(["ForkingUDPServer","ForkingTCPServer", "ForkingMixIn",
+                    "PreForkingTCPServer", "PreForkingMixIn"])
 if hasattr(socket, "AF_UNIX"):
     __all__.extend(["UnixStreamServer","UnixDatagramServer",
                     "ThreadingUnixStreamServer",
@@ -670,14 +672,100 @@ def join(self):
         pass
 
 
+class _ThreadPool:
+    """
+    Fixed-size pool of reusable threads fed from a bounded queue.
+
+    Threads are started on demand, up to max_threads.  When the queue of
+    pending requests is full, submit() blocks, so that the server stops
+    accepting new connections until a thread is free.
+    """
+    def __init__(self, server, max_threads, max_pending, daemon):
+        self.server = server
+        self.max_threads = max_threads
+        self.daemon = daemon
+        self.requests = queue.Queue(max_pending)
+        self.threads = set()
+        self.idle = 0
+        self.closing = False
+        self.lock = threading.Lock()
+
+    def submit(self, request, client_address):
+        with self.lock:
+            if self.idle <= self.requests.qsize() and \
+                    len(self.threads) < self.max_threads:
+                t = threading.Thread(target=self.worker)
+                t.daemon = self.daemon
+                self.threads.add(t)
+                t.start()
+        self.requests.put((request, client_address))
+
+    def worker(self):
+        try:
+            while not self.closing:
+                with self.lock:
+                    self.idle += 1
+                item = self.requests.get()
+                with self.lock:
+                    self.idle -= 1
+                if item is None:
+                    # Pass the wakeup on to the next idle thread
+                    self._wakeup()
+                    break
+                self.server.process_request_thread(*item)
+        finally:
+            with self.lock:
+                self.threads.discard(threading.current_thread())
+
+    def _wakeup(self):
+        try:
+            self.requests.put_nowait(None)
+        except queue.Full:
+            # Only possible while the threads are busy; they check
+            # self.closing once their request is handled.
+            pass
+
+    def join(self, wait=True):
+        with self.lock:
+            threads = list(self.threads)
+        if wait:
+            # The pending requests are handled before the threads stop.
+            self.requests.put(None)
+            for thread in threads:
+                thread.join()
+        else:
+            # Don't block: drop the pending requests and let the busy
+            # threads stop after their current request.
+            self.closing = True
+            while True:
+                try:
+                    item = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    self.server.shutdown_request(item[0])
+            self._wakeup()
+
+
 class ThreadingMixIn:
-    """Mix-in class to handle each request in a new thread."""
+    """Mix-in class to handle each request in a new thread.
+
+    If max_threads is set, requests are instead handed to a pool of at
+    most max_threads reusable threads.
+    """
 
     # Decides how threads will act upon termination of the
     # main process
     daemon_threads = False
     # If true, server_close() waits until all non-daemonic threads terminate.
     block_on_close = True
+    # If not None, the maximum number of threads handling requests.
+    max_threads = None
+    # Number of accepted requests that may wait for a free thread when
+    # max_threads is set; None means max_threads and 0 means no limit.
+    # Once the limit is reached, no more requests are accepted until a
+    # thread is free.
+    max_pending_requests = None
     # Threads object
     # used by server_close() to wait for all threads completion.
     _threads = _NoThreads()
@@ -697,6 +785,17 @@ def process_request_thread(self, request, client_address):
 
     def process_request(self, request, client_address):
         """Start a new thread to process the request."""
+        if self.max_threads is not None:
+            pool = vars(self).get('_pool')
+            if pool is None:
+                max_pending = self.max_pending_requests
+                if max_pending is None:
+                    max_pending = self.max_threads
+                pool = self._pool = _ThreadPool(self, self.max_threads,
+                                                max_pending,
+                                                self.daemon_threads)
+            pool.submit(request, client_address)
+            return
         if self.block_on_close:
             vars(self).setdefault('_threads', _Threads())
         t = threading.Thread(target = self.process_request_thread,
@@ -707,16 +806,206 @@ def process_request(self, request, client_address):
 
     def server_close(self):
         super().server_close()
+        pool = vars(self).pop('_pool', None)
+        if pool is not None:
+            pool.join(wait=self.block_on_close)
         self._threads.join()
 
 
 if hasattr(os, "fork"):
+    class PreForkingMixIn:
+        """Mix-in class to serve requests from a pool of pre-forked processes.
+
+        serve_forever() forks *workers* long-lived processes which all
+        accept requests, and then supervises them: workers that exit are
+        replaced, and restart_workers() replaces the whole pool without
+        dropping the listening socket.  Combine with ThreadingMixIn to
+        handle several requests concurrently within each worker.
+        """
+
+        # Number of worker processes; None means os.process_cpu_count().
+        workers = None
+        # If not None, a worker exits after handling this many requests
+        # and is replaced by a fresh process.
+        max_worker_requests = None
+        # If true, each worker binds its own listening socket with
+        # SO_REUSEPORT and the kernel balances connections between them.
+        # Otherwise all workers accept on the socket bound by the parent.
+        reuse_port = False
+        # If true, serve_forever() waits until all workers have exited.
+        block_on_close = True
+        # Set in a worker process to its index in the pool.
+        worker_index = None
+
+        def __init__(self, *args, **kwargs):
+            self._shutdown_request = threading.Event()
+            self._is_shut_down = threading.Event()
+            self._restart_request = False
+            # pid -> index for the current workers, and pid -> write end
+            # of the pipe a worker watches; closing it stops the worker.
+            self._worker_pids = {}
+            self._worker_pipes = {}
+            self._retired_pids = set()
+            super().__init__(*args, **kwargs)
+
+        def server_bind(self):
+            if self.reuse_port:
+                self.socket.setsockopt(socket.SOL_SOCKET,
+                                       socket.SO_REUSEPORT, 1)
+            super().server_bind()
+
+        def server_activate(self):
+            # With reuse_port the parent only holds on to the address;
+            # connections are accepted by the workers' own sockets.
+            if not self.reuse_port or self.worker_index is not None:
+                super().server_activate()
+
+        def serve_forever(self, poll_interval=0.5):
+            """Start the worker processes and supervise them until shutdown.
+
+            Polls for shutdown and for exited workers every poll_interval
+            seconds.
+            """
+            self._is_shut_down.clear()
+            try:
+                while True:
+                    self._reap_workers()
+                    if self._restart_request:
+                        self._restart_request = False
+                        old_pids = list(self._worker_pids)
+                        self._spawn_workers(poll_interval, restart=True)
+                        self._retire_workers(old_pids)
+                    self._spawn_workers(poll_interval)
+                    if self._shutdown_request.wait(poll_interval):
+                        break
+            finally:
+                self._retire_workers(list(self._worker_pids))
+                self._reap_workers(blocking=self.block_on_close)
+                self._shutdown_request.clear()
+                self._is_shut_down.set()
+
+        def shutdown(self):
+            """Stop the serve_forever loop and the worker processes.
+
+            Blocks until the workers have exited. This must be called while
+            serve_forever() is running in another thread, or it will
+            deadlock.
+            """
+            self._shutdown_request.set()
+            self._is_shut_down.wait()
+
+        def restart_workers(self):
+            """Gracefully replace all worker processes.
+
+            New workers are started first; the old ones stop accepting
+            requests and exit once the requests they are handling are
+            complete.  Safe to call from a signal handler.
+            """
+            self._restart_request = True
+
+        def _spawn_workers(self, poll_interval, restart=False):
+            workers = self.workers or os.process_cpu_count() or 1
+            used = set() if restart else set(self._worker_pids.values())
+            for index in range(workers):
+                if index in used:
+                    continue
+                stop_r, stop_w = os.pipe()
+                try:
+                    pid = os.fork()
+                except:
+                    os.close(stop_r)
+                    os.close(stop_w)
+                    raise
+                if pid:
+                    os.close(stop_r)
+                    self._worker_pids[pid] = index
+                    self._worker_pipes[pid] = stop_w
+                else:
+                    # Worker process.  This must never return.
+                    os.close(stop_w)
+                    for fd in self._worker_pipes.values():
+                        os.close(fd)
+                    self._run_worker(index, stop_r, poll_interval)
+
+        def _retire_workers(self, pids):
+            for pid in pids:
+                del self._worker_pids[pid]
+                os.close(self._worker_pipes.pop(pid))
+                self._retired_pids.add(pid)
+
+        def _reap_workers(self, *, blocking=False):
+            flags = 0 if blocking else os.WNOHANG
+            for pid in list(self._worker_pids) + list(self._retired_pids):
+                try:
+                    if not os.waitpid(pid, flags)[0]:
+                        continue
+                except ChildProcessError:
+                    pass
+                if pid in self._worker_pids:
+                    del self._worker_pids[pid]
+                    os.close(self._worker_pipes.pop(pid))
+                self._retired_pids.discard(pid)
+
+        def _run_worker(self, index, stop_fd, poll_interval):
+            status = 1
+            try:
+                self.worker_index = index
+                self._worker_stopping = False
+                self._handled_requests = 0
+                if self.reuse_port:
+                    self.socket.close()
+                    self.socket = socket.socket(self.address_family,
+                                                self.socket_type)
+                    self.server_bind()
+                    self.server_activate()
+                # Several workers may be woken up for the same connection;
+                # those which lose the race must not block in accept().
+                self.socket.settimeout(poll_interval)
+                self._serve_worker(stop_fd, poll_interval)
+                status = 0
+            except KeyboardInterrupt:
+                status = 0
+            except:
+                import traceback
+                traceback.print_exc()
+            finally:
+                try:
+                    self.server_close()
+                finally:
+                    os._exit(status)
+
+        def _serve_worker(self, stop_fd, poll_interval):
+            # The worker stops once the parent closes its end of the pipe,
+            # or exits.
+            with _ServerSelector() as selector:
+                selector.register(self, selectors.EVENT_READ)
+                selector.register(stop_fd, selectors.EVENT_READ)
+                while not self._worker_stopping:
+                    ready = selector.select(poll_interval)
+                    if any(key.fd == stop_fd for key, _ in ready):
+                        break
+                    if ready:
+                        self._handle_request_noblock()
+                    self.service_actions()
+
+        def process_request(self, request, client_address):
+            """Count the requests handled by a worker, then process it."""
+            if self.worker_index is not None:
+                self._handled_requests += 1
+                if (self.max_worker_requests is not None and
+                        self._handled_requests >= self.max_worker_requests):
+                    self._worker_stopping = True
+            super().process_request(request, client_address)
+
     class ForkingUDPServer(ForkingMixIn, UDPServer): pass
     class ForkingTCPServer(ForkingMixIn, TCPServer): pass
 
 class ThreadingUDPServer(ThreadingMixIn, UDPServer): pass
 class ThreadingTCPServer(ThreadingMixIn, TCPServer): pass
 
+if hasattr(os, "fork"):
+    class PreForkingTCPServer(PreForkingMixIn, ThreadingMixIn, TCPServer): pass
+
 if hasattr(socket, 'AF_UNIX'):
 
     class UnixStreamServer(TCPServer):
@@ -844,6 +1133,9 @@ def write(self, b):
     def fileno(self):
         return self._sock.fileno()
 
+    def sendfile(self, file, offset=0, count=None):
+        return self._sock.sendfile(file, offset, count)
+
 class DatagramRequestHandler(BaseRequestHandler):
 
     """Define self.rfile and self.wfile for datagram sockets."""
@@ -2662,6 +2662,10 @@ def test_not_implemented(self):
             NotImplementedError, loop.get_debug)
         self.assertRaises(
             NotImplementedError, loop.set_debug, f)
+        self.assertRaises(
+            NotImplementedError, loop.get_profiler)
+        self.assertRaises(
+            NotImplementedError, loop.set_profiler, f)
 
     def test_not_implemented_async(self):
 
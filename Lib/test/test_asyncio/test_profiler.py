@@ -0,0 +1,168 @@
+"""Tests for asyncio/profiler.py"""
+
+import json
+import time
+import unittest
+
+import asyncio
+from asyncio import tasks
+
+
+def tearDownModule():
+    asyncio.set_event_loop_policy(None)
+
+
+class HistogramTests(unittest.TestCase):
+
+    def test_add(self):
+        hist = asyncio.Histogram([0.001, 0.01])
+        for duration in (0.0005, 0.001, 0.002, 0.5):
+            hist.add(duration)
+        self.assertEqual(hist.counts, [2, 1, 1])
+        self.assertEqual(hist.count, 4)
+        self.assertAlmostEqual(hist.total, 0.5035)
+        self.assertEqual(hist.max, 0.5)
+        self.assertEqual(hist.as_dict(), {'bounds': [0.001, 0.01],
+                                          'counts': [2, 1, 1],
+                                          'count': 4,
+                                          'total': hist.total,
+                                          'max': 0.5})
+
+
+class LoopProfilerTests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.profiler = asyncio.LoopProfiler(slow_callback_duration=0.05)
+
+    def install(self):
+        loop = asyncio.get_running_loop()
+        self.assertIsNone(loop.get_profiler())
+        loop.set_profiler(self.profiler)
+        self.addCleanup(loop.set_profiler, None)
+        self.assertIs(loop.get_profiler(), self.profiler)
+
+    def get_stats(self, name):
+        [stats] = [stats for stats in self.profiler.task_stats()
+                   if stats.name == name]
+        return stats
+
+    async def test_task_stats(self):
+        async def busy():
+            for _ in range(3):
+                time.sleep(0.02)
+                await asyncio.sleep(0)
+
+        async def idle():
+            await asyncio.sleep(0.1)
+
+        self.install()
+        await asyncio.sleep(0)
+        busy_task = asyncio.create_task(busy(), name='busy')
+        idle_task = asyncio.create_task(idle(), name='idle')
+        await busy_task
+        stats = self.get_stats('busy')
+        self.assertTrue(stats.done)
+        self.assertEqual(stats.coro, busy.__qualname__)
+        self.assertEqual(stats.steps, 4)
+        self.assertGreaterEqual(stats.running_time, 0.06)
+        self.assertGreaterEqual(stats.max_step_time, 0.02)
+        self.assertLess(stats.max_step_time, stats.running_time)
+        self.assertLess(stats.cpu_time, stats.running_time)
+        self.assertGreaterEqual(stats.wall_time, stats.running_time)
+        self.assertAlmostEqual(stats.awaiting_time,
+                               stats.wall_time - stats.running_time)
+
+        stats = self.get_stats('idle')
+        self.assertFalse(stats.done)
+        self.assertEqual(stats.steps, 1)
+        wall_time = stats.wall_time
+        await idle_task
+        self.assertTrue(stats.done)
+        self.assertEqual(stats.steps, 2)
+        self.assertGreater(stats.wall_time, wall_time)
+        self.assertGreaterEqual(stats.awaiting_time, 0.09)
+        self.assertLess(stats.running_time, stats.awaiting_time)
+
+    async def test_loop_stats(self):
+        loop = asyncio.get_running_loop()
+        self.install()
+        await asyncio.sleep(0.01)
+        done = loop.create_future()
+        loop.call_soon(time.sleep, 0.06)
+        loop.call_soon(done.set_result, None)
+        await done
+
+        profiler = self.profiler
+        self.assertGreater(profiler.iterations.count, 1)
+        self.assertGreater(profiler.callbacks.count, 2)
+        self.assertGreaterEqual(profiler.callbacks.max, 0.06)
+        self.assertGreaterEqual(profiler.iterations.max, 0.06)
+        self.assertGreaterEqual(profiler.idle_time, 0.005)
+        [slow] = profiler.slow_callbacks
+        self.assertIn('sleep', slow['callback'])
+        self.assertGreaterEqual(slow['duration'], 0.06)
+
+        profiler.reset()
+        self.assertEqual(profiler.callbacks.count, 0)
+        self.assertEqual(list(profiler.slow_callbacks), [])
+        self.assertEqual(profiler.task_stats(), [])
+        await asyncio.sleep(0)
+        self.assertGreater(profiler.callbacks.count, 0)
+
+    async def test_as_dict(self):
+        async def child():
+            await asyncio.sleep(0)
+
+        self.install()
+        await asyncio.sleep(0)
+        await asyncio.create_task(child(), name='child')
+        data = json.loads(json.dumps(self.profiler.as_dict()))
+        self.assertEqual(sorted(data), ['callbacks', 'idle_time', 'iterations',
+                                        'slow_callbacks', 'tasks'])
+        [task] = [task for task in data['tasks'] if task['name'] == 'child']
+        self.assertEqual(task['steps'], 2)
+        self.assertIs(task['done'], True)
+        self.assertEqual(sorted(task),
+                         ['awaiting_time', 'coro', 'cpu_time', 'done',
+                          'max_step_time', 'name', 'running_time', 'steps',
+                          'wall_time'])
+        self.assertEqual(sum(data['callbacks']['counts']),
+                         data['callbacks']['count'])
+
+    async def test_max_finished_tasks(self):
+        self.profiler = asyncio.LoopProfiler(max_finished_tasks=2)
+        self.install()
+        await asyncio.sleep(0)
+        for i in range(4):
+            await asyncio.create_task(asyncio.sleep(0), name=f'task{i}')
+        self.assertEqual([stats.name for stats in self.profiler.task_stats()
+                          if stats.done], ['task2', 'task3'])
+
+    async def test_debug_mode(self):
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        self.addCleanup(loop.set_debug, False)
+        self.install()
+        await asyncio.sleep(0)
+        await asyncio.create_task(asyncio.sleep(0), name='task')
+        self.assertEqual(self.get_stats('task').steps, 2)
+
+
+@unittest.skipUnless(hasattr(tasks, '_CTask'),
+                     'requires the C _asyncio module')
+class PyTaskLoopProfilerTests(LoopProfilerTests):
+    # The tasks of IsolatedAsyncioTestCase are C tasks, check that Python
+    # tasks are profiled too.
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        loop = asyncio.get_running_loop()
+        loop.set_task_factory(
+            lambda loop, coro, **kwargs: tasks._PyTask(coro, loop=loop,
+                                                       **kwargs))
+        self.addCleanup(loop.set_task_factory, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import compileall
 import contextlib
 import filecmp
+import importlib.machinery
 import importlib.util
 import io
 import os
@@ -451,6 +452,54 @@ def test_multiple_optimization_levels(self):
                 except Exception:
                     pass
 
+    def test_equivalent_optimization_levels(self):
+        # Without asserts, levels 0 and 1 are compiled once.
+        script = script_helper.make_script(self.directory, "test_equiv",
+                                           "'''doc'''\na = 0")
+        bc = [importlib.util.cache_from_source(script, optimization=opt)
+              for opt in ("", 1, 2)]
+        with mock.patch('py_compile.compile',
+                        wraps=py_compile.compile) as compile_mock:
+            compileall.compile_file(script, quiet=True, optimize=[0, 1, 2])
+        self.assertEqual(compile_mock.call_count, 2)
+        with open(bc[0], 'rb') as f0, open(bc[1], 'rb') as f1:
+            self.assertEqual(f0.read(), f1.read())
+        self.assertTrue(os.path.isfile(bc[2]))
+
+        script = script_helper.make_script(self.directory, "test_assert",
+                                           "assert a")
+        with mock.patch('py_compile.compile',
+                        wraps=py_compile.compile) as compile_mock:
+            compileall.compile_file(script, quiet=True, optimize=[0, 1, 2])
+        self.assertEqual(compile_mock.call_count, 3)
+
+    def test_compile_dir_skips_up_to_date(self):
+        # Only timestamp-based pycs are checked for being up-to-date.
+        timestamp = py_compile.PycInvalidationMode.TIMESTAMP
+        self.assertTrue(compileall.compile_dir(
+            self.directory, quiet=2, invalidation_mode=timestamp))
+        with mock.patch('compileall.compile_file') as compile_file_mock:
+            self.assertTrue(compileall.compile_dir(
+                self.directory, quiet=2, invalidation_mode=timestamp))
+        self.assertFalse(compile_file_mock.called)
+        with mock.patch('compileall.compile_file') as compile_file_mock:
+            compileall.compile_dir(self.directory, quiet=2, force=True,
+                                   invalidation_mode=timestamp)
+        self.assertEqual(compile_file_mock.call_count, 3)
+
+    def test_compile_dir_timing(self):
+        timestamp = py_compile.PycInvalidationMode.TIMESTAMP
+        with support.captured_stdout() as stdout:
+            compileall.compile_dir(self.directory, quiet=2, timing=True,
+                                   invalidation_mode=timestamp)
+        output = stdout.getvalue()
+        self.assertIn('listing', output)
+        self.assertIn('(0 up to date), compiling', output)
+        with support.captured_stdout() as stdout:
+            compileall.compile_dir(self.directory, quiet=2, timing=True,
+                                   invalidation_mode=timestamp)
+        self.assertIn('(3 up to date), compiling', stdout.getvalue())
+
     @os_helper.skip_unless_symlink
     def test_ignore_symlink_destination(self):
         # Create folders for allowed files, symlinks and prohibited area
@@ -865,6 +914,14 @@ def test_workers(self):
         for file in files:
             self.assertCompiled(file)
 
+    def test_timing(self):
+        bar2fn = script_helper.make_script(self.directory, 'bar2', '')
+        out = self.assertRunOK('-q', '--timing', self.directory)
+        self.assertRegex(out, rb'Timing for .*: listing [\d.]+s \(\d+ files\), '
+                              rb'checking [\d.]+s \(0 up to date\), '
+                              rb'compiling [\d.]+s \(\d+ files\)')
+        self.assertCompiled(bar2fn)
+
     @mock.patch('compileall.compile_dir')
     def test_workers_available_cores(self, compile_dir):
         with mock.patch("sys.argv",
@@ -1155,5 +1212,101 @@ class HardlinkDedupTestsNoSourceEpoch(HardlinkDedupTestsBase,
     pass
 
 
+class BundleTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = self.enterContext(os_helper.temp_dir())
+        self.pkgdir = os.path.join(self.directory, 'bundlepkg')
+        os.mkdir(self.pkgdir)
+        self.initfn = script_helper.make_script(
+            self.pkgdir, '__init__', 'from . import sub\n')
+        self.subfn = script_helper.make_script(
+            self.pkgdir, 'sub', 'def f():\n    return __name__\n')
+        self.topfn = script_helper.make_script(
+            self.directory, 'bundletop', 'value = 42\n')
+        # Not a package, so its modules are left out
+        os.mkdir(os.path.join(self.directory, 'plain'))
+        script_helper.make_script(os.path.join(self.directory, 'plain'),
+                                  'mod', '')
+        script_helper.make_script(self.directory, 'bad', 'def')
+        self.bundle = os.path.join(self.directory, 'modules.pybundle')
+        self.enterContext(test.test_importlib.util.uncache(
+            'bundlepkg', 'bundlepkg.sub', 'bundletop'))
+
+    def compile_bundle(self, **kwargs):
+        with support.captured_stdout() as stdout:
+            ok = compileall.compile_bundle(self.directory, self.bundle,
+                                           **kwargs)
+        return ok, stdout.getvalue()
+
+    def importer(self, **kwargs):
+        importer = importlib.machinery.BundleImporter(self.bundle, **kwargs)
+        self.enterContext(test.test_importlib.util.import_state(
+            meta_path=[importer] + sys.meta_path))
+        return importer
+
+    def test_compile_bundle(self):
+        ok, output = self.compile_bundle()
+        self.assertFalse(ok)
+        self.assertIn('SyntaxError', output)
+        importer = self.importer()
+        self.assertEqual(sorted(importer._modules),
+                         ['bundlepkg', 'bundlepkg.sub', 'bundletop'])
+        self.assertIsNone(importer.find_spec('plain.mod'))
+
+        import bundlepkg, bundletop
+        self.assertIs(bundlepkg.__loader__, importer)
+        self.assertIs(bundlepkg.sub.__loader__, importer)
+        self.assertEqual(bundlepkg.sub.f(), 'bundlepkg.sub')
+        self.assertEqual(bundletop.value, 42)
+        self.assertEqual(bundlepkg.__file__, self.initfn)
+        self.assertEqual(bundlepkg.__path__, [self.pkgdir])
+        self.assertEqual(bundlepkg.sub.f.__code__.co_filename, self.subfn)
+        self.assertTrue(importer.is_package('bundlepkg'))
+        self.assertFalse(importer.is_package('bundletop'))
+        self.assertEqual(importer.get_source('bundletop'), 'value = 42\n')
+        # No .pyc files are written
+        self.assertFalse(os.path.exists(os.path.join(self.pkgdir,
+                                                     '__pycache__')))
+
+    def test_ddir(self):
+        ddir = os.path.join(os.sep, 'installed')
+        self.compile_bundle(ddir=ddir, quiet=2)
+        importer = self.importer()
+        self.assertEqual(importer.get_filename('bundletop'),
+                         os.path.join(ddir, 'bundletop.py'))
+
+    def test_check_source(self):
+        self.compile_bundle(quiet=2)
+        importer = self.importer(check_source=True)
+        self.assertIsNotNone(importer.find_spec('bundletop'))
+        with open(self.topfn, 'a') as f:
+            f.write('other = 1\n')
+        self.assertIsNone(importer.find_spec('bundletop'))
+        self.assertIsNotNone(self.importer().find_spec('bundletop'))
+
+    def test_optimize(self):
+        self.compile_bundle(quiet=2, optimize=sys.flags.optimize + 1)
+        self.assertIsNone(self.importer().find_spec('bundletop'))
+
+    def test_not_a_bundle(self):
+        with self.assertRaises(ImportError):
+            importlib.machinery.BundleImporter(self.topfn)
+        with open(self.bundle, 'wb'):
+            pass
+        with self.assertRaises(ImportError):
+            importlib.machinery.BundleImporter(self.bundle)
+
+    def test_command_line(self):
+        os_helper.unlink(os.path.join(self.directory, 'bad.py'))
+        rc, out, err = script_helper.assert_python_ok(
+            '-m', 'compileall', '-q', '--bundle', self.bundle,
+            self.directory)
+        self.assertEqual(out, b'')
+        self.assertTrue(os.path.isfile(self.bundle))
+        script_helper.assert_python_failure(
+            '-m', 'compileall', '--bundle', self.bundle, self.topfn)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -86,6 +86,63 @@ def test_throw(self):
                 self.assertEqual(cc, 1)
                 self.assertEqual(nc, 1)
 
+    def test_profile_lines(self):
+        def f(n):
+            total = 0
+            for i in range(n):
+                total += i
+            return total
+        def g():
+            return f(2)
+
+        ticks = iter(range(1_000_000))
+        pr = self.profilerclass(lambda: next(ticks), timeunit=1)
+        pr.profile_lines(f)
+        with pr:
+            g()
+            f(1)
+        pr.create_stats()
+        first = f.__code__.co_firstlineno
+        func = cProfile.label(f.__code__)
+        lines = pr.line_stats[func]
+        self.assertEqual(sorted(lines), [first + 1, first + 2, first + 3,
+                                         first + 4])
+        self.assertEqual({lineno - first: hits
+                          for lineno, (hits, tt) in lines.items()},
+                         {1: 2, 2: 5, 3: 3, 4: 2})
+        for hits, tt in lines.values():
+            self.assertGreaterEqual(tt, hits)
+        self.assertEqual(list(pr.line_stats), [func])
+        [entry] = [entry for entry in pr.getstats()
+                   if entry.code is f.__code__]
+        self.assertEqual(len(entry), 6)
+        self.assertEqual([lineno - first for lineno, hits, tt in entry.lines],
+                         [1, 2, 3, 4])
+
+        # The line events are only enabled while profiling
+        self.assertEqual(
+            sys.monitoring.get_local_events(sys.monitoring.PROFILER_ID,
+                                            f.__code__), 0)
+
+    def test_profile_lines_while_enabled(self):
+        def f():
+            return 1
+
+        pr = self.profilerclass()
+        with pr:
+            f()
+            pr.profile_lines(f.__code__)
+            f()
+        pr.create_stats()
+        [(hits, tt)] = pr.line_stats[cProfile.label(f.__code__)].values()
+        self.assertEqual(hits, 1)
+
+    def test_profile_lines_errors(self):
+        pr = self.profilerclass()
+        self.assertRaises(TypeError, pr.profile_lines, 1)
+        self.assertRaises(TypeError, pr.profile_lines, len)
+        self.assertRaises(TypeError, pr.profile_lines)
+
 
 class TestCommandLine(unittest.TestCase):
     def test_sort(self):
@@ -819,6 +819,78 @@ def test_freeze(self):
         gc.unfreeze()
         self.assertEqual(gc.get_freeze_count(), 0)
 
+    def test_type_stats(self):
+        class Point:
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+        name = f'{__name__}.{Point.__qualname__}'
+        points = [Point(i, i) for i in range(100)]
+        big = list(range(1000))
+
+        self.assertEqual(gc.get_type_stats(), {})
+        gc.enable_type_stats()
+        self.addCleanup(gc.disable_type_stats)
+        self.assertEqual(gc.get_type_stats(), {})
+        gc.collect()
+        stats = gc.get_type_stats()
+        self.assertEqual(stats[name], (100, 100 * sys.getsizeof(points[0])))
+        count, size = stats['list']
+        self.assertGreaterEqual(count, 2)
+        self.assertGreaterEqual(size, sys.getsizeof(big)
+                                      + sys.getsizeof(points))
+        self.assertNotIn('int', stats)
+
+        # A copy is returned
+        stats.clear()
+        self.assertIn(name, gc.get_type_stats())
+
+        gc.disable_type_stats()
+        self.assertEqual(gc.get_type_stats(), {})
+
+    def test_type_stats_incremental(self):
+        class Node:
+            pass
+        name = f'{__name__}.{Node.__qualname__}'
+        nodes = [Node() for i in range(10)]
+        gc.enable_type_stats()
+        self.addCleanup(gc.disable_type_stats)
+        gc.collect()
+        self.assertEqual(gc.get_type_stats()[name][0], 10)
+
+        # The statistics are updated when the collection cycles complete
+        nodes += [Node() for i in range(10)]
+        for _ in range(1000):
+            gc.collect(1)
+            if gc.get_type_stats()[name][0] == 20:
+                break
+        else:
+            self.fail("the type statistics were not updated")
+
+    def test_type_stats_dont_keep_types_alive(self):
+        gc.enable_type_stats()
+        self.addCleanup(gc.disable_type_stats)
+        gc.collect()
+        # Start a new incremental cycle
+        gc.collect(1)
+        class Node:
+            pass
+        node = Node()
+        refcount = sys.getrefcount(Node)
+        # The types are not referenced by the statistics of the
+        # incomplete cycles either
+        for _ in range(5):
+            gc.collect(1)
+            self.assertEqual(sys.getrefcount(Node), refcount)
+        if not Py_GIL_DISABLED:
+            # On the free-threaded build, local classes can survive
+            # gc.collect() once threads were created, with or without
+            # the statistics.
+            ref = weakref.ref(Node)
+            del node, Node
+            gc.collect()
+            self.assertIsNone(ref())
+
     def test_get_objects(self):
         gc.collect()
         l = []
@@ -339,6 +339,46 @@ def test_parse_all_octets(self):
             self.assertIn(' folded with space', folded)
             self.assertTrue(folded.endswith('folded with tab'))
 
+    def test_parse_headers_matches_email_parser(self):
+        # parse_headers() builds simple header blocks directly; the result
+        # must be the same as what the email parser would produce.
+        import email.parser
+        blocks = [
+            b'\r\n',
+            b'',
+            b'Content-Length: 0\r\n\r\n',
+            b'A: 1\r\nb: 2\r\nA: 3\r\n\r\n',
+            b'Empty:\r\nSpaces:   \t \r\n\n',
+            b'Fold: a\r\n b\r\n\tc\r\nNext: d\r\n\r\n',
+            b'Fold:\r\n  a\r\n\r\n',
+            b'Latin: \xe9\x85\xff\r\n\r\n',
+            b'Unterminated: x',
+            b'Content-Type: text/html; charset=utf-8\r\n\r\n',
+            # Not handled by the fast path.
+            b' leading: continuation\r\n\r\n',
+            b'First: val\r\n: nval\r\nSecond: val\r\n\r\n',
+            b'From nobody\r\nA: 1\r\n\r\n',
+            b'No colon\r\nA: 1\r\n\r\n',
+            b'Space before : colon\r\n\r\n',
+            b'Bare: cr\rEnd: x\r\n\r\n',
+            b'Content-Type: multipart/mixed; boundary=x\r\n\r\n',
+            b'Content-Type: message/rfc822\r\n\r\n',
+        ]
+        for block in blocks:
+            with self.subTest(block=block):
+                msg = client.parse_headers(io.BytesIO(block))
+                expected = email.parser.Parser(
+                    _class=client.HTTPMessage).parsestr(
+                        block.decode('iso-8859-1'))
+                self.assertIsInstance(msg, client.HTTPMessage)
+                self.assertEqual(msg.items(), expected.items())
+                self.assertEqual(msg.is_multipart(), expected.is_multipart())
+                if not expected.is_multipart():
+                    self.assertEqual(msg.get_payload(), expected.get_payload())
+                self.assertEqual(msg.get_unixfrom(), expected.get_unixfrom())
+                self.assertEqual([type(d) for d in msg.defects],
+                                 [type(d) for d in expected.defects])
+
     def test_invalid_headers(self):
         conn = client.HTTPConnection('example.com')
         conn.sock = FakeSocket('')
@@ -548,6 +548,121 @@ def test_head(self):
         self.assertEqual(response.getheader('content-type'),
                          'application/octet-stream')
 
+    def test_range(self):
+        data = self.data
+        size = len(data)
+        for value, start, end in [
+            ('bytes=0-4', 0, 4),
+            ('bytes=5-', 5, size - 1),
+            ('bytes=-6', size - 6, size - 1),
+            ('bytes=-1000', 0, size - 1),
+            ('bytes=3-1000', 3, size - 1),
+            ('bytes=0-3, 2-6, 7-9', 0, 9),
+            ('Bytes = 1-2', 1, 2),
+        ]:
+            with self.subTest(value=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'Range': value})
+                self.check_status_and_reason(response,
+                                             HTTPStatus.PARTIAL_CONTENT,
+                                             data=data[start:end + 1])
+                self.assertEqual(response.getheader('Content-Range'),
+                                 'bytes %d-%d/%d' % (start, end, size))
+                self.assertEqual(response.getheader('Content-Length'),
+                                 str(end - start + 1))
+
+    def test_multiple_ranges(self):
+        response = self.request(self.base_url + '/test',
+                                headers={'Range': 'bytes=-4,0-1,10-12'})
+        body = self.check_status_and_reason(response,
+                                            HTTPStatus.PARTIAL_CONTENT)
+        self.assertEqual(response.getheader('Content-Length'),
+                         str(len(body)))
+        ctype = response.getheader('Content-Type')
+        self.assertTrue(ctype.startswith('multipart/byteranges; boundary='))
+        msg = email.message_from_bytes(
+            b'Content-Type: ' + ctype.encode() + b'\r\n' + body)
+        parts = msg.get_payload()
+        size = len(self.data)
+        expected = [(0, 1), (10, 12), (size - 4, size - 1)]
+        self.assertEqual(len(parts), len(expected))
+        for part, (start, end) in zip(parts, expected):
+            self.assertEqual(part['Content-Type'], 'application/octet-stream')
+            self.assertEqual(part['Content-Range'],
+                             'bytes %d-%d/%d' % (start, end, size))
+            self.assertEqual(part.get_payload(decode=True),
+                             self.data[start:end + 1])
+
+    def test_range_ignored(self):
+        for value in ['bytes=', 'bytes=5-2', 'bytes=x-', 'bytes=1-2-3',
+                      'bytes=-', 'items=0-1', '0-1']:
+            with self.subTest(value=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'Range': value})
+                self.check_status_and_reason(response, HTTPStatus.OK,
+                                             data=self.data)
+
+    def test_range_not_satisfiable(self):
+        for value in ['bytes=%d-' % len(self.data), 'bytes=-0',
+                      'bytes=1000-2000, 2000-']:
+            with self.subTest(value=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'Range': value})
+                self.check_status_and_reason(
+                    response, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.assertEqual(response.getheader('Content-Range'),
+                                 'bytes */%d' % len(self.data))
+
+    def test_if_range(self):
+        response = self.request(self.base_url + '/test')
+        self.check_status_and_reason(response, HTTPStatus.OK, data=self.data)
+        self.assertEqual(response.getheader('Accept-Ranges'), 'bytes')
+        etag = response.getheader('ETag')
+        self.assertTrue(etag.startswith('"'))
+        for if_range in [etag, self.last_modif_header]:
+            with self.subTest(if_range=if_range):
+                response = self.request(
+                    self.base_url + '/test',
+                    headers={'Range': 'bytes=0-1', 'If-Range': if_range})
+                self.check_status_and_reason(response,
+                                             HTTPStatus.PARTIAL_CONTENT,
+                                             data=self.data[:2])
+        for if_range in ['"other"', 'W/' + etag,
+                         'Thu, 01 Jan 1970 00:00:00 GMT']:
+            with self.subTest(if_range=if_range):
+                response = self.request(
+                    self.base_url + '/test',
+                    headers={'Range': 'bytes=0-1', 'If-Range': if_range})
+                self.check_status_and_reason(response, HTTPStatus.OK,
+                                             data=self.data)
+
+    def test_head_range(self):
+        response = self.request(self.base_url + '/test', method='HEAD',
+                                headers={'Range': 'bytes=1-3'})
+        self.check_status_and_reason(response, HTTPStatus.PARTIAL_CONTENT)
+        self.assertEqual(response.getheader('Content-Length'), '3')
+
+    def test_file_info_cache(self):
+        cache = {}
+        self.request_handler.file_info_cache = cache
+        self.addCleanup(delattr, self.request_handler, 'file_info_cache')
+        response = self.request(self.base_url + '/test')
+        self.check_status_and_reason(response, HTTPStatus.OK, data=self.data)
+        etag = response.getheader('ETag')
+        self.assertEqual(len(cache), 1)
+        # The cached entry is used as long as the file is unchanged.
+        response = self.request(self.base_url + '/test')
+        self.check_status_and_reason(response, HTTPStatus.OK, data=self.data)
+        self.assertEqual(response.getheader('ETag'), etag)
+        # A modified file gets a new ETag.
+        data = self.data + b'!'
+        path = os.path.join(self.tempdir, 'test')
+        with open(path, 'wb') as f:
+            f.write(data)
+        response = self.request(self.base_url + '/test')
+        self.check_status_and_reason(response, HTTPStatus.OK, data=data)
+        self.assertNotEqual(response.getheader('ETag'), etag)
+
     def test_browser_cache(self):
         """Check that when a request to /test is sent with the request header
         If-Modified-Since set to date of last modification, the server returns
@@ -582,10 +697,33 @@ def test_browser_cache_with_If_None_Match_header(self):
 
         headers = email.message.Message()
         headers['If-Modified-Since'] = self.last_modif_header
-        headers['If-None-Match'] = "*"
+        headers['If-None-Match'] = '"other"'
         response = self.request(self.base_url + '/test', headers=headers)
         self.check_status_and_reason(response, HTTPStatus.OK)
 
+    def test_browser_cache_etag(self):
+        response = self.request(self.base_url + '/test')
+        self.check_status_and_reason(response, HTTPStatus.OK, data=self.data)
+        etag = response.getheader('ETag')
+        for if_none_match in [etag, 'W/' + etag, '"other", ' + etag, '*']:
+            with self.subTest(if_none_match=if_none_match):
+                headers = email.message.Message()
+                headers['If-None-Match'] = if_none_match
+                response = self.request(self.base_url + '/test',
+                                        headers=headers)
+                self.check_status_and_reason(response,
+                                             HTTPStatus.NOT_MODIFIED)
+                self.assertEqual(response.getheader('ETag'), etag)
+
+        # If-None-Match takes precedence over If-Modified-Since
+        old_dt = self.last_modif_datetime - datetime.timedelta(days=365)
+        headers = email.message.Message()
+        headers['If-Modified-Since'] = email.utils.format_datetime(old_dt,
+            usegmt=True)
+        headers['If-None-Match'] = etag
+        response = self.request(self.base_url + '/test', headers=headers)
+        self.check_status_and_reason(response, HTTPStatus.NOT_MODIFIED)
+
     def test_invalid_requests(self):
         response = self.request('/', method='FOO')
         self.check_status_and_reason(response, HTTPStatus.NOT_IMPLEMENTED)
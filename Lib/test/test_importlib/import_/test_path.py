@@ -6,6 +6,8 @@
 import os
 import sys
 import tempfile
+import textwrap
+from test.support import os_helper, script_helper
 from types import ModuleType
 import unittest
 import warnings
@@ -238,5 +240,214 @@ def find_spec(fullname, target=None):
  ) = util.test_both(PathEntryFinderTests, machinery=machinery)
 
 
+class PathIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(os_helper.rmtree, self.directory)
+        self.index_dir = os.path.join(self.directory, 'index')
+        self.first = os.path.join(self.directory, 'first')
+        self.second = os.path.join(self.directory, 'second')
+        for directory in self.index_dir, self.first, self.second:
+            os.mkdir(directory)
+
+    def import_mod(self):
+        code = textwrap.dedent(f'''
+            import sys
+            sys.path[:0] = [{self.first!r}, {self.second!r}]
+            import mod
+            print(mod.__file__)
+            print({self.second!r} in sys.path_importer_cache)
+        ''')
+        res = script_helper.assert_python_ok(
+            '-c', code, PYTHONIMPORTINDEX=self.index_dir, __isolated=False)
+        filename, scanned = res.out.decode().splitlines()
+        return filename, scanned == 'True'
+
+    def test_index(self):
+        second_mod = os.path.join(self.second, 'mod.py')
+        with open(second_mod, 'w') as file:
+            file.write('')
+        self.assertEqual(self.import_mod(), (second_mod, True))
+        self.assertTrue(os.listdir(self.index_dir))
+        # The module is now resolved without searching sys.path
+        self.assertEqual(self.import_mod(), (second_mod, False))
+
+        # A module added earlier on sys.path invalidates the index
+        first_mod = os.path.join(self.first, 'mod.py')
+        with open(first_mod, 'w') as file:
+            file.write('')
+        mtime = os.stat(self.first).st_mtime + 10
+        os.utime(self.first, (mtime, mtime))
+        self.assertEqual(self.import_mod(), (first_mod, False))
+        self.assertEqual(self.import_mod(), (first_mod, False))
+
+        # A removed module is found by searching sys.path again
+        os.unlink(first_mod)
+        self.assertEqual(self.import_mod(), (second_mod, True))
+
+    def test_index_with_bytecode(self):
+        # Writing __pycache__ into a sys.path entry does not invalidate the
+        # index
+        second_mod = os.path.join(self.second, 'mod.py')
+        with open(second_mod, 'w') as file:
+            file.write('')
+        with os_helper.EnvironmentVarGuard() as env:
+            env.unset('PYTHONDONTWRITEBYTECODE')
+            self.assertEqual(self.import_mod(), (second_mod, True))
+            self.assertIn('__pycache__', os.listdir(self.second))
+            self.assertEqual(self.import_mod(), (second_mod, False))
+
+    def test_module_added_after_bytecode(self):
+        # A module added to an entry after this process created its
+        # __pycache__ still invalidates the index
+        with open(os.path.join(self.first, 'helper.py'), 'w') as file:
+            file.write('')
+        second_mod = os.path.join(self.second, 'mod.py')
+        with open(second_mod, 'w') as file:
+            file.write('')
+        first_mod = os.path.join(self.first, 'mod.py')
+        code = textwrap.dedent(f'''
+            import os, sys
+            sys.path[:0] = [{self.first!r}, {self.second!r}]
+            import helper, mod
+            assert os.path.isdir({os.path.join(self.first, '__pycache__')!r})
+            with open({first_mod!r}, 'w') as file:
+                pass
+            mtime = os.stat({self.first!r}).st_mtime + 10
+            os.utime({self.first!r}, (mtime, mtime))
+        ''')
+        with os_helper.EnvironmentVarGuard() as env:
+            env.unset('PYTHONDONTWRITEBYTECODE')
+            script_helper.assert_python_ok(
+                '-c', code, PYTHONIMPORTINDEX=self.index_dir,
+                __isolated=False)
+            self.assertEqual(self.import_mod()[0], first_mod)
+
+    def test_max_files(self):
+        prefix = f'importindex.{sys.implementation.cache_tag}.'
+        for i in range(20):
+            filename = os.path.join(self.index_dir, f'{prefix}{i}')
+            with open(filename, 'wb'):
+                pass
+            os.utime(filename, (i, i))
+        other = os.path.join(self.index_dir, 'other')
+        with open(other, 'wb'):
+            pass
+        os.utime(other, (0, 0))
+        with open(os.path.join(self.second, 'mod.py'), 'w') as file:
+            file.write('')
+        self.import_mod()
+        names = os.listdir(self.index_dir)
+        self.assertIn('other', names)
+        indexes = [name for name in names if name.startswith(prefix)]
+        self.assertEqual(len(indexes), 16)
+        # The oldest indexes were removed
+        self.assertNotIn(f'{prefix}0', indexes)
+        self.assertIn(f'{prefix}19', indexes)
+
+
+class NegativeCacheTests(unittest.TestCase):
+
+    # The frozen PathFinder is the one the import system uses.
+    PathFinder = machinery['Frozen'].PathFinder
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(os_helper.rmtree, self.directory)
+        self.path = [self.directory]
+        self.addCleanup(sys.path_importer_cache.pop, self.directory, None)
+        self.addCleanup(self.PathFinder._negative_cache.clear)
+        self.calls = 0
+
+    def find_spec(self, name):
+        finder = self.PathFinder._path_importer_cache(self.directory)
+        original = finder.find_spec
+        def find_spec(*args):
+            self.calls += 1
+            return original(*args)
+        finder.find_spec = find_spec
+        try:
+            return self.PathFinder.find_spec(name, self.path)
+        finally:
+            del finder.find_spec
+
+    def touch(self, name, directory=None):
+        if directory is None:
+            directory = self.directory
+        with open(os.path.join(directory, name), 'w') as file:
+            file.write('')
+        # Make sure the FileFinder notices the change.
+        mtime = os.stat(directory).st_mtime + 10
+        os.utime(directory, (mtime, mtime))
+
+    def test_missing_module(self):
+        self.assertIsNone(self.find_spec('mod'))
+        self.assertIsNone(self.find_spec('mod'))
+        self.assertEqual(self.calls, 1)
+
+        self.touch('mod.py')
+        spec = self.find_spec('mod')
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(spec.origin, os.path.join(self.directory, 'mod.py'))
+        self.assertIsNotNone(self.find_spec('mod'))
+        self.assertEqual(self.calls, 3)
+
+    def test_namespace_package(self):
+        os.mkdir(os.path.join(self.directory, 'ns'))
+        for _ in range(2):
+            spec = self.find_spec('ns')
+            self.assertIsNone(spec.loader)
+            self.assertEqual(list(spec.submodule_search_locations),
+                             [os.path.join(self.directory, 'ns')])
+        self.assertEqual(self.calls, 1)
+
+    def test_namespace_package_init(self):
+        # Adding an __init__ file makes the namespace package a regular one.
+        ns = os.path.join(self.directory, 'ns')
+        os.mkdir(ns)
+        self.assertIsNone(self.find_spec('ns').loader)
+        self.touch('__init__.py', ns)
+        spec = self.find_spec('ns')
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(spec.origin, os.path.join(ns, '__init__.py'))
+
+    def test_path_change(self):
+        self.assertIsNone(self.find_spec('mod'))
+        self.path.append(os.path.join(self.directory, 'missing'))
+        self.assertIsNone(self.find_spec('mod'))
+        self.assertEqual(self.calls, 2)
+
+    def test_finder_change(self):
+        self.assertIsNone(self.find_spec('mod'))
+        del sys.path_importer_cache[self.directory]
+        self.assertIsNone(self.find_spec('mod'))
+        self.assertEqual(self.calls, 2)
+
+    def test_invalidate_caches(self):
+        self.assertIsNone(self.find_spec('mod'))
+        importlib['Frozen'].invalidate_caches()
+        self.assertIsNone(self.find_spec('mod'))
+        self.assertEqual(self.calls, 2)
+
+    def test_other_finders(self):
+        # Finders other than FileFinder cannot be revalidated.
+        finder = TestFinder()
+        with util.import_state(path_importer_cache={self.directory: finder}):
+            self.assertIsNone(self.PathFinder.find_spec('mod', self.path))
+            self.assertIsNone(self.PathFinder.find_spec('mod', self.path))
+        self.assertEqual(finder.calls, 2)
+
+
+class TestFinder:
+
+    def __init__(self):
+        self.calls = 0
+
+    def find_spec(self, fullname, target=None):
+        self.calls += 1
+        return None
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,8 @@
+import os
 import re
 import pickle
 import unittest
+import unittest.mock
 import warnings
 import importlib
 import importlib.metadata
@@ -19,6 +21,7 @@
     Distribution,
     EntryPoint,
     PackageNotFoundError,
+    _MetadataIndex,
     _unique,
     distributions,
     entry_points,
@@ -466,3 +469,61 @@ def test_origin(self):
         dist = Distribution.from_name('distinfo-pkg')
         assert dist.origin.url.endswith('.whl')
         assert dist.origin.archive_info.hashes.sha256
+
+
+class MetadataIndexTests(fixtures.DistInfoPkg, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.index_dir = self.fixtures.enter_context(fixtures.tempdir())
+        directory = staticmethod(lambda: str(self.index_dir))
+        self.fixtures.enter_context(
+            unittest.mock.patch.object(_MetadataIndex, 'directory', directory)
+        )
+        self.reset()
+        self.addCleanup(self.reset)
+
+    @staticmethod
+    def reset():
+        importlib.invalidate_caches()
+
+    def rewrite(self, name, text):
+        """
+        Rewrite a metadata file in place, leaving the site dir untouched.
+        """
+        path = self.site_dir / 'distinfo_pkg-1.0.0.dist-info' / name
+        stat = self.site_dir.stat()
+        path.write_text(text, encoding='utf-8')
+        os.utime(self.site_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    def test_index_written(self):
+        assert version('distinfo-pkg') == '1.0.0'
+        indexes = list(self.index_dir.glob('metadata.*.json'))
+        assert len(indexes) == 1
+
+    def test_warm_lookup_uses_index(self):
+        assert entry_points(group='entries').names == {'main', 'ns:sub'}
+        self.reset()
+        self.rewrite('METADATA', 'Name: distinfo-pkg\nVersion: 2.0\n')
+        self.rewrite('entry_points.txt', '[entries]\nother = mod:main\n')
+        assert version('distinfo-pkg') == '1.0.0'
+        assert entry_points(group='entries').names == {'main', 'ns:sub'}
+        ep = entry_points(group='entries')['main']
+        assert ep.dist.name == 'distinfo-pkg'
+
+    def test_index_invalidated_by_mtime(self):
+        assert version('distinfo-pkg') == '1.0.0'
+        self.reset()
+        self.rewrite('METADATA', 'Name: distinfo-pkg\nVersion: 2.0\n')
+        stat = self.site_dir.stat()
+        os.utime(self.site_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert version('distinfo-pkg') == '2.0'
+
+    def test_corrupt_index_is_rebuilt(self):
+        assert version('distinfo-pkg') == '1.0.0'
+        self.reset()
+        (index,) = self.index_dir.glob('metadata.*.json')
+        index.write_text('not json', encoding='utf-8')
+        self.rewrite('METADATA', 'Name: distinfo-pkg\nVersion: 2.0\n')
+        assert version('distinfo-pkg') == '2.0'
+        self.reset()
+        assert version('distinfo-pkg') == '2.0'
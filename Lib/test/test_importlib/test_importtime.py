@@ -0,0 +1,131 @@
+import json
+import os
+import unittest
+
+from importlib import _bootstrap, _bootstrap_external
+from importlib.importtime import ImportProfiler
+from test.support import os_helper
+from test.support.script_helper import assert_python_ok
+from test.test_importlib import util as test_util
+
+
+class ImportProfilerTests(unittest.TestCase):
+
+    def profile_package(self):
+        # Import a package whose __init__ imports a submodule, which itself
+        # tries to import a missing module.
+        init = 'from . import sub\n'
+        sub = ('try:\n'
+               '    import _importtime_missing\n'
+               'except ImportError:\n'
+               '    pass\n')
+        with test_util.temp_module('_importtime_pkg', init, pkg=True) as location:
+            test_util.submodule('_importtime_pkg', 'sub', location, sub)
+            with test_util.uncache('_importtime_pkg.sub'):
+                with ImportProfiler() as profiler:
+                    import _importtime_pkg
+        return profiler
+
+    def test_tree(self):
+        profiler = self.profile_package()
+        [pkg] = profiler.root.children
+        self.assertEqual(pkg.name, '_importtime_pkg')
+        [sub] = pkg.children
+        self.assertEqual(sub.name, '_importtime_pkg.sub')
+        [missing] = sub.children
+        self.assertEqual(missing.name, '_importtime_missing')
+        self.assertTrue(missing.failed)
+        self.assertFalse(pkg.failed)
+
+        self.assertGreater(pkg.cumulative, sub.cumulative)
+        self.assertEqual(pkg.self_time, pkg.cumulative - sub.cumulative)
+        self.assertGreater(pkg.find, 0)
+        self.assertGreater(pkg.exec, sub.cumulative)
+        self.assertGreaterEqual(pkg.load, 0)
+        self.assertGreater(pkg.stats, 0)
+        self.assertGreater(missing.stats, 0)
+        self.assertEqual(pkg.reads, 1)
+        self.assertEqual(sub.reads, 1)
+        self.assertGreater(pkg.read_bytes, 0)
+        self.assertEqual(missing.reads, 0)
+
+    def test_disable_restores(self):
+        original = _bootstrap._find_and_load
+        path_stat = _bootstrap_external._path_stat
+        profiler = ImportProfiler()
+        profiler.enable()
+        try:
+            self.assertIsNot(_bootstrap._find_and_load, original)
+            with self.assertRaises(RuntimeError):
+                profiler.enable()
+            with self.assertRaises(RuntimeError):
+                ImportProfiler().enable()
+        finally:
+            profiler.disable()
+        self.assertIs(_bootstrap._find_and_load, original)
+        self.assertIs(_bootstrap_external._path_stat, path_stat)
+        profiler.disable()
+
+    def test_print_tree(self):
+        profiler = self.profile_package()
+        with open(os_helper.TESTFN, 'w+', encoding='utf-8') as file:
+            self.addCleanup(os_helper.unlink, os_helper.TESTFN)
+            profiler.print_tree(file)
+            file.seek(0)
+            lines = file.read().splitlines()
+        self.assertIn('cumulative', lines[0])
+        names = [line.rpartition('| ')[2] for line in lines[1:]]
+        self.assertEqual(names, ['_importtime_pkg', '  _importtime_pkg.sub',
+                                 '    _importtime_missing (failed)'])
+
+    def test_collapsed(self):
+        profiler = self.profile_package()
+        for line in profiler.collapsed().splitlines():
+            stack, _, value = line.rpartition(' ')
+            self.assertTrue(stack.startswith('_importtime_pkg'), line)
+            self.assertGreater(int(value), 0)
+        self.assertIn('_importtime_pkg;_importtime_pkg.sub',
+                      profiler.collapsed())
+
+    def test_to_json(self):
+        profiler = self.profile_package()
+        [pkg] = json.loads(profiler.to_json())
+        self.assertEqual(pkg['name'], '_importtime_pkg')
+        self.assertEqual(pkg['children'][0]['name'], '_importtime_pkg.sub')
+        self.assertEqual(pkg['reads'], 1)
+        self.assertEqual(pkg['cumulative_us'],
+                         profiler.root.children[0].cumulative // 1000)
+
+
+class CommandLineTests(unittest.TestCase):
+
+    def test_command(self):
+        rc, out, err = assert_python_ok('-m', 'importlib.importtime',
+                                        '-c', 'import json')
+        lines = out.decode().splitlines()
+        self.assertIn('cumulative', lines[0])
+        self.assertIn('| json', out.decode())
+
+    def test_script_to_file(self):
+        self.addCleanup(os_helper.unlink, os_helper.TESTFN)
+        with os_helper.temp_dir() as tmp:
+            script = os.path.join(tmp, 'script.py')
+            with open(script, 'w', encoding='utf-8') as file:
+                file.write('import sys; import json; print(sys.argv[1:])\n')
+            rc, out, err = assert_python_ok(
+                '-m', 'importlib.importtime', '-o', os_helper.TESTFN,
+                '-f', 'json', script, 'a', '-b')
+        self.assertEqual(out.decode().strip(), "['a', '-b']")
+        with open(os_helper.TESTFN, encoding='utf-8') as file:
+            data = json.load(file)
+        self.assertIn('json', [record['name'] for record in data])
+
+    def test_module_exit(self):
+        rc, out, err = assert_python_ok('-m', 'importlib.importtime',
+                                        '-f', 'collapsed', '-m', 'json.tool',
+                                        '-h')
+        self.assertIn(b'usage:', out)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,15 @@
 import importlib
+import importlib.machinery
 from importlib import abc
 from importlib import util
+import os
 import sys
 import time
 import threading
 import types
 import unittest
 
-from test.support import threading_helper
+from test.support import import_helper, os_helper, threading_helper
 from test.test_importlib import util as test_util
 
 
@@ -225,5 +227,72 @@ def __delattr__(self, name):
             del module.CONSTANT
 
 
+class LazyFinderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = self.enterContext(os_helper.temp_dir())
+        for name in 'lazy_finder_a', 'lazy_finder_b':
+            with open(os.path.join(self.directory, name + '.py'), 'w') as f:
+                f.write('value = __name__\n')
+        os.mkdir(os.path.join(self.directory, 'lazy_finder_pkg'))
+        for name in '__init__', 'sub':
+            filename = os.path.join(self.directory, 'lazy_finder_pkg',
+                                    name + '.py')
+            with open(filename, 'w') as f:
+                f.write('value = __name__\n')
+        self.enterContext(test_util.uncache(
+            'lazy_finder_a', 'lazy_finder_b', 'lazy_finder_pkg',
+            'lazy_finder_pkg.sub'))
+        self.enterContext(import_helper.DirsOnSysPath(self.directory))
+
+    def test_context_manager(self):
+        finder = util.LazyFinder()
+        with finder as entered:
+            self.assertIs(entered, finder)
+            self.assertIs(sys.meta_path[0], finder)
+        self.assertNotIn(finder, sys.meta_path)
+
+    def test_lazy_import(self):
+        with util.LazyFinder() as finder:
+            import lazy_finder_a
+        self.assertIsInstance(lazy_finder_a, util._LazyModule)
+        self.assertEqual(finder.deferred, ['lazy_finder_a'])
+        self.assertEqual(finder.loaded(), [])
+        self.assertEqual(lazy_finder_a.value, 'lazy_finder_a')
+        self.assertNotIsInstance(lazy_finder_a, util._LazyModule)
+        self.assertEqual(finder.loaded(), ['lazy_finder_a'])
+
+    def test_include(self):
+        with util.LazyFinder(include=['lazy_finder_pkg']) as finder:
+            import lazy_finder_a
+            import lazy_finder_pkg.sub
+        self.assertNotIsInstance(lazy_finder_a, util._LazyModule)
+        self.assertEqual(finder.deferred,
+                         ['lazy_finder_pkg', 'lazy_finder_pkg.sub'])
+        # Importing the submodule needed the package's __path__
+        self.assertEqual(finder.loaded(), ['lazy_finder_pkg'])
+
+    def test_exclude(self):
+        with util.LazyFinder(exclude=['lazy_finder_pkg',
+                                      'lazy_finder_b']) as finder:
+            import lazy_finder_a, lazy_finder_b
+            import lazy_finder_pkg.sub
+        self.assertEqual(finder.deferred, ['lazy_finder_a'])
+        self.assertNotIsInstance(lazy_finder_b, util._LazyModule)
+        self.assertNotIsInstance(lazy_finder_pkg.sub, util._LazyModule)
+
+    def test_missing_module(self):
+        with util.LazyFinder() as finder:
+            with self.assertRaises(ModuleNotFoundError):
+                import lazy_finder_missing
+        self.assertEqual(finder.deferred, [])
+
+    def test_eager_loaders(self):
+        finder = util.LazyFinder()
+        spec = finder.find_spec('sys')
+        self.assertIs(spec.loader, importlib.machinery.BuiltinImporter)
+        self.assertEqual(finder.deferred, [])
+
+
 if __name__ == '__main__':
     unittest.main()
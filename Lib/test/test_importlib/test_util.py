@@ -5,6 +5,8 @@
 machinery = util.import_importlib('importlib.machinery')
 importlib_util = util.import_importlib('importlib.util')
 
+import _imp
+import importlib
 import importlib.util
 import os
 import pathlib
@@ -775,5 +777,105 @@ def test_complete_multi_phase_init_module(self):
             self.run_with_own_gil(script)
 
 
+@unittest.skipIf(_interpreters is None, 'subinterpreters required')
+class SharedBytecodeTests(unittest.TestCase):
+
+    def setUp(self):
+        previous = importlib.util.shared_bytecode(True)
+        self.addCleanup(importlib.util.shared_bytecode, previous)
+
+    def run_in_interpreter(self, script):
+        interpid = _interpreters.create()
+        self.addCleanup(_interpreters.destroy, interpid)
+        excsnap = _interpreters.exec(interpid, script)
+        if excsnap is not None:
+            self.fail(f'{excsnap.type.__name__}: {excsnap.msg}')
+
+    def test_enable(self):
+        self.assertTrue(importlib.util.shared_bytecode())
+        self.assertTrue(importlib.util.shared_bytecode(False))
+        self.assertFalse(importlib.util.shared_bytecode())
+
+    def test_shared_with_subinterpreter(self):
+        # The bytecode compiled in one interpreter is used by the others
+        # even if it could not be written.
+        name = '_test_shared_bytecode'
+        with (util.temp_module(name, 'x = 42\n') as location,
+              support.swap_attr(sys, 'dont_write_bytecode', True)):
+            module = importlib.import_module(name)
+            self.assertEqual(module.x, 42)
+            bytecode_path = importlib.util.cache_from_source(module.__file__)
+            self.assertFalse(os.path.exists(bytecode_path))
+            self.assertIsNotNone(_imp._shared_bytecode_get(bytecode_path))
+            self.run_in_interpreter(textwrap.dedent(f'''
+                import sys
+                from importlib.machinery import SourceFileLoader
+                def source_to_code(*args, **kwargs):
+                    raise AssertionError('source compiled again')
+                SourceFileLoader.source_to_code = source_to_code
+                sys.path.insert(0, {os.path.dirname(location)!r})
+                import {name}
+                assert {name}.x == 42
+                '''))
+
+    def test_stale_bytecode(self):
+        # Cached bytecode is validated against the source like a file.
+        name = '_test_shared_bytecode'
+        with (util.temp_module(name, 'x = 1\n') as location,
+              support.swap_attr(sys, 'dont_write_bytecode', True)):
+            module = importlib.import_module(name)
+            self.assertEqual(module.x, 1)
+            with open(location + '.py', 'w', encoding='utf-8') as file:
+                file.write('x = 100\n')
+            del sys.modules[name]
+            module = importlib.import_module(name)
+            self.assertEqual(module.x, 100)
+
+    def test_disable_clears(self):
+        name = '_test_shared_bytecode'
+        with util.temp_module(name, 'x = 1\n'):
+            module = importlib.import_module(name)
+            bytecode_path = importlib.util.cache_from_source(module.__file__)
+            self.assertIsNotNone(_imp._shared_bytecode_get(bytecode_path))
+            importlib.util.shared_bytecode(False)
+            importlib.util.shared_bytecode(True)
+            self.assertIsNone(_imp._shared_bytecode_get(bytecode_path))
+
+    def test_undecodable_path(self):
+        # Surrogate-escaped file names can be cached too.
+        path = os.path.abspath('undecodable\udcff.pyc')
+        self.addCleanup(_imp._shared_bytecode_clear)
+        _imp._shared_bytecode_set(path, b'data')
+        self.assertEqual(_imp._shared_bytecode_get(path), b'data')
+        self.assertIsNone(_imp._shared_bytecode_get(path[:-1]))
+        # An embedded null character is never a valid path.
+        _imp._shared_bytecode_set('a\0b.pyc', b'data')
+        self.assertIsNone(_imp._shared_bytecode_get('a\0b.pyc'))
+        self.assertIsNone(_imp._shared_bytecode_get('a'))
+
+    def test_eviction(self):
+        # The oldest entries are evicted when the cache is full (64 MiB).
+        self.addCleanup(_imp._shared_bytecode_clear)
+        data = bytes(1024 * 1024)
+        paths = [os.path.abspath(f'module{i}.pyc') for i in range(70)]
+        for path in paths[:66]:
+            _imp._shared_bytecode_set(path, data)
+        self.assertIsNone(_imp._shared_bytecode_get(paths[1]))
+        self.assertIsNotNone(_imp._shared_bytecode_get(paths[2]))
+        self.assertIsNotNone(_imp._shared_bytecode_get(paths[65]))
+        # Replacing an entry makes it the newest.
+        _imp._shared_bytecode_set(paths[2], b'new')
+        for path in paths[66:]:
+            _imp._shared_bytecode_set(path, data)
+        self.assertEqual(_imp._shared_bytecode_get(paths[2]), b'new')
+        self.assertIsNone(_imp._shared_bytecode_get(paths[6]))
+        self.assertIsNotNone(_imp._shared_bytecode_get(paths[7]))
+        # Data larger than the cache is not cached.
+        big = os.path.abspath('big.pyc')
+        _imp._shared_bytecode_set(big, bytes(65 * 1024 * 1024))
+        self.assertIsNone(_imp._shared_bytecode_get(big))
+        self.assertIsNotNone(_imp._shared_bytecode_get(paths[-1]))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,12 +1,16 @@
 import unittest
 
 from test import support
+from test.support import os_helper
 from io import StringIO
 from pstats import SortKey
 from enum import StrEnum, _test_simple_enum
 
+import array
+import marshal
 import os
 import pstats
+import sys
 import tempfile
 import cProfile
 
@@ -148,5 +152,194 @@ def test_SortKey_enum(self):
         self.assertEqual(SortKey.FILENAME, 'filename')
         self.assertNotEqual(SortKey.FILENAME, SortKey.CALLS)
 
+    def test_line_stats(self):
+        def square(x):
+            y = x * x
+            return y
+
+        def run():
+            pr = cProfile.Profile()
+            pr.profile_lines(square)
+            with pr:
+                square(2)
+                square(3)
+            return pr
+
+        first = square.__code__.co_firstlineno
+        func = cProfile.label(square.__code__)
+        stream = StringIO()
+        stats = pstats.Stats(run(), stream=stream)
+        self.assertEqual(sorted(stats.line_stats), [func])
+        self.assertEqual({lineno: hits for lineno, (hits, tt)
+                          in stats.line_stats[func].items()},
+                         {first + 1: 2, first + 2: 2})
+
+        stats.add(run())
+        self.assertEqual({lineno: hits for lineno, (hits, tt)
+                          in stats.line_stats[func].items()},
+                         {first + 1: 4, first + 2: 4})
+
+        stats.print_lines('square')
+        lines = stream.getvalue().splitlines()
+        index = lines.index('   Line      Hits     Time  Per hit  '
+                            '% Time  Line contents')
+        self.assertIn('(square), total time:', lines[index - 2])
+        self.assertEqual(lines[index + 1].split(),
+                         [str(first), 'def', 'square(x):'])
+        self.assertEqual(lines[index + 2].split()[:2], [str(first + 1), '4'])
+        self.assertEqual(lines[index + 2].split()[-5:],
+                         ['y', '=', 'x', '*', 'x'])
+        self.assertEqual(lines[index + 3].split()[-2:], ['return', 'y'])
+
+        stats.strip_dirs()
+        self.assertEqual(list(stats.line_stats),
+                         [pstats.func_strip_path(func)])
+
+    def test_dump_line_stats(self):
+        def square(x):
+            return x * x
+
+        pr = cProfile.Profile()
+        pr.profile_lines(square)
+        with pr:
+            square(2)
+        func = cProfile.label(square.__code__)
+        self.addCleanup(os_helper.unlink, os_helper.TESTFN)
+        pr.dump_stats(os_helper.TESTFN)
+        stats = pstats.Stats(os_helper.TESTFN)
+        self.assertEqual(stats.stats, pr.stats)
+        self.assertEqual(stats.line_stats, pr.line_stats)
+        self.assertIn(func, stats.line_stats)
+
+        stats.dump_stats(os_helper.TESTFN)
+        loaded = pstats.Stats(os_helper.TESTFN)
+        self.assertEqual(loaded.line_stats, pr.line_stats)
+
+        # Older readers only load the first object.
+        with open(os_helper.TESTFN, 'rb') as f:
+            self.assertEqual(marshal.load(f), pr.stats)
+
+
+class CompactStatsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.stats_file = support.findfile('pstats.pck')
+        self.stats = pstats.Stats(self.stats_file)
+
+    def assertStatsAlmostEqual(self, first, second):
+        self.assertEqual(first.keys(), second.keys())
+        for func, (cc, nc, tt, ct, callers) in first.items():
+            cc2, nc2, tt2, ct2, callers2 = second[func]
+            self.assertEqual((cc, nc), (cc2, nc2))
+            self.assertAlmostEqual(tt, tt2)
+            self.assertAlmostEqual(ct, ct2)
+            self.assertEqual(callers.keys(), callers2.keys())
+            for caller, value in callers.items():
+                if isinstance(value, tuple):
+                    self.assertEqual(value[:2], callers2[caller][:2])
+                    self.assertAlmostEqual(value[2], callers2[caller][2])
+                    self.assertAlmostEqual(value[3], callers2[caller][3])
+                else:
+                    self.assertEqual(value, callers2[caller])
+
+    def test_to_dict(self):
+        compact = pstats.CompactStats(self.stats_file)
+        self.assertEqual(compact.to_dict(), self.stats.stats)
+        self.assertEqual(len(compact), len(self.stats.stats))
+        self.assertEqual(compact.files, [self.stats_file])
+        for func in self.stats.stats:
+            self.assertIn(func, compact)
+            self.assertEqual(compact.get(func), self.stats.stats[func])
+        self.assertNotIn(('spam', 1, 'eggs'), compact)
+        self.assertRaises(KeyError, compact.get, ('spam', 1, 'eggs'))
+
+    def test_add(self):
+        def pass1(): pass
+        def pass2(): pass1()
+        profiles = []
+        for n in range(3):
+            pr = cProfile.Profile()
+            pr.enable()
+            for _ in range(n):
+                pass2()
+            pass1()
+            pr.disable()
+            profiles.append(pr)
+        expected = pstats.Stats(*profiles).stats
+        compact = pstats.CompactStats(*profiles)
+        self.assertStatsAlmostEqual(compact.to_dict(), expected)
+        compact = pstats.CompactStats(self.stats_file, self.stats)
+        self.assertStatsAlmostEqual(compact.to_dict(),
+                                    pstats.Stats(self.stats_file,
+                                                 self.stats).stats)
+        self.assertRaises(TypeError, compact.add, 42)
+
+    def test_callers_only(self):
+        # Functions only seen as callers have no statistics of their own.
+        compact = pstats.CompactStats()
+        compact._add_dict({('a', 1, 'f'): (1, 1, 0.5, 0.5,
+                                           {('a', 2, 'g'): (1, 1, 0.5, 0.5)})})
+        self.assertEqual(len(compact), 1)
+        self.assertNotIn(('a', 2, 'g'), compact)
+        self.assertEqual(list(compact.to_dict()), [('a', 1, 'f')])
+        self.assertEqual([entry[0] for entry in compact.top(5)],
+                         [('a', 1, 'f')])
+
+    def test_profile_callers(self):
+        # profile records callers as plain call counts
+        stats = {('a', 1, 'f'): (2, 2, 0.5, 0.5, {('a', 2, 'g'): 2}),
+                 ('a', 2, 'g'): (1, 1, 0.25, 0.75, {})}
+        compact = pstats.CompactStats()
+        compact._add_dict(stats)
+        compact._add_dict(stats)
+        self.assertEqual(compact.to_dict(),
+                         {('a', 1, 'f'): (4, 4, 1.0, 1.0, {('a', 2, 'g'): 4}),
+                          ('a', 2, 'g'): (2, 2, 0.5, 1.5, {})})
+
+    def test_dump_and_load(self):
+        self.addCleanup(os_helper.unlink, os_helper.TESTFN)
+        compact = pstats.CompactStats(self.stats_file)
+        compact.dump(os_helper.TESTFN)
+        loaded = pstats.CompactStats(os_helper.TESTFN)
+        self.assertEqual(loaded.to_dict(), self.stats.stats)
+        self.assertEqual(pstats.Stats(os_helper.TESTFN).stats,
+                         self.stats.stats)
+        self.assertEqual(pstats.Stats(compact).stats, self.stats.stats)
+        # Merging into loaded statistics
+        loaded.add(self.stats_file)
+        self.assertStatsAlmostEqual(
+            loaded.to_dict(),
+            pstats.Stats(self.stats_file, self.stats_file).stats)
+
+    def test_load_other_byteorder(self):
+        self.addCleanup(os_helper.unlink, os_helper.TESTFN)
+        compact = pstats.CompactStats(self.stats_file)
+        compact.dump(os_helper.TESTFN)
+        with open(os_helper.TESTFN, 'rb') as f:
+            data = list(marshal.load(f))
+        other = 'big' if sys.byteorder == 'little' else 'little'
+        data[2] = other
+        for i, name in enumerate(pstats.CompactStats._arrays, 5):
+            values = array.array(getattr(compact, name).typecode, data[i])
+            values.byteswap()
+            data[i] = values.tobytes()
+        with open(os_helper.TESTFN, 'wb') as f:
+            marshal.dump(tuple(data), f)
+        self.assertEqual(pstats.CompactStats(os_helper.TESTFN).to_dict(),
+                         self.stats.stats)
+
+    def test_top(self):
+        compact = pstats.CompactStats(self.stats_file)
+        for sort, column in [('tottime', 2), (SortKey.CUMULATIVE, 3),
+                             ('calls', 1), ('pcalls', 0)]:
+            expected = sorted(self.stats.stats.items(),
+                              key=lambda item: item[1][column],
+                              reverse=True)[:5]
+            top = compact.top(5, sort)
+            self.assertEqual([entry[column + 1] for entry in top],
+                             [stats[column] for func, stats in expected])
+            for func, *stats in top:
+                self.assertEqual(tuple(stats), self.stats.stats[func][:4])
+        self.assertRaises(ValueError, compact.top, 5, 'name')
+
 if __name__ == "__main__":
     unittest.main()
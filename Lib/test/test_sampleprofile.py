@@ -0,0 +1,217 @@
+"""Test suite for the sampleprofile module."""
+
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import unittest
+
+import sampleprofile
+from sampleprofile import SamplingProfiler
+from test.support import os_helper, threading_helper
+from test.support.script_helper import assert_python_ok
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def outer():
+    busy(0.02)
+    inner()
+
+def inner():
+    busy(0.01)
+
+def recursive(n):
+    if n:
+        recursive(n - 1)
+    else:
+        busy(0.01)
+
+
+class SamplingProfilerTests(unittest.TestCase):
+
+    def test_tree(self):
+        prof = SamplingProfiler(0.001)
+        def a():
+            prof.sample()
+            b()
+        def b():
+            prof.sample()
+        a()
+        a()
+        self.assertEqual(prof.samples, 4)
+        # Walk down the stacks of the test runner to this test.
+        node = prof.root
+        while node.code is not sys._getframe().f_code:
+            [node] = node.children.values()
+        [a_node] = node.children.values()
+        self.assertEqual(a_node.code, a.__code__)
+        self.assertEqual(a_node.count, 4)
+        self.assertAlmostEqual(a_node.time, 0.004)
+        codes = {child.code: child for child in a_node.children.values()}
+        self.assertEqual(codes[b.__code__].count, 2)
+        self.assertEqual(codes[prof.sample.__code__].count, 2)
+
+    def test_collapsed(self):
+        prof = SamplingProfiler(0.001)
+        def a():
+            prof.sample()
+            prof.sample()
+        a()
+        lines = prof.collapsed().splitlines()
+        stacks = {line.rpartition(' ')[0]: int(line.rpartition(' ')[2])
+                  for line in lines}
+        [(stack, count)] = [(stack, count) for stack, count in stacks.items()
+                            if 'test_collapsed.<locals>.a' in stack]
+        self.assertEqual(count, 2)
+        self.assertTrue(stack.endswith('(SamplingProfiler.sample)'))
+        self.assertIn(f'{a.__code__.co_filename}:{a.__code__.co_firstlineno}'
+                      f'(SamplingProfilerTests.test_collapsed.<locals>.a)',
+                      stack.split(';'))
+
+    def test_stats(self):
+        prof = SamplingProfiler(0.001)
+        def a():
+            prof.sample()
+            b()
+        def b():
+            prof.sample()
+            prof.sample()
+        a()
+        stats = pstats.Stats(prof).stats
+        cc, nc, tt, ct, callers = stats[sampleprofile.label(a.__code__)]
+        self.assertEqual((cc, nc), (3, 3))
+        self.assertAlmostEqual(ct, 0.003)
+        self.assertAlmostEqual(tt, 0.0)
+        cc, nc, tt, ct, callers = stats[sampleprofile.label(b.__code__)]
+        self.assertEqual((cc, nc), (2, 2))
+        self.assertAlmostEqual(ct, 0.002)
+        self.assertEqual(list(callers), [sampleprofile.label(a.__code__)])
+        cc, nc, tt, ct, callers = stats[
+            sampleprofile.label(prof.sample.__code__)]
+        self.assertAlmostEqual(tt, 0.003)
+
+    def test_recursion(self):
+        prof = SamplingProfiler(0.001)
+        def f(n):
+            if n:
+                f(n - 1)
+            else:
+                prof.sample()
+        f(3)
+        stats = pstats.Stats(prof).stats
+        cc, nc, tt, ct, callers = stats[sampleprofile.label(f.__code__)]
+        # The sample is counted once as a primitive call.
+        self.assertEqual((cc, nc), (1, 4))
+        self.assertAlmostEqual(ct, 0.001)
+        self.assertIn(sampleprofile.label(f.__code__), callers)
+
+    def test_deep_stack(self):
+        prof = SamplingProfiler(0.001)
+        def f(n):
+            if n:
+                f(n - 1)
+            else:
+                prof.sample()
+        f(sys.getrecursionlimit() // 2)
+        prof.create_stats()
+        self.assertTrue(prof.collapsed())
+
+    @threading_helper.requires_working_threading()
+    def test_background_sampling(self):
+        with SamplingProfiler(0.001, max_overhead=None) as prof:
+            outer()
+            recursive(5)
+        self.assertGreater(prof.samples, 0)
+        self.assertGreater(prof.elapsed, 0)
+        self.assertLess(prof.overhead, 1)
+        stats = pstats.Stats(prof).stats
+        self.assertIn(sampleprofile.label(busy.__code__), stats)
+
+    @threading_helper.requires_working_threading()
+    def test_threads(self):
+        event = threading.Event()
+        def worker():
+            event.wait()
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(event.set)
+
+        prof = SamplingProfiler(0.001)
+        prof.sample()
+        stats = pstats.Stats(prof).stats
+        self.assertIn(sampleprofile.label(worker.__code__), stats)
+
+        prof = SamplingProfiler(0.001, all_threads=False)
+        prof.sample()
+        stats = pstats.Stats(prof).stats
+        self.assertNotIn(sampleprofile.label(worker.__code__), stats)
+
+    @threading_helper.requires_working_threading()
+    def test_enable_twice(self):
+        prof = SamplingProfiler()
+        prof.enable()
+        try:
+            self.assertRaises(RuntimeError, prof.enable)
+        finally:
+            prof.disable()
+        prof.disable()
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, SamplingProfiler, 0)
+        self.assertRaises(ValueError, SamplingProfiler, max_overhead=0)
+        self.assertRaises(ValueError, SamplingProfiler, max_overhead=1)
+
+    @threading_helper.requires_working_threading()
+    def test_dump_stats(self):
+        self.addCleanup(os_helper.unlink, os_helper.TESTFN)
+        prof = SamplingProfiler(0.001)
+        prof.runcall(busy, 0.02)
+        prof.sample()
+        prof.dump_stats(os_helper.TESTFN)
+        with open(os_helper.TESTFN, 'rb') as f:
+            stats = marshal.load(f)
+        self.assertIn(sampleprofile.label(self.test_dump_stats.__code__),
+                      stats)
+        pstats.Stats(os_helper.TESTFN)
+
+
+class CommandLineTests(unittest.TestCase):
+
+    def test_module(self):
+        rc, out, err = assert_python_ok('-m', 'sampleprofile', '-i', '0.001',
+                                        '-m', 'timeit', '-n', '2000000', 'pass')
+        self.assertIn(b'function calls', out)
+
+    def test_no_samples(self):
+        rc, out, err = assert_python_ok('-m', 'sampleprofile', '-i', '10',
+                                        '-m', 'timeit', '-n', '1', 'pass')
+        self.assertIn(b'No samples', out)
+
+    def test_script_collapsed(self):
+        self.addCleanup(os_helper.unlink, os_helper.TESTFN)
+        with os_helper.temp_dir() as tmp:
+            script = os.path.join(tmp, 'script.py')
+            with open(script, 'w', encoding='utf-8') as file:
+                file.write('import sys, time\n'
+                           'def spin():\n'
+                           '    end = time.perf_counter() + 0.2\n'
+                           '    while time.perf_counter() < end: pass\n'
+                           'spin()\n'
+                           'print(sys.argv[1:])\n')
+            rc, out, err = assert_python_ok(
+                '-m', 'sampleprofile', '-i', '0.001', '--collapsed',
+                '-o', os_helper.TESTFN, script, 'a', '-b')
+        self.assertEqual(out.decode().strip(), "['a', '-b']")
+        with open(os_helper.TESTFN, encoding='utf-8') as file:
+            self.assertIn('(spin)', file.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -207,6 +207,74 @@ def test_addsitedir_dotfile(self):
         finally:
             pth_file.cleanup()
 
+    def test_addsitedir_snapshot(self):
+        snapshot_file = os.path.abspath(TESTFN + '.snapshot')
+        self.addCleanup(os_helper.unlink, snapshot_file)
+        pth_file = PthFile()
+        pth_file.cleanup(prep=True)
+        self.addCleanup(pth_file.cleanup)
+        pth_file.create()
+
+        snapshot = site._StartupSnapshot(snapshot_file)
+        with mock.patch('site._snapshot', snapshot):
+            site.addsitedir(pth_file.base_dir, set())
+        self.pth_file_tests(pth_file)
+        self.assertIn(pth_file.file_path, snapshot.entries)
+        snapshot.save()
+
+        # Rewrite the .pth file in place, keeping its size and mtime:
+        # a valid snapshot is used instead of the file.
+        st = os.stat(pth_file.file_path)
+        with open(pth_file.file_path, 'r+') as f:
+            contents = f.read()
+            f.seek(0)
+            f.write(contents.replace('import', 'jmport'))
+        os.utime(pth_file.file_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        sys.modules.pop(pth_file.imported)
+        snapshot = site._StartupSnapshot(snapshot_file)
+        with mock.patch('site._snapshot', snapshot):
+            site.addsitedir(pth_file.base_dir, set())
+        self.pth_file_tests(pth_file)
+
+        # Once the mtime changes, the file is read again.
+        os.utime(pth_file.file_path,
+                 ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        sys.modules.pop(pth_file.imported)
+        snapshot = site._StartupSnapshot(snapshot_file)
+        with mock.patch('site._snapshot', snapshot), captured_stderr():
+            site.addsitedir(pth_file.base_dir, set())
+        self.assertNotIn(pth_file.imported, sys.modules)
+
+    @os_helper.skip_unless_symlink
+    def test_addsitedir_snapshot_symlink(self):
+        snapshot_file = os.path.abspath(TESTFN + '.snapshot')
+        self.addCleanup(os_helper.unlink, snapshot_file)
+        target = os.path.join(self.enterContext(os_helper.temp_dir()),
+                              'target.pth')
+        pth_file = PthFile()
+        pth_file.cleanup(prep=True)
+        self.addCleanup(pth_file.cleanup)
+        pth_file.create()
+        os.replace(pth_file.file_path, target)
+        os.symlink(target, pth_file.file_path)
+
+        snapshot = site._StartupSnapshot(snapshot_file)
+        with mock.patch('site._snapshot', snapshot):
+            site.addsitedir(pth_file.base_dir, set())
+        self.pth_file_tests(pth_file)
+        snapshot.save()
+
+        # A change of the target of the link is noticed
+        with open(target, 'w') as f:
+            f.write('# empty\n')
+        st = os.stat(target)
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        sys.modules.pop(pth_file.imported)
+        snapshot = site._StartupSnapshot(snapshot_file)
+        with mock.patch('site._snapshot', snapshot):
+            site.addsitedir(pth_file.base_dir, set())
+        self.assertNotIn(pth_file.imported, sys.modules)
+
     @unittest.skipUnless(hasattr(os, 'chflags'), 'test needs os.chflags()')
     def test_addsitedir_hidden_flags(self):
         pth_file = PthFile()
@@ -494,6 +562,16 @@ def test_add_build_dir(self):
         # XXX: implement
         pass
 
+    @support.requires_subprocess()
+    def test_sitetime(self):
+        rc, out, err = assert_python_ok('-X', 'sitetime', '-c', 'pass')
+        lines = err.decode().splitlines()
+        self.assertEqual(lines[0], 'site time: self [us] | phase')
+        phases = [line.rpartition(' | ')[2] for line in lines[1:]]
+        for phase in ('removeduppaths', 'venv', 'addsitepackages',
+                      'sitecustomize'):
+            self.assertIn(phase, phases)
+
     def test_setting_quit(self):
         # 'quit' and 'exit' should be injected into builtins
         self.assertTrue(hasattr(builtins, "quit"))
@@ -17,6 +17,7 @@
 from test.support import os_helper
 from test.support import socket_helper
 from test.support import threading_helper
+from test.support import warnings_helper
 
 
 test.support.requires("network")
@@ -180,6 +181,29 @@ def test_ForkingTCPServer(self):
                             socketserver.StreamRequestHandler,
                             self.stream_examine)
 
+    def test_ThreadingTCPServer_max_threads(self):
+        class MyServer(socketserver.ThreadingTCPServer):
+            max_threads = 2
+        self.run_server(MyServer,
+                        socketserver.StreamRequestHandler,
+                        self.stream_examine)
+
+    def test_ThreadingUDPServer_max_threads(self):
+        class MyServer(socketserver.ThreadingUDPServer):
+            max_threads = 2
+        self.run_server(MyServer,
+                        socketserver.DatagramRequestHandler,
+                        self.dgram_examine)
+
+    @requires_forking
+    @warnings_helper.ignore_warnings(category=DeprecationWarning)
+    def test_PreForkingTCPServer(self):
+        class MyServer(socketserver.PreForkingTCPServer):
+            workers = 2
+        self.run_server(MyServer,
+                        socketserver.StreamRequestHandler,
+                        self.stream_examine)
+
     @requires_unix_sockets
     def test_UnixStreamServer(self):
         self.run_server(socketserver.UnixStreamServer,
@@ -453,6 +477,84 @@ def run_client():
         self.assertEqual(received2, test.support.SOCK_MAX_SIZE - 100)
 
 
+@requires_forking
+class PreForkingTest(unittest.TestCase):
+
+    class PidHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            self.rfile.readline()
+            self.wfile.write(b'%d\n' % os.getpid())
+
+    def tearDown(self):
+        reap_children()
+
+    @contextlib.contextmanager
+    def serving(self, **attrs):
+        MyServer = type('MyServer', (socketserver.PreForkingTCPServer,), attrs)
+        with MyServer((HOST, 0), self.PidHandler) as server:
+            t = threading.Thread(target=server.serve_forever,
+                                 kwargs={'poll_interval': 0.01})
+            t.start()
+            try:
+                yield server
+            finally:
+                server.shutdown()
+                t.join()
+            self.assertEqual(server._worker_pids, {})
+            self.assertEqual(server._retired_pids, set())
+
+    def worker_pid(self, server):
+        with socket.create_connection(server.server_address) as s:
+            s.sendall(TEST_STR)
+            buf = b''
+            while not buf.endswith(b'\n'):
+                data = receive(s, 100)
+                if not data:
+                    break
+                buf += data
+        return int(buf)
+
+    @warnings_helper.ignore_warnings(category=DeprecationWarning)
+    def test_workers(self):
+        with self.serving(workers=3) as server:
+            pids = {self.worker_pid(server) for i in range(10)}
+            self.assertNotIn(os.getpid(), pids)
+            self.assertLessEqual(pids, set(server._worker_pids))
+            self.assertEqual(len(server._worker_pids), 3)
+
+    @warnings_helper.ignore_warnings(category=DeprecationWarning)
+    def test_max_worker_requests(self):
+        with self.serving(workers=1, max_worker_requests=1) as server:
+            pids = [self.worker_pid(server) for i in range(3)]
+            self.assertEqual(len(set(pids)), 3)
+
+    @warnings_helper.ignore_warnings(category=DeprecationWarning)
+    def test_restart_workers(self):
+        with self.serving(workers=1) as server:
+            pid = self.worker_pid(server)
+            server.restart_workers()
+            for _ in test.support.sleeping_retry(test.support.SHORT_TIMEOUT):
+                if (pid not in server._worker_pids and
+                        pid not in server._retired_pids):
+                    break
+            self.assertNotEqual(self.worker_pid(server), pid)
+
+    @unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'),
+                         'requires SO_REUSEPORT')
+    @warnings_helper.ignore_warnings(category=DeprecationWarning)
+    def test_reuse_port(self):
+        with self.serving(workers=2, reuse_port=True) as server:
+            # The parent does not listen; wait for a worker to do so.
+            for _ in test.support.sleeping_retry(test.support.SHORT_TIMEOUT):
+                try:
+                    self.worker_pid(server)
+                    break
+                except ConnectionRefusedError:
+                    pass
+            pids = {self.worker_pid(server) for i in range(10)}
+            self.assertLessEqual(pids, set(server._worker_pids))
+
+
 class MiscTestCase(unittest.TestCase):
 
     def test_all(self):
@@ -486,6 +588,80 @@ def shutdown_request(self, request):
         self.assertEqual(server.shutdown_called, 1)
         server.server_close()
 
+    @threading_helper.reap_threads
+    def test_max_threads(self):
+        release = threading.Event()
+        running = threading.Semaphore(0)
+        handled = []
+
+        class MyServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+            max_threads = 2
+            max_pending_requests = 3
+
+        class MyHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                handled.append(threading.get_ident())
+                running.release()
+                release.wait(test.support.SHORT_TIMEOUT)
+
+        server = MyServer((HOST, 0), MyHandler)
+        clients = [socket.create_connection(server.server_address)
+                   for n in range(5)]
+        try:
+            for n in range(5):
+                server.handle_request()
+            for n in range(2):
+                self.assertTrue(running.acquire(timeout=test.support.SHORT_TIMEOUT))
+            self.assertEqual(len(server._pool.threads), 2)
+            self.assertEqual(server._pool.requests.qsize(), 3)
+            release.set()
+        finally:
+            for s in clients:
+                s.close()
+            server.server_close()
+        self.assertEqual(len(handled), 5)
+        self.assertEqual(len(set(handled)), 2)
+
+    @threading_helper.reap_threads
+    def test_max_threads_close_saturated(self):
+        release = threading.Event()
+        running = threading.Event()
+        handled = []
+
+        class MyServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+            max_threads = 1
+            max_pending_requests = 1
+            block_on_close = False
+
+        class MyHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                handled.append(self.client_address)
+                running.set()
+                release.wait(test.support.SHORT_TIMEOUT)
+
+        server = MyServer((HOST, 0), MyHandler)
+        clients = [socket.create_connection(server.server_address)
+                   for n in range(2)]
+        try:
+            for n in range(2):
+                server.handle_request()
+            self.assertTrue(running.wait(test.support.SHORT_TIMEOUT))
+            pool = server._pool
+            self.assertEqual(pool.requests.qsize(), 1)
+            # Both the thread and the queue are full: this must not block
+            server.server_close()
+            self.assertFalse(release.is_set())
+            # The pending request was dropped
+            clients[1].settimeout(test.support.SHORT_TIMEOUT)
+            self.assertEqual(clients[1].recv(1), b'')
+        finally:
+            release.set()
+            for s in clients:
+                s.close()
+        for thread in list(pool.threads):
+            thread.join()
+        self.assertEqual(len(handled), 1)
+
     def test_threads_reaped(self):
         """
         In #37193, users reported a memory leak
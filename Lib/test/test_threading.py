@@ -9,6 +9,8 @@
 from test.support.script_helper import assert_python_ok, assert_python_failure
 from test.support import force_not_colorized
 
+import collections
+import io
 import random
 import sys
 import _thread
@@ -1967,6 +1969,35 @@ def __init__(self, a, *, b) -> None:
             CustomRLock(1, b=2)
         self.assertEqual(warnings_log, [])
 
+class ProfiledLockMixin:
+    def setUp(self):
+        super().setUp()
+        for name, value in (('_lock_stats', set()),
+                            ('_dead_lock_stats', collections.deque()),
+                            ('_lock_site_stats', {})):
+            self.enterContext(support.swap_attr(threading, name, value))
+
+class ProfiledLockTests(ProfiledLockMixin, lock_tests.LockTests):
+    locktype = staticmethod(threading._ProfiledLock)
+
+class ProfiledPyRLockTests(ProfiledLockMixin, lock_tests.RLockTests):
+    @staticmethod
+    def locktype():
+        return threading._ProfiledRLock(threading._PyRLock(), 'RLock')
+
+@unittest.skipIf(threading._CRLock is None, 'RLock not implemented in C')
+class ProfiledCRLockTests(ProfiledLockMixin, lock_tests.RLockTests):
+    @staticmethod
+    def locktype():
+        return threading._ProfiledRLock(threading._CRLock(), 'RLock')
+
+class ProfiledConditionTests(ProfiledLockMixin, lock_tests.ConditionTests):
+    @staticmethod
+    def condtype(lock=None):
+        if lock is None:
+            lock = threading._ProfiledRLock(threading._PyRLock(), 'RLock')
+        return threading.Condition(lock)
+
 class EventTests(lock_tests.EventTests):
     eventtype = staticmethod(threading.Event)
 
@@ -1990,6 +2021,153 @@ class BarrierTests(lock_tests.BarrierTests):
     barriertype = staticmethod(threading.Barrier)
 
 
+class LockProfileTests(ProfiledLockMixin, BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        threading.setlockprofile(True)
+        self.addCleanup(threading.setlockprofile, False)
+
+    def get_stats(self, lineno):
+        return [stats for stats in threading.getlockstats()
+                if stats.filename == __file__ and stats.lineno == lineno]
+
+    def test_setlockprofile(self):
+        self.assertTrue(threading.getlockprofile())
+        self.assertIs(threading.Lock, threading._ProfiledLock)
+        self.assertIsInstance(threading.RLock(), threading._ProfiledRLock)
+        threading.setlockprofile(False)
+        self.assertFalse(threading.getlockprofile())
+        self.assertIs(threading.Lock, _thread.LockType)
+        self.assertNotIsInstance(threading.RLock(), threading._ProfiledLock)
+
+    def test_acquisitions(self):
+        lock = threading.Lock(); lineno = sys._getframe().f_lineno
+        rlock = threading.RLock(); rlineno = sys._getframe().f_lineno
+        for _ in range(3):
+            with lock:
+                pass
+        self.assertFalse(lock.acquire(False) and lock.acquire(False))
+        lock.release()
+        with rlock:
+            with rlock:
+                pass
+        [stats] = self.get_stats(lineno)
+        self.assertEqual(stats.kind, 'Lock')
+        self.assertEqual(stats.function, 'LockProfileTests.test_acquisitions')
+        self.assertEqual(stats.acquisitions, 4)
+        self.assertEqual(stats.contentions, 0)
+        self.assertEqual(stats.wait_time, 0.0)
+        self.assertGreaterEqual(stats.hold_time, stats.max_hold_time)
+        self.assertGreater(stats.max_hold_time, 0.0)
+        [stats] = self.get_stats(rlineno)
+        self.assertEqual(stats.kind, 'RLock')
+        self.assertEqual(stats.acquisitions, 2)
+        self.assertGreater(stats.hold_time, 0.0)
+
+    def test_contention(self):
+        lock = threading.Lock(); lineno = sys._getframe().f_lineno
+        acquired = threading.Event()
+
+        def f():
+            with lock:
+                acquired.set()
+                time.sleep(0.05)
+
+        with threading_helper.start_threads([threading.Thread(target=f)]):
+            acquired.wait()
+            with lock:
+                pass
+        [stats] = self.get_stats(lineno)
+        self.assertEqual(stats.acquisitions, 2)
+        self.assertEqual(stats.contentions, 1)
+        self.assertGreater(stats.wait_time, 0.0)
+        self.assertEqual(stats.max_wait_time, stats.wait_time)
+        self.assertGreater(stats.max_hold_time, 0.0)
+
+    def test_creation_site(self):
+        # The locks created by the threading and queue modules are
+        # attributed to the code using them.
+        import queue
+        cond = threading.Condition(); lineno = sys._getframe().f_lineno
+        q = queue.Queue(); qlineno = sys._getframe().f_lineno
+        [stats] = self.get_stats(lineno)
+        self.assertEqual(stats.kind, 'RLock')
+        [stats] = self.get_stats(qlineno)
+        self.assertEqual(stats.kind, 'Lock')
+        q.put(1)
+        q.get()
+        [stats] = self.get_stats(qlineno)
+        self.assertEqual(stats.acquisitions, 2)
+
+    def test_condition_wait(self):
+        cond = threading.Condition(); lineno = sys._getframe().f_lineno
+        with cond:
+            cond.wait(0.01)
+        [stats] = self.get_stats(lineno)
+        self.assertEqual(stats.acquisitions, 2)
+        self.assertEqual(stats.contentions, 0)
+        self.assertGreater(stats.hold_time, 0.0)
+
+    def test_clearlockstats(self):
+        lock = threading.Lock(); lineno = sys._getframe().f_lineno
+        threading.Lock(); lineno2 = sys._getframe().f_lineno
+        with lock:
+            pass
+        support.gc_collect()
+        [stats] = self.get_stats(lineno2)
+        self.assertFalse(stats.alive)
+        threading.clearlockstats()
+        [stats] = self.get_stats(lineno)
+        self.assertEqual(stats.acquisitions, 0)
+        self.assertEqual(stats.hold_time, 0.0)
+        self.assertEqual(self.get_stats(lineno2), [])
+
+    def test_destroyed_locks(self):
+        # The statistics of the destroyed locks are summed by site
+        for _ in range(100):
+            with threading.Lock():
+                pass
+        lineno = sys._getframe().f_lineno - 2
+        lock = threading.Lock(); lineno2 = sys._getframe().f_lineno
+        support.gc_collect()
+        [stats] = self.get_stats(lineno)
+        self.assertFalse(stats.alive)
+        self.assertEqual(stats.locks, 100)
+        self.assertEqual(stats.acquisitions, 100)
+        self.assertEqual(len(threading._lock_site_stats), 1)
+        [stats] = self.get_stats(lineno2)
+        self.assertTrue(stats.alive)
+        self.assertEqual(stats.locks, 1)
+        del lock
+        support.gc_collect()
+        self.assertEqual(len(threading._lock_stats), 0)
+        self.assertEqual(len(threading._lock_site_stats), 2)
+
+    def test_print_lock_stats(self):
+        locks = [threading.Lock() for _ in range(3)]
+        lineno = sys._getframe().f_lineno - 1
+        for lock in locks:
+            with lock:
+                pass
+        threading.RLock()
+        out = io.StringIO()
+        threading.print_lock_stats(file=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn('acquisitions', lines[0])
+        line = [line for line in lines
+                if line.endswith(f'{__file__}:{lineno}'
+                                 '(LockProfileTests.test_print_lock_stats)')]
+        self.assertEqual(line[0].split()[:4], ['3', 'Lock', '3', '0'])
+        out = io.StringIO()
+        threading.print_lock_stats(limit=1, file=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+        with support.captured_stderr() as err:
+            threading.print_lock_stats()
+        self.assertEqual(err.getvalue().splitlines(), lines)
+
+
 class MiscTestCase(unittest.TestCase):
     def test__all__(self):
         restore_default_excepthook(self)
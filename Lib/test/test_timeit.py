@@ -2,10 +2,14 @@
 import unittest
 import sys
 import io
+import json
+import statistics
 from textwrap import dedent
 
 from test.support import captured_stdout
 from test.support import captured_stderr
+from test.support import os_helper
+from test.support.script_helper import assert_python_ok
 
 # timeit's default number of iterations.
 DEFAULT_NUMBER = 1000000
@@ -397,5 +401,121 @@ def callback(a, b):
         self.assertEqual(s.getvalue(), expected)
 
 
+class TestBenchmark(unittest.TestCase):
+
+    def test_result_statistics(self):
+        result = timeit.BenchmarkResult('b', 10, [1.0, 2.0, 3.0, 2.0, 100.0])
+        self.assertEqual(result.outliers, [100.0])
+        self.assertEqual(result.mean, 2.0)
+        self.assertAlmostEqual(result.stdev, statistics.stdev([1, 2, 3, 2]))
+        self.assertEqual(result.median, 2.0)
+        self.assertIn('1 outlier)', str(result))
+
+        result = timeit.BenchmarkResult('b', 10, [1.0, 3.0])
+        self.assertEqual(result.outliers, [])
+        self.assertEqual(result.mean, 2.0)
+        result = timeit.BenchmarkResult('b', 10, [1.0])
+        self.assertEqual(result.stdev, 0.0)
+
+    def test_dump_and_load_results(self):
+        results = [timeit.BenchmarkResult('a', 10, [1.0, 2.0], [3.0]),
+                   timeit.BenchmarkResult('b', 20, [4.0])]
+        f = io.StringIO()
+        timeit.dump_results(results, f)
+        f.seek(0)
+        data = json.load(f)
+        self.assertEqual(data['version'], 1)
+        f.seek(0)
+        loaded = timeit.load_results(f)
+        self.assertEqual([r.to_dict() for r in loaded],
+                         [r.to_dict() for r in results])
+
+        data['version'] = 42
+        with self.assertRaises(ValueError):
+            timeit.load_results(io.StringIO(json.dumps(data)))
+
+    def test_compare_results(self):
+        old = [timeit.BenchmarkResult('a', 1, [1.0, 1.01, 0.99, 1.0] * 5),
+               timeit.BenchmarkResult('b', 1, [1.0, 1.1, 0.9, 1.0] * 5),
+               timeit.BenchmarkResult('gone', 1, [1.0])]
+        new = [timeit.BenchmarkResult('b', 1, [1.01, 1.11, 0.91, 1.01] * 5),
+               timeit.BenchmarkResult('a', 1, [2.0, 2.02, 1.98, 2.0] * 5),
+               timeit.BenchmarkResult('new', 1, [1.0])]
+        comparison = timeit.compare_results(old, new)
+        self.assertEqual([(name, significant)
+                          for name, _, _, _, significant in comparison],
+                         [('b', False), ('a', True)])
+        name, previous, result, ratio, significant = comparison[1]
+        self.assertIs(previous, old[0])
+        self.assertIs(result, new[1])
+        self.assertAlmostEqual(ratio, 2.0)
+
+    def test_benchmark(self):
+        result = timeit.benchmark('sum(x)', 'x = list(range(10))',
+                                  name='sum', processes=2, repeat=3,
+                                  number=10, warmups=2)
+        self.assertEqual(result.name, 'sum')
+        self.assertEqual(result.loops, 10)
+        self.assertEqual(len(result.values), 6)
+        self.assertEqual(len(result.warmups), 4)
+        self.assertGreater(result.mean, 0)
+
+    def test_benchmark_calibration(self):
+        result = timeit.benchmark('pass', processes=1, repeat=1)
+        self.assertEqual(result.name, 'pass')
+        self.assertGreater(result.loops, 1)
+        self.assertEqual(len(result.values), 1)
+        self.assertGreaterEqual(len(result.warmups), 2)
+        self.assertLessEqual(len(result.warmups), timeit.max_warmups)
+
+    def test_benchmark_calibration_run(self):
+        # The calibration run only determines the number of loops.
+        run = timeit._run_worker('pass', 'pass', 0, 0, 0, False)
+        self.assertGreater(run['loops'], 1)
+        self.assertEqual(run['values'], [])
+        self.assertEqual(run['warmups'], [])
+
+    def test_benchmark_printing(self):
+        result = timeit.benchmark('print("stmt")', 'print("setup")',
+                                  processes=1, repeat=2, warmups=1)
+        self.assertEqual(len(result.values), 2)
+
+    def test_benchmark_interpreter_flags(self):
+        # The workers use the interpreter options of the parent
+        code = dedent('''
+            import timeit
+            timeit.benchmark('assert False', processes=1, repeat=1,
+                             number=1, warmups=0)
+        ''')
+        assert_python_ok('-O', '-c', code)
+
+    def test_benchmark_errors(self):
+        with captured_stderr():
+            with self.assertRaisesRegex(RuntimeError, 'ZeroDivisionError'):
+                timeit.benchmark('1/0', processes=1, number=1)
+        self.assertRaises(TypeError, timeit.benchmark, lambda: None)
+        self.assertRaises(ValueError, timeit.benchmark, processes=0)
+
+    def test_main_output_and_compare(self):
+        self.addCleanup(os_helper.unlink, os_helper.TESTFN)
+        args = ['-P2', '-r3', '-n10', '-w1', '-o', os_helper.TESTFN]
+        with captured_stdout() as s:
+            timeit.main(args + ['--name', 'a', 'pass'])
+            timeit.main(args + ['--name', 'b', 'pass'])
+            timeit.main(args + ['--name', 'a', 'pass'])
+        self.assertIn('10 loops, 2 processes x 3 values: mean', s.getvalue())
+        with open(os_helper.TESTFN, encoding='utf-8') as f:
+            results = timeit.load_results(f)
+        self.assertEqual([result.name for result in results], ['b', 'a'])
+
+        with captured_stdout() as s:
+            timeit.main(['--compare', os_helper.TESTFN, os_helper.TESTFN])
+        self.assertEqual(s.getvalue().splitlines()[0][:3], 'b: ')
+        self.assertIn('no change', s.getvalue())
+
+        with captured_stderr() as s:
+            self.assertEqual(timeit.main(['--compare', os_helper.TESTFN]), 2)
+
+
 if __name__ == '__main__':
     unittest.main()
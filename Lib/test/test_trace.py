@@ -230,6 +230,105 @@ def test_linear_methods(self):
             self.assertEqual(tracer.results().counts, expected)
 
 
+class TestLineCountsOnce(unittest.TestCase):
+    """Line coverage recorded with sys.monitoring"""
+    def setUp(self):
+        self.tracer = Trace(count=1, trace=0, countonce=True)
+        self.my_py_filename = fix_ext_py(__file__)
+
+    def test_traced_func_loop(self):
+        self.tracer.runfunc(traced_func_loop, 2, 3)
+
+        firstlineno = get_firstlineno(traced_func_loop)
+        expected = {
+            (self.my_py_filename, firstlineno + 1): 1,
+            (self.my_py_filename, firstlineno + 2): 1,
+            (self.my_py_filename, firstlineno + 3): 1,
+            (self.my_py_filename, firstlineno + 4): 1,
+        }
+        self.assertEqual(self.tracer.results().counts, expected)
+        self.assertEqual(sys.monitoring.get_tool(sys.monitoring.COVERAGE_ID),
+                         None)
+
+    def test_traced_func_importing(self):
+        self.tracer.runfunc(traced_func_importing, 2, 5)
+
+        firstlineno = get_firstlineno(traced_func_importing)
+        expected = {
+            (self.my_py_filename, firstlineno + 1): 1,
+            (fix_ext_py(testmod.__file__), 2): 1,
+            (fix_ext_py(testmod.__file__), 3): 1,
+        }
+        self.assertEqual(self.tracer.results().counts, expected)
+
+    def test_same_lines_as_count(self):
+        tracer = Trace(count=1, trace=0)
+        tracer.runfunc(traced_func_calling_generator)
+        self.tracer.runfunc(traced_func_calling_generator)
+        self.assertEqual(self.tracer.results().counts,
+                         dict.fromkeys(tracer.results().counts, 1))
+
+    def test_runctx_twice(self):
+        # Lines disabled by the first run are recorded by the second one.
+        code = compile('traced_func_linear(2, 5)', __file__, 'exec')
+        self.tracer.runctx(code, globals(), vars())
+        tracer = Trace(count=1, trace=0, countonce=True)
+        tracer.runctx(code, globals(), vars())
+        firstlineno = get_firstlineno(traced_func_linear)
+        for tracer in self.tracer, tracer:
+            counts = tracer.results().counts
+            for i in range(1, 5):
+                self.assertEqual(
+                    counts[self.my_py_filename, firstlineno + i], 1)
+
+    def test_ignore(self):
+        tracer = Trace(count=1, trace=0, countonce=True,
+                       ignoremods=['testmod'])
+        tracer.runfunc(traced_func_importing, 2, 5)
+        firstlineno = get_firstlineno(traced_func_importing)
+        self.assertEqual(tracer.results().counts,
+                         {(self.my_py_filename, firstlineno + 1): 1})
+
+    def test_ignored_then_traced(self):
+        # Code objects ignored by a run are recorded by the next one.
+        tracer = Trace(count=1, trace=0, countonce=True,
+                       ignoremods=['testmod'])
+        tracer.runfunc(traced_func_importing, 2, 5)
+        self.tracer.runfunc(traced_func_importing, 2, 5)
+        self.assertIn((fix_ext_py(testmod.__file__), 2),
+                      self.tracer.results().counts)
+
+    def test_other_tools_not_restarted(self):
+        # Events disabled by other tools stay disabled.
+        mon = sys.monitoring
+        lines = []
+        def line(code, line_number):
+            lines.append(line_number)
+            return mon.DISABLE
+        mon.use_tool_id(mon.PROFILER_ID, 'test')
+        self.addCleanup(mon.free_tool_id, mon.PROFILER_ID)
+        mon.register_callback(mon.PROFILER_ID, mon.events.LINE, line)
+        self.addCleanup(mon.register_callback, mon.PROFILER_ID,
+                        mon.events.LINE, None)
+        code = traced_func_linear.__code__
+        mon.set_local_events(mon.PROFILER_ID, code, mon.events.LINE)
+        self.addCleanup(mon.set_local_events, mon.PROFILER_ID, code, 0)
+        traced_func_linear(2, 5)
+        self.assertTrue(lines)
+        lines.clear()
+        self.tracer.runfunc(traced_func_loop, 2, 3)
+        traced_func_linear(2, 5)
+        self.assertEqual(lines, [])
+
+    def test_tool_in_use(self):
+        sys.monitoring.use_tool_id(sys.monitoring.COVERAGE_ID, 'test')
+        try:
+            with self.assertRaises(ValueError):
+                self.tracer.runfunc(traced_func_linear, 2, 5)
+        finally:
+            sys.monitoring.free_tool_id(sys.monitoring.COVERAGE_ID)
+
+
 class TestRunExecCounts(unittest.TestCase):
     """A simple sanity test of line-counting, via runctx (exec)"""
     def setUp(self):
@@ -557,6 +656,28 @@ def f():
         self.assertIn('lines   cov%   module   (path)', stdout)
         self.assertIn(f'6   100%   {modulename}   ({filename})', stdout)
 
+    def test_count_once(self):
+        filename = f'{TESTFN}.py'
+        coverfilename = f'{TESTFN}.cover'
+        with open(filename, 'w', encoding='utf-8') as fd:
+            self.addCleanup(unlink, filename)
+            self.addCleanup(unlink, coverfilename)
+            fd.write(textwrap.dedent("""\
+                def f():
+                    return 1
+
+                for i in range(10):
+                    f()
+            """))
+        assert_python_ok('-m', 'trace', '--count-once', filename)
+        with open(coverfilename, encoding='utf-8') as fd:
+            lines = fd.read().splitlines()
+        self.assertEqual(lines[0].split(), ['1:', 'def', 'f():'])
+        self.assertEqual(lines[1].split(), ['1:', 'return', '1'])
+        self.assertEqual(lines[4].split(), ['1:', 'f()'])
+
+        assert_python_failure('-m', 'trace', '--count-once', '-t', filename)
+
     def test_run_as_module(self):
         assert_python_ok('-m', 'trace', '-l', '--module', 'timeit', '-n', '1')
         assert_python_failure('-m', 'trace', '-l', '--module', 'not_a_module_zzz')
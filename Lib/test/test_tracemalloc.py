@@ -295,6 +295,58 @@ def test_reset_peak(self):
         self.assertGreater(peak3, peak2)
         self.assertGreaterEqual(peak3 - peak2, obj_size)
 
+    def find_diff(self, traceback, **kwargs):
+        for stat in tracemalloc.compare_to_checkpoint(**kwargs):
+            if stat.traceback == traceback:
+                return stat
+        return None
+
+    def test_checkpoint(self):
+        tracemalloc.checkpoint()
+        obj_size = 12345
+        obj, obj_traceback = allocate_bytes(obj_size)
+        stat = self.find_diff(obj_traceback)
+        self.assertEqual((stat.size_diff, stat.count_diff), (obj_size, 1))
+        self.assertGreaterEqual(stat.size, obj_size)
+        self.assertGreater(stat.traceback.total_nframe, 1)
+
+        # Unchanged tracebacks are not listed
+        del obj
+        self.assertIsNone(self.find_diff(obj_traceback))
+
+    def test_checkpoint_free(self):
+        obj_size = 12345
+        obj, obj_traceback = allocate_bytes(obj_size)
+        tracemalloc.checkpoint()
+        del obj
+        stat = self.find_diff(obj_traceback)
+        self.assertEqual((stat.size_diff, stat.count_diff), (-obj_size, -1))
+
+    def test_compare_to_checkpoint_reset(self):
+        tracemalloc.checkpoint()
+        obj, obj_traceback = allocate_bytes(12345)
+        self.assertIsNotNone(self.find_diff(obj_traceback, checkpoint=True))
+        self.assertIsNone(self.find_diff(obj_traceback))
+
+    def test_compare_to_checkpoint_limit(self):
+        tracemalloc.checkpoint()
+        data = [allocate_bytes(size)[0] for size in (1000, 2000, 3000)]
+        stats = tracemalloc.compare_to_checkpoint(2)
+        self.assertEqual(len(stats), 2)
+        self.assertGreaterEqual(abs(stats[0].size_diff),
+                                abs(stats[1].size_diff))
+        self.assertEqual(tracemalloc.compare_to_checkpoint(0), [])
+        self.assertRaises(ValueError, tracemalloc.compare_to_checkpoint, -1)
+
+    def test_checkpoint_requires_tracing(self):
+        tracemalloc.checkpoint()
+        # clear_traces() and stop() discard the checkpoint
+        tracemalloc.clear_traces()
+        self.assertRaises(RuntimeError, tracemalloc.compare_to_checkpoint)
+        tracemalloc.stop()
+        self.assertRaises(RuntimeError, tracemalloc.checkpoint)
+        self.assertRaises(RuntimeError, tracemalloc.compare_to_checkpoint)
+
     def test_is_tracing(self):
         tracemalloc.stop()
         self.assertFalse(tracemalloc.is_tracing())
@@ -9,7 +9,7 @@
 from wsgiref import util
 from wsgiref.validate import validator
 from wsgiref.simple_server import WSGIServer, WSGIRequestHandler
-from wsgiref.simple_server import make_server
+from wsgiref.simple_server import ThreadingWSGIServer, make_server
 from http.client import HTTPConnection
 from io import StringIO, BytesIO, BufferedReader
 from socketserver import BaseServer
@@ -285,6 +285,92 @@ def run_client():
         background.join()
         self.assertEqual(received, support.SOCK_MAX_SIZE - 100)
 
+    def test_pipelining(self):
+        def app(environ, start_response):
+            size = 2 if environ['PATH_INFO'] == '/b' else -1
+            body = environ['wsgi.input'].read(size)
+            start_response("200 OK", [('Content-Type', 'text/plain')])
+            if environ['PATH_INFO'] == '/chunked':
+                return iter([b'a', b'', b'bc'])
+            return [environ['PATH_INFO'].encode('ascii'), b':', body]
+
+        class KeepAliveHandler(MockHandler):
+            protocol_version = "HTTP/1.1"
+
+        server = make_server("", 80, app, MockServer, KeepAliveHandler)
+        inp = BufferedReader(BytesIO(
+            b"POST /a HTTP/1.1\r\nContent-Length: 3\r\n\r\nxyz"
+            b"GET /chunked HTTP/1.1\r\n\r\n"
+            b"POST /b HTTP/1.1\r\nContent-Length: 6\r\n\r\nunread"
+            b"GET /c HTTP/1.1\r\nConnection: close\r\n"
+            b"Content-Length: 0\r\n\r\n"
+            b"GET /d HTTP/1.1\r\n\r\n"
+        ))
+        out = BytesIO()
+        with support.captured_stderr():
+            server.finish_request((inp, out), ("127.0.0.1", 8888))
+
+        responses = re.split(rb'(?=HTTP/1\.1 )', out.getvalue())[1:]
+        self.assertEqual(len(responses), 4)
+        self.assertIn(b"Content-Length: 6\r\n", responses[0])
+        self.assertTrue(responses[0].endswith(b"\r\n\r\n/a:xyz"))
+        self.assertIn(b"Transfer-Encoding: chunked\r\n", responses[1])
+        self.assertTrue(responses[1].endswith(
+            b"\r\n\r\n1\r\na\r\n2\r\nbc\r\n0\r\n\r\n"))
+        # The unread rest of the body is skipped
+        self.assertTrue(responses[2].endswith(b"\r\n\r\n/b:un"))
+        self.assertIn(b"Connection: close\r\n", responses[3])
+        self.assertTrue(responses[3].endswith(b"\r\n\r\n/c:"))
+
+    def test_empty_body(self):
+        def no_content_app(environ, start_response):
+            start_response("204 No Content", [])
+            return []
+
+        def empty_app(environ, start_response):
+            start_response("200 OK", [('Content-Type', 'text/plain')])
+            return []
+
+        for app in no_content_app, empty_app:
+            for method in 'GET', 'HEAD':
+                with self.subTest(app=app.__name__, method=method):
+                    out, err = run_amock(
+                        app, data=f"{method} / HTTP/1.0\n\n".encode())
+                    self.assertTrue(out.startswith(b"HTTP/1.0 "), out)
+                    self.assertTrue(out.endswith(b"\r\n\r\n"), out)
+                    self.assertIn(b"Content-Length: 0\r\n", out)
+        self.assertTrue(out.startswith(b"HTTP/1.0 200 OK\r\n"))
+
+    def test_threading_server_keep_alive(self):
+        def app(environ, start_response):
+            start_response("200 OK", [('Content-Type', 'text/plain')])
+            return [b'multithread=',
+                    str(environ['wsgi.multithread']).encode('ascii')]
+
+        class WsgiHandler(NoLogRequestHandler, WSGIRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+        server = make_server(socket_helper.HOST, 0, app,
+                             ThreadingWSGIServer, WsgiHandler)
+        self.addCleanup(server.server_close)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.shutdown)
+
+        http = HTTPConnection(*server.server_address)
+        self.addCleanup(http.close)
+        http.request("GET", "/")
+        sock = http.sock
+        for _ in range(3):
+            with http.getresponse() as response:
+                self.assertEqual(response.read(), b'multithread=True')
+                self.assertFalse(response.will_close)
+            http.request("GET", "/")
+        # All requests went over the same connection
+        self.assertIs(http.sock, sock)
+        http.getresponse().read()
+
 
 class UtilityTests(TestCase):
 
@@ -653,6 +739,42 @@ def trivial_app4(e,s):
             b'Content-Length: 12345\r\n'
             b'\r\n')
 
+    def testChunkedEncoding(self):
+        def app(e, s):
+            s('200 OK', [])
+            return iter([b'abc', b'', b'defghijklmnopq'])
+
+        h = TestHandler(SERVER_PROTOCOL="HTTP/1.1")
+        h.origin_server = False
+        h.http_version = "1.1"
+        h.run(app)
+        self.assertEqual(h.stdout.getvalue(),
+            b"Status: 200 OK\r\n"
+            b"\r\n"
+            b"abcdefghijklmnopq")
+
+        h = TestHandler(SERVER_PROTOCOL="HTTP/1.1")
+        h.origin_server = True
+        h.http_version = "1.1"
+        h.run(app)
+        self.assertTrue(h.stdout.getvalue().endswith(
+            b"Transfer-Encoding: chunked\r\n"
+            b"\r\n"
+            b"3\r\nabc\r\n"
+            b"e\r\ndefghijklmnopq\r\n"
+            b"0\r\n\r\n"))
+
+        for environ in [{'SERVER_PROTOCOL': "HTTP/1.0"},
+                        {'SERVER_PROTOCOL': "HTTP/1.1",
+                         'REQUEST_METHOD': "HEAD"}]:
+            h = TestHandler(**environ)
+            h.origin_server = True
+            h.http_version = "1.1"
+            h.run(app)
+            self.assertNotIn(b"Transfer-Encoding", h.stdout.getvalue())
+            self.assertTrue(h.stdout.getvalue().endswith(
+                b"\r\n\r\nabcdefghijklmnopq"))
+
     def testBasicErrorOutput(self):
 
         def non_error_app(e,s):
@@ -555,6 +555,37 @@ def testInvalidateCaches(self):
         self.assertIsNone(zipimport._zip_directory_cache.get(zi.archive))
         self.assertIsNone(zi.find_spec("name_does_not_matter"))
 
+    def testDirectoryIndex(self):
+        files = {TESTMOD + ".py": (NOW, test_src)}
+        self.makeZip(files)
+        index_dir = self.enterContext(os_helper.temp_dir())
+        self.enterContext(unittest.mock.patch.object(
+            zipimport._bootstrap_external, '_import_index_dir',
+            lambda: index_dir))
+
+        zi = zipimport.zipimporter(TEMP_ZIP)
+        self.assertEqual(zi._get_files().keys(), files.keys())
+        [index] = glob.glob(os.path.join(index_dir, 'zipindex.*'))
+
+        # A valid index is used instead of the central directory.
+        with open(index, 'rb') as f:
+            stamp, toc = marshal.load(f)
+        toc['fake.py'] = toc[TESTMOD + '.py']
+        with open(index, 'wb') as f:
+            marshal.dump((stamp, toc), f)
+        zipimport._zip_directory_cache.clear()
+        zi = zipimport.zipimporter(TEMP_ZIP)
+        self.assertIn('fake.py', zi._get_files())
+
+        # Changing the archive invalidates it.
+        files["spam.py"] = (NOW, test_src)
+        self.makeZip(files)
+        zi.invalidate_caches()
+        self.assertEqual(zi._get_files().keys(), files.keys())
+        zipimport._zip_directory_cache.clear()
+        zi = zipimport.zipimporter(TEMP_ZIP)
+        self.assertEqual(zi._get_files().keys(), files.keys())
+
     def testInvalidateCachesWithMultipleZipimports(self):
         packdir = TESTPACK + os.sep
         packdir2 = packdir + TESTPACK2 + os.sep
@@ -5,7 +5,7 @@
 import _thread
 import warnings
 
-from time import monotonic as _time
+from time import monotonic as _time, perf_counter as _perf_counter
 from _weakrefset import WeakSet
 from itertools import count as _count
 try:
@@ -29,7 +29,9 @@
            'Barrier', 'BrokenBarrierError', 'Timer', 'ThreadError',
            'setprofile', 'settrace', 'local', 'stack_size',
            'excepthook', 'ExceptHookArgs', 'gettrace', 'getprofile',
-           'setprofile_all_threads','settrace_all_threads']
+           'setprofile_all_threads','settrace_all_threads',
+           'setlockprofile', 'getlockprofile', 'getlockstats',
+           'clearlockstats', 'print_lock_stats', 'LockStats']
 
 # Rename some stuff so "from threading import *" is safe
 _start_joinable_thread = _thread.start_joinable_thread
@@ -134,6 +136,10 @@ def RLock(*args, **kwargs):
             DeprecationWarning,
             stacklevel=2,
         )
+    if _lock_profile:
+        if _CRLock is None:
+            return _ProfiledRLock(_PyRLock(*args, **kwargs), 'RLock')
+        return _ProfiledRLock(_CRLock(*args, **kwargs), 'RLock')
     if _CRLock is None:
         return _PyRLock(*args, **kwargs)
     return _CRLock(*args, **kwargs)
@@ -265,6 +271,282 @@ def _recursion_count(self):
 
 _PyRLock = _RLock
 
+# Lock contention profiling
+
+_lock_profile = False
+# Statistics of the live profiled locks
+_lock_stats = set()
+# Statistics of the destroyed locks, not yet merged in _lock_site_stats
+_dead_lock_stats = _deque()
+# Summed statistics of the destroyed locks, by creation site, so that the
+# memory used grows with the number of sites rather than of locks
+_lock_site_stats = {}
+# Protects _lock_site_stats
+_lock_stats_lock = _allocate_lock()
+# Modules whose frames are skipped when looking for the site creating a lock
+_lock_profile_skip = frozenset({__name__, 'queue'})
+
+class LockStats:
+    """Contention statistics of a lock created while lock profiling was
+    enabled.
+
+    The creation site is the first frame outside of the threading and queue
+    modules, so that the lock of a Condition, a Semaphore or a queue.Queue
+    is attributed to the code creating them.  Times are in seconds.
+
+    """
+
+    def __init__(self, kind, filename, lineno, function):
+        self.kind = kind
+        self.filename = filename
+        self.lineno = lineno
+        self.function = function
+        self.alive = True
+        self.locks = 1
+        self._reset()
+
+    def _reset(self):
+        self.acquisitions = 0
+        self.contentions = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.hold_time = 0.0
+        self.max_hold_time = 0.0
+
+    def _copy(self):
+        copy = LockStats.__new__(LockStats)
+        copy.__dict__.update(self.__dict__)
+        return copy
+
+    def _site(self):
+        return (self.kind, self.filename, self.lineno, self.function)
+
+    def _add(self, other):
+        self.locks += other.locks
+        self.acquisitions += other.acquisitions
+        self.contentions += other.contentions
+        self.wait_time += other.wait_time
+        self.max_wait_time = max(self.max_wait_time, other.max_wait_time)
+        self.hold_time += other.hold_time
+        self.max_hold_time = max(self.max_hold_time, other.max_hold_time)
+
+    def __repr__(self):
+        return ("<LockStats %s %s:%s acquisitions=%d contentions=%d "
+                "wait_time=%.6f hold_time=%.6f>"
+                % (self.kind, self.filename, self.lineno, self.acquisitions,
+                   self.contentions, self.wait_time, self.hold_time))
+
+
+class _ProfiledLock:
+    # Wrap a lock to record its acquisitions, the time spent waiting for it
+    # and the time it is held.  The statistics are only updated while
+    # holding the wrapped lock, so they need no lock of their own.
+
+    def __init__(self, lock=None, kind='Lock'):
+        if lock is None:
+            lock = _allocate_lock()
+        self._lock = lock
+        self._acquired_at = 0.0
+        frame = _sys._getframe(1)
+        while (frame.f_back is not None
+               and frame.f_globals.get('__name__') in _lock_profile_skip):
+            frame = frame.f_back
+        code = frame.f_code
+        self._stats = LockStats(kind, code.co_filename, frame.f_lineno,
+                                code.co_qualname)
+        _lock_stats.add(self._stats)
+
+    def __del__(self):
+        stats = self._stats
+        stats.alive = False
+        _lock_stats.discard(stats)
+        _dead_lock_stats.append(stats)
+        # Don't block: the lock may be destroyed while the statistics are
+        # being merged, they are then merged later.
+        _merge_dead_lock_stats(False)
+
+    def __repr__(self):
+        return "<%s.%s wrapping %r>" % (self.__class__.__module__,
+                                        self.__class__.__qualname__,
+                                        self._lock)
+
+    def _at_fork_reinit(self):
+        self._lock._at_fork_reinit()
+
+    def _is_outermost(self):
+        return True
+
+    def _acquired(self, wait):
+        now = _perf_counter()
+        stats = self._stats
+        stats.acquisitions += 1
+        if wait is not None:
+            stats.contentions += 1
+            stats.wait_time += wait
+            if wait > stats.max_wait_time:
+                stats.max_wait_time = wait
+        if self._is_outermost():
+            self._acquired_at = now
+
+    def _releasing(self):
+        hold = _perf_counter() - self._acquired_at
+        stats = self._stats
+        stats.hold_time += hold
+        if hold > stats.max_hold_time:
+            stats.max_hold_time = hold
+
+    def acquire(self, blocking=True, timeout=-1):
+        # First try to acquire the lock without waiting, unless the wrapped
+        # lock has to reject the arguments
+        if blocking and timeout != -1 and not 0 <= timeout <= TIMEOUT_MAX:
+            pass
+        elif self._lock.acquire(False, -1 if blocking else timeout):
+            self._acquired(None)
+            return True
+        elif not blocking:
+            return False
+        start = _perf_counter()
+        if not self._lock.acquire(True, timeout):
+            return False
+        self._acquired(_perf_counter() - start)
+        return True
+
+    __enter__ = acquire
+
+    def release(self):
+        if self._lock.locked():
+            self._releasing()
+        self._lock.release()
+
+    def __exit__(self, t, v, tb):
+        self.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    # Used by condition variables, equivalent to their default implementation
+    def _is_owned(self):
+        return self._lock.locked()
+
+
+class _ProfiledRLock(_ProfiledLock):
+
+    def _is_outermost(self):
+        return self._lock._recursion_count() == 1
+
+    def release(self):
+        if self._lock._recursion_count() == 1:
+            self._releasing()
+        self._lock.release()
+
+    # Internal methods used by condition variables
+
+    def _acquire_restore(self, state):
+        # The lock is reacquired after waiting for the condition: the time
+        # spent is accounted as wait time but not as a contention.
+        start = _perf_counter()
+        self._lock._acquire_restore(state)
+        now = _perf_counter()
+        stats = self._stats
+        stats.acquisitions += 1
+        stats.wait_time += now - start
+        self._acquired_at = now
+
+    def _release_save(self):
+        if self._lock._is_owned():
+            self._releasing()
+        return self._lock._release_save()
+
+    def _is_owned(self):
+        return self._lock._is_owned()
+
+    def _recursion_count(self):
+        return self._lock._recursion_count()
+
+def setlockprofile(enable):
+    """Enable or disable the profiling of locks created afterwards.
+
+    While enabled, Lock() and RLock(), and so Condition, Semaphore, Event,
+    Barrier and queue.Queue objects, create locks which record their
+    contention statistics, see getlockstats().  Objects created by
+    "from threading import Lock" before enabling it are not profiled.
+    """
+    global _lock_profile, Lock
+    _lock_profile = bool(enable)
+    Lock = _ProfiledLock if _lock_profile else _LockType
+
+def getlockprofile():
+    """Return true if lock profiling is enabled."""
+    return _lock_profile
+
+def _merge_dead_lock_stats(blocking=True):
+    # Sum the statistics of the destroyed locks by creation site
+    if not _lock_stats_lock.acquire(blocking):
+        return
+    try:
+        while _dead_lock_stats:
+            try:
+                stats = _dead_lock_stats.popleft()
+            except IndexError:
+                break
+            total = _lock_site_stats.get(stats._site())
+            if total is None:
+                _lock_site_stats[stats._site()] = stats
+            else:
+                total._add(stats)
+    finally:
+        _lock_stats_lock.release()
+
+def getlockstats():
+    """Return a list of LockStats, one for every live lock created while lock
+    profiling was enabled, and one per creation site summing the statistics
+    of the locks which were destroyed since the last call to
+    clearlockstats()."""
+    _merge_dead_lock_stats()
+    with _lock_stats_lock:
+        return ([stats._copy() for stats in list(_lock_stats)]
+                + [stats._copy() for stats in _lock_site_stats.values()])
+
+def clearlockstats():
+    """Reset the statistics of all profiled locks and forget those of the
+    locks which were destroyed."""
+    _merge_dead_lock_stats()
+    with _lock_stats_lock:
+        _lock_site_stats.clear()
+    for stats in list(_lock_stats):
+        stats._reset()
+
+def print_lock_stats(limit=None, file=None):
+    """Print a report of the lock statistics grouped by creation site, the
+    sites where threads waited the longest first.
+
+    If limit is given, only print that many sites.  If file is omitted or
+    None, the output goes to sys.stderr.
+    """
+    if file is None:
+        file = _sys.stderr
+    sites = {}
+    for stats in getlockstats():
+        total = sites.get(stats._site())
+        if total is None:
+            sites[stats._site()] = stats
+        else:
+            total._add(stats)
+    totals = sorted(sites.values(),
+                    key=lambda total: (total.wait_time, total.hold_time),
+                    reverse=True)
+    if limit is not None:
+        totals = totals[:limit]
+    print("%6s %-6s %12s %11s %10s %10s %10s %10s  %s"
+          % ("locks", "kind", "acquisitions", "contentions", "wait(s)",
+             "maxwait(s)", "hold(s)", "maxhold(s)", "site"), file=file)
+    for total in totals:
+        print("%6d %-6s %12d %11d %10.6f %10.6f %10.6f %10.6f  %s:%d(%s)"
+              % (total.locks, total.kind, total.acquisitions, total.contentions,
+                 total.wait_time, total.max_wait_time, total.hold_time,
+                 total.max_hold_time, total.filename, total.lineno,
+                 total.function), file=file)
+
 
 class Condition:
     """Class that implements a condition variable.
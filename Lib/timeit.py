@@ -20,6 +20,13 @@
   -v/--verbose: print raw timing results; repeat for more digits precision
   -u/--unit: set the output time unit (nsec, usec, msec, or sec)
   -h/--help: print this usage message and exit
+  -P/--processes N: run the benchmark in N fresh worker processes and
+                    print statistics (see below)
+  -w/--warmups N: number of warmup runs per worker process (default:
+                  until the timings stabilize)
+  -o/--output FILE: add the result to the JSON file FILE (implies -P)
+  --name NAME: name of the benchmark in FILE (default: the statement)
+  --compare OLD NEW: compare two JSON files written by -o
   --: separate options from statement, use when statement starts with -
   statement: statement to be timed (default 'pass')
 
@@ -32,6 +39,12 @@
 increasing numbers from the sequence 1, 2, 5, 10, 20, 50, ... until the
 total time is at least 0.2 seconds.
 
+With -P or -o, a first process calibrates the number of loops (unless -n
+is given), then each worker process warms up and times -r runs.  The
+mean and standard deviation exclude outliers.  --compare reports the
+benchmarks whose mean changed significantly and exits with status 1 if
+any of them got slower.
+
 Note: there is a certain baseline overhead associated with executing a
 pass statement.  It differs between versions.  The code here doesn't try
 to hide it, but you should be aware of it.  The baseline overhead can be
@@ -41,11 +54,17 @@
 
     Timer
 
+    BenchmarkResult
+
 Functions:
 
     timeit(string, string) -> float
     repeat(string, string) -> list
     default_timer() -> float
+    benchmark(string, string) -> BenchmarkResult
+    dump_results(list, file)
+    load_results(file) -> list
+    compare_results(list, list) -> list
 
 """
 
@@ -54,12 +73,16 @@
 import sys
 import time
 
-__all__ = ["Timer", "timeit", "repeat", "default_timer"]
+__all__ = ["Timer", "timeit", "repeat", "default_timer", "benchmark",
+           "BenchmarkResult", "dump_results", "load_results",
+           "compare_results"]
 
 dummy_src_name = "<timeit-src>"
 default_number = 1000000
 default_repeat = 5
 default_timer = time.perf_counter
+default_processes = 5
+max_warmups = 10
 
 _globals = globals
 
@@ -243,6 +266,258 @@ def repeat(stmt="pass", setup="pass", timer=default_timer,
     return Timer(stmt, setup, timer, globals).repeat(repeat, number)
 
 
+class BenchmarkResult:
+    """Timings of a statement collected by benchmark().
+
+    'values' are the times per loop, in seconds, of every timed run of
+    every worker process, 'warmups' those of the runs made before.
+    """
+
+    def __init__(self, name, loops, values, warmups=()):
+        self.name = name
+        self.loops = loops
+        self.values = list(values)
+        self.warmups = list(warmups)
+
+    def __repr__(self):
+        return ("<%s %r: %d values of %d loops>"
+                % (type(self).__name__, self.name, len(self.values),
+                   self.loops))
+
+    def __str__(self):
+        outliers = len(self.outliers)
+        return ("%s: mean %s +- %s, median %s (%d values, %d outlier%s)"
+                % (self.name, _format_time(self.mean),
+                   _format_time(self.stdev), _format_time(self.median),
+                   len(self.values), outliers, 's' if outliers != 1 else ''))
+
+    @property
+    def outliers(self):
+        """Values outside of the Tukey fences of 1.5 interquartile ranges
+        around the quartiles."""
+        if len(self.values) < 4:
+            return []
+        import statistics
+        q1, _, q3 = statistics.quantiles(self.values, n=4, method="inclusive")
+        low = q1 - 1.5 * (q3 - q1)
+        high = q3 + 1.5 * (q3 - q1)
+        return [value for value in self.values if not low <= value <= high]
+
+    def _kept_values(self):
+        outliers = self.outliers
+        if not outliers:
+            return self.values
+        return [value for value in self.values if value not in outliers]
+
+    @property
+    def mean(self):
+        """The mean of the values, excluding outliers."""
+        import statistics
+        return statistics.fmean(self._kept_values())
+
+    @property
+    def stdev(self):
+        """The sample standard deviation of the values, excluding outliers."""
+        import statistics
+        values = self._kept_values()
+        return statistics.stdev(values) if len(values) > 1 else 0.0
+
+    @property
+    def median(self):
+        import statistics
+        return statistics.median(self.values)
+
+    def to_dict(self):
+        """Return a JSON compatible dict, the inverse of from_dict()."""
+        return {"name": self.name, "loops": self.loops,
+                "values": self.values, "warmups": self.warmups}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["loops"], data["values"],
+                   data.get("warmups", ()))
+
+
+def _warmup(timer, number, warmups):
+    """Run timer until its timings stabilize, or warmups times if warmups
+    is not None.  Return the times per loop."""
+    values = []
+    if warmups is not None:
+        for i in range(warmups):
+            values.append(timer.timeit(number) / number)
+        return values
+    while len(values) < max_warmups:
+        values.append(timer.timeit(number) / number)
+        if (len(values) >= 2
+                and abs(values[-1] - values[-2]) <= 0.05 * values[-2]):
+            break
+    return values
+
+
+def _run_worker(stmt, setup, number, repeat, warmups, process):
+    import json
+    import os
+    import subprocess
+    import tempfile
+    # The timings are written to a file, since stmt and setup may print.
+    fd, filename = tempfile.mkstemp(prefix="timeit-", suffix=".json")
+    os.close(fd)
+    try:
+        # Run the workers with the same interpreter options
+        cmd = [sys.executable, *subprocess._args_from_interpreter_flags(),
+               "-m", "timeit", "--worker", filename,
+               "-n", str(number), "-r", str(repeat), "-s", setup]
+        if warmups is not None:
+            cmd += ["-w", str(warmups)]
+        if process:
+            cmd.append("-p")
+        cmd += ["--", stmt]
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE, text=True)
+        if proc.returncode:
+            raise RuntimeError("benchmark worker failed with exit code %d:\n%s"
+                               % (proc.returncode, proc.stderr))
+        try:
+            with open(filename, encoding="utf-8") as file:
+                return json.load(file)
+        except ValueError:
+            raise RuntimeError("benchmark worker sent invalid results:\n%s"
+                               % proc.stderr) from None
+    finally:
+        os.unlink(filename)
+
+
+def benchmark(stmt="pass", setup="pass", *, name=None,
+              processes=default_processes, repeat=default_repeat,
+              number=0, warmups=None, process_time=False):
+    """Time a statement in fresh worker processes and return a
+    BenchmarkResult.
+
+    stmt and setup must be strings, run in the namespace of a new
+    __main__ module.  Unless number is given, a first process determines
+    the number of loops with Timer.autorange().  Then each of the
+    processes worker processes warms up (warmups times, or until the
+    timings stabilize if warmups is None) and records repeat timings.
+    """
+    if not isinstance(stmt, str) or not isinstance(setup, str):
+        raise TypeError("stmt and setup must be strings")
+    if processes < 1 or repeat < 1:
+        raise ValueError("processes and repeat must be at least 1")
+    if not number:
+        # Only determine the number of loops: no warmups nor repetitions.
+        number = _run_worker(stmt, setup, 0, 0, 0, process_time)["loops"]
+    values = []
+    warmup_values = []
+    for i in range(processes):
+        run = _run_worker(stmt, setup, number, repeat, warmups, process_time)
+        values += run["values"]
+        warmup_values += run["warmups"]
+    return BenchmarkResult(stmt if name is None else name, number, values,
+                           warmup_values)
+
+
+_results_version = 1
+
+
+def dump_results(results, file):
+    """Write a list of BenchmarkResult to the text file object file, as
+    JSON."""
+    import json
+    import platform
+    data = {
+        "version": _results_version,
+        "python": sys.version,
+        "platform": platform.platform(),
+        "benchmarks": [result.to_dict() for result in results],
+    }
+    json.dump(data, file, indent=2)
+    file.write("\n")
+
+
+def load_results(file):
+    """Read a list of BenchmarkResult written by dump_results() from the
+    text file object file."""
+    import json
+    data = json.load(file)
+    if data.get("version") != _results_version:
+        raise ValueError("unsupported benchmark results version: %r"
+                         % (data.get("version"),))
+    return [BenchmarkResult.from_dict(item) for item in data["benchmarks"]]
+
+
+def compare_results(old, new, alpha=0.05):
+    """Compare the benchmarks with the same name in two lists of
+    BenchmarkResult.
+
+    Return a list of (name, old result, new result, ratio of the new mean to
+    the old one, significant) tuples, in the order of new.  A change is
+    significant if a two-sided test of Welch's statistic on the means
+    rejects their equality at level alpha.  The normal approximation of the
+    statistic is used, which assumes that enough values were collected.
+    """
+    import math
+    import statistics
+    old_results = {result.name: result for result in old}
+    comparison = []
+    for result in new:
+        previous = old_results.get(result.name)
+        if previous is None:
+            continue
+        a = previous._kept_values()
+        b = result._kept_values()
+        ratio = result.mean / previous.mean if previous.mean else math.inf
+        significant = False
+        if len(a) > 1 and len(b) > 1:
+            error = math.sqrt(statistics.variance(a) / len(a)
+                              + statistics.variance(b) / len(b))
+            diff = abs(result.mean - previous.mean)
+            if error:
+                z = statistics.NormalDist().inv_cdf(1 - alpha / 2)
+                significant = diff / error > z
+            else:
+                significant = diff > 0
+        comparison.append((result.name, previous, result, ratio, significant))
+    return comparison
+
+
+_units = {"nsec": 1e-9, "usec": 1e-6, "msec": 1e-3, "sec": 1.0}
+
+
+def _format_time(dt, unit=None, precision=3):
+    if unit is not None:
+        scale = _units[unit]
+    else:
+        scales = [(scale, unit) for unit, scale in _units.items()]
+        scales.sort(reverse=True)
+        for scale, unit in scales:
+            if dt >= scale:
+                break
+    return "%.*g %s" % (precision, dt / scale, unit)
+
+
+def _compare_main(old_file, new_file):
+    with open(old_file, encoding="utf-8") as f:
+        old = load_results(f)
+    with open(new_file, encoding="utf-8") as f:
+        new = load_results(f)
+    slower = False
+    comparison = compare_results(old, new)
+    for name, previous, result, ratio, significant in comparison:
+        if ratio > 1:
+            change = "%.2fx slower" % ratio
+        elif ratio < 1:
+            change = "%.2fx faster" % (1 / ratio)
+        else:
+            change = "no change"
+        if not significant:
+            change = "not significant (%s)" % change
+        elif ratio > 1:
+            slower = True
+        print("%s: %s -> %s: %s" % (name, _format_time(previous.mean),
+                                     _format_time(result.mean), change))
+    return 1 if slower else None
+
+
 def main(args=None, *, _wrap_timer=None):
     """Main program, used when run as a script.
 
@@ -264,9 +539,11 @@ def main(args=None, *, _wrap_timer=None):
         args = sys.argv[1:]
     import getopt
     try:
-        opts, args = getopt.getopt(args, "n:u:s:r:pvh",
+        opts, args = getopt.getopt(args, "n:u:s:r:pvhP:w:o:",
                                    ["number=", "setup=", "repeat=",
-                                    "process", "verbose", "unit=", "help"])
+                                    "process", "verbose", "unit=", "help",
+                                    "processes=", "warmups=", "output=",
+                                    "name=", "compare", "worker="])
     except getopt.error as err:
         print(err)
         print("use -h/--help for command line help")
@@ -279,8 +556,14 @@ def main(args=None, *, _wrap_timer=None):
     repeat = default_repeat
     verbose = 0
     time_unit = None
-    units = {"nsec": 1e-9, "usec": 1e-6, "msec": 1e-3, "sec": 1.0}
+    units = _units
     precision = 3
+    processes = 0
+    warmups = None
+    output = None
+    name = None
+    compare = False
+    worker = None
     for o, a in opts:
         if o in ("-n", "--number"):
             number = int(a)
@@ -295,8 +578,6 @@ def main(args=None, *, _wrap_timer=None):
                 return 2
         if o in ("-r", "--repeat"):
             repeat = int(a)
-            if repeat <= 0:
-                repeat = 1
         if o in ("-p", "--process"):
             timer = time.process_time
         if o in ("-v", "--verbose"):
@@ -306,7 +587,33 @@ def main(args=None, *, _wrap_timer=None):
         if o in ("-h", "--help"):
             print(__doc__, end=' ')
             return 0
+        if o in ("-P", "--processes"):
+            processes = max(int(a), 1)
+        if o in ("-w", "--warmups"):
+            warmups = max(int(a), 0)
+        if o in ("-o", "--output"):
+            output = a
+        if o == "--name":
+            name = a
+        if o == "--compare":
+            compare = True
+        if o == "--worker":
+            worker = a
     setup = "\n".join(setup) or "pass"
+    if repeat <= 0 and worker is None:
+        repeat = 1
+
+    if compare:
+        if len(args) != 2:
+            print("--compare requires two result files", file=sys.stderr)
+            return 2
+        return _compare_main(*args)
+    if output is not None and not processes:
+        processes = default_processes
+    if processes and worker is None:
+        return _benchmark_main(stmt, setup, number, repeat, warmups,
+                               timer is time.process_time, processes,
+                               output, name, time_unit, precision)
 
     # Include the current directory, so that local imports work (sys.path
     # contains the directory of this script, rather than the current
@@ -317,6 +624,8 @@ def main(args=None, *, _wrap_timer=None):
         timer = _wrap_timer(timer)
 
     t = Timer(stmt, setup, timer)
+    if worker is not None:
+        return _worker_main(t, number, repeat, warmups, worker)
     if number == 0:
         # determine number so that 0.2 <= total time < 2.0
         callback = None
@@ -342,18 +651,7 @@ def callback(number, time_taken):
         return 1
 
     def format_time(dt):
-        unit = time_unit
-
-        if unit is not None:
-            scale = units[unit]
-        else:
-            scales = [(scale, unit) for unit, scale in units.items()]
-            scales.sort(reverse=True)
-            for scale, unit in scales:
-                if dt >= scale:
-                    break
-
-        return "%.*g %s" % (precision, dt / scale, unit)
+        return _format_time(dt, time_unit, precision)
 
     if verbose:
         print("raw times: %s" % ", ".join(map(format_time, raw_timings)))
@@ -377,5 +675,55 @@ def format_time(dt):
     return None
 
 
+def _worker_main(t, number, repeat, warmups, filename):
+    # Run by benchmark() in a fresh process: write the timings as JSON.
+    import json
+    try:
+        if number == 0:
+            number, _ = t.autorange()
+        warmup_values = _warmup(t, number, warmups)
+        values = [dt / number for dt in t.repeat(repeat, number)]
+    except:
+        t.print_exc()
+        return 1
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump({"loops": number, "values": values,
+                   "warmups": warmup_values}, file)
+    return None
+
+
+def _benchmark_main(stmt, setup, number, repeat, warmups, process_time,
+                    processes, output, name, time_unit, precision):
+    try:
+        result = benchmark(stmt, setup, name=name, processes=processes,
+                           repeat=repeat, number=number, warmups=warmups,
+                           process_time=process_time)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+    def format_time(dt):
+        return _format_time(dt, time_unit, precision)
+
+    outliers = len(result.outliers)
+    print("%d loop%s, %d processes x %d values: mean %s +- %s, median %s, "
+          "%d outlier%s"
+          % (result.loops, 's' if result.loops != 1 else '', processes,
+             repeat, format_time(result.mean), format_time(result.stdev),
+             format_time(result.median), outliers,
+             's' if outliers != 1 else ''))
+    if output is not None:
+        import os
+        results = []
+        if os.path.exists(output):
+            with open(output, encoding="utf-8") as f:
+                results = load_results(f)
+        results = [r for r in results if r.name != result.name]
+        results.append(result)
+        with open(output, "w", encoding="utf-8") as f:
+            dump_results(results, f)
+    return None
+
+
 if __name__ == "__main__":
     sys.exit(main())
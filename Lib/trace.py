@@ -393,10 +393,15 @@ def _find_executable_linenos(filename):
 class Trace:
     def __init__(self, count=1, trace=1, countfuncs=0, countcallers=0,
                  ignoremods=(), ignoredirs=(), infile=None, outfile=None,
-                 timing=False):
+                 timing=False, countonce=False):
         """
         @param count true iff it should count number of times each
                      line is executed
+        @param countonce true iff `count' should only record whether each
+                     line is executed, counting it once; this is much
+                     faster as it uses sys.monitoring and stops watching a
+                     line after its first execution.  Ignored if `trace'
+                     is true
         @param trace true iff it should print out each line that is
                      being counted
         @param countfuncs true iff it should just output a list of
@@ -421,6 +426,8 @@ def __init__(self, count=1, trace=1, countfuncs=0, countcallers=0,
         self._calledfuncs = {}
         self._callers = {}
         self._caller_cache = {}
+        self._monitoring = False
+        self._monitored_codes = []
         self.start_time = None
         if timing:
             self.start_time = _time()
@@ -434,6 +441,8 @@ def __init__(self, count=1, trace=1, countfuncs=0, countcallers=0,
         elif trace:
             self.globaltrace = self.globaltrace_lt
             self.localtrace = self.localtrace_trace
+        elif count and countonce:
+            self._monitoring = True
         elif count:
             self.globaltrace = self.globaltrace_lt
             self.localtrace = self.localtrace_count
@@ -449,27 +458,84 @@ def run(self, cmd):
     def runctx(self, cmd, globals=None, locals=None):
         if globals is None: globals = {}
         if locals is None: locals = {}
-        if not self.donothing:
+        if self._monitoring:
+            self._start_monitoring()
+        elif not self.donothing:
             threading.settrace(self.globaltrace)
             sys.settrace(self.globaltrace)
         try:
             exec(cmd, globals, locals)
         finally:
-            if not self.donothing:
+            if self._monitoring:
+                # Stop before calling a method, which would be recorded.
+                sys.monitoring.set_events(sys.monitoring.COVERAGE_ID, 0)
+                self._stop_monitoring()
+            elif not self.donothing:
                 sys.settrace(None)
                 threading.settrace(None)
 
     def runfunc(self, func, /, *args, **kw):
         result = None
-        if not self.donothing:
+        if self._monitoring:
+            self._start_monitoring()
+        elif not self.donothing:
             sys.settrace(self.globaltrace)
         try:
             result = func(*args, **kw)
         finally:
-            if not self.donothing:
+            if self._monitoring:
+                # Stop before calling a method, which would be recorded.
+                sys.monitoring.set_events(sys.monitoring.COVERAGE_ID, 0)
+                self._stop_monitoring()
+            elif not self.donothing:
                 sys.settrace(None)
         return result
 
+    def _start_monitoring(self):
+        """Start recording executed lines with sys.monitoring.
+
+        Line events are only enabled for the code objects that are not
+        ignored, when they start, and each line stops being monitored after
+        its first execution.  Monitoring covers all threads.
+        """
+        mon = sys.monitoring
+        tool = mon.COVERAGE_ID
+        mon.use_tool_id(tool, 'trace')
+        mon.register_callback(tool, mon.events.PY_START, self._monitor_start)
+        mon.register_callback(tool, mon.events.LINE, self._monitor_line)
+        mon.set_events(tool, mon.events.PY_START)
+
+    def _stop_monitoring(self):
+        mon = sys.monitoring
+        tool = mon.COVERAGE_ID
+        mon.set_events(tool, mon.events.NO_EVENTS)
+        # Re-instrument the code objects, so that the events disabled by
+        # this run fire again in the next one.  restart_events() would do
+        # it too, but for the events disabled by all the tools.
+        for code in self._monitored_codes:
+            mon.set_local_events(tool, code, mon.events.PY_START)
+            mon.set_local_events(tool, code, mon.events.NO_EVENTS)
+        self._monitored_codes.clear()
+        mon.register_callback(tool, mon.events.PY_START, None)
+        mon.register_callback(tool, mon.events.LINE, None)
+        mon.free_tool_id(tool)
+
+    def _monitor_start(self, code, instruction_offset):
+        # Same filtering as globaltrace_lt(), once per code object.
+        self._monitored_codes.append(code)
+        filename = sys._getframe(1).f_globals.get('__file__', None)
+        if filename:
+            modulename = _modname(filename)
+            if (modulename is not None
+                    and not self.ignore.names(filename, modulename)):
+                mon = sys.monitoring
+                mon.set_local_events(mon.COVERAGE_ID, code, mon.events.LINE)
+        return sys.monitoring.DISABLE
+
+    def _monitor_line(self, code, line_number):
+        self.counts[code.co_filename, line_number] = 1
+        return sys.monitoring.DISABLE
+
     def file_module_function_of(self, frame):
         code = frame.f_code
         filename = code.co_filename
@@ -618,6 +684,10 @@ def main():
                  'the counts to <module>.cover for each module executed, in '
                  'the module\'s directory. See also --coverdir, --file, '
                  '--no-report below.')
+    grp.add_argument('--count-once', action='store_true',
+            help='Like --count, but only record whether each line is '
+                 'executed rather than how many times. Much faster. '
+                 'Cannot be specified alongside --trace.')
     grp.add_argument('-t', '--trace', action='store_true',
             help='Print each line to sys.stdout before it is executed')
     grp.add_argument('-l', '--listfuncs', action='store_true',
@@ -695,6 +765,11 @@ def parse_ignore_dir(s):
         results = CoverageResults(infile=opts.file, outfile=opts.file)
         return results.write_results(opts.missing, opts.summary, opts.coverdir)
 
+    if opts.count_once:
+        if opts.trace:
+            parser.error('cannot specify both --count-once and --trace')
+        opts.count = True
+
     if not any([opts.trace, opts.count, opts.listfuncs, opts.trackcalls]):
         parser.error('must specify one of --trace, --count, --report, '
                      '--listfuncs, or --trackcalls')
@@ -711,7 +786,8 @@ def parse_ignore_dir(s):
     t = Trace(opts.count, opts.trace, countfuncs=opts.listfuncs,
               countcallers=opts.trackcalls, ignoremods=opts.ignore_module,
               ignoredirs=opts.ignore_dir, infile=opts.file,
-              outfile=opts.file, timing=opts.timing)
+              outfile=opts.file, timing=opts.timing,
+              countonce=opts.count_once)
     try:
         if opts.module:
             import runpy
@@ -8,6 +8,7 @@
 # Import types and functions implemented in C
 from _tracemalloc import *
 from _tracemalloc import _get_object_traceback, _get_traces
+from _tracemalloc import _get_checkpoint_diff
 
 
 def _format_size(size, sign):
@@ -558,3 +559,23 @@ def take_snapshot():
     traces = _get_traces()
     traceback_limit = get_traceback_limit()
     return Snapshot(traces, traceback_limit)
+
+
+def compare_to_checkpoint(limit=None, *, checkpoint=False):
+    """
+    Compute the differences with the last checkpoint() per traceback.
+
+    Get the limit (all if None) tracebacks whose memory changed the most as
+    a sorted list of StatisticDiff instances.  If checkpoint is true, take
+    a new checkpoint at the same time.
+    """
+    if limit is None:
+        limit = -1
+    elif limit < 0:
+        raise ValueError("limit must be a non-negative integer or None")
+    statistics = [StatisticDiff(Traceback(frames, total_nframe),
+                                size, size_diff, count, count_diff)
+                  for frames, total_nframe, size, size_diff, count, count_diff
+                  in _get_checkpoint_diff(limit, checkpoint)]
+    statistics.sort(reverse=True, key=StatisticDiff._sort_key)
+    return statistics
@@ -124,6 +124,7 @@ class BaseHandler:
     headers_sent = False
     headers = None
     bytes_sent = 0
+    chunked = False
 
     def run(self, application):
         """Invoke the application"""
@@ -211,7 +212,24 @@ def set_content_length(self):
             if blocks==1:
                 self.headers['Content-Length'] = str(self.bytes_sent)
                 return
-        # XXX Try for chunked encoding if origin server and client is 1.1
+        if self.client_accepts_chunked():
+            self.headers['Transfer-Encoding'] = 'chunked'
+            self.chunked = True
+
+    def client_accepts_chunked(self):
+        """True if the response body can use chunked transfer-coding
+
+        This requires an HTTP/1.1 origin server talking to an HTTP/1.1
+        client, and a response that has a body.  Results that are
+        transmitted with 'sendfile()' are never chunked.
+        """
+        return (self.origin_server and self.http_version >= "1.1"
+                and self.environ.get('SERVER_PROTOCOL', '').upper()
+                    == 'HTTP/1.1'
+                and self.environ.get('REQUEST_METHOD') != 'HEAD'
+                and self.status[:1] != '1'
+                and self.status[:3] not in ('204', '304')
+                and not self.result_is_file())
 
 
     def cleanup_headers(self):
@@ -295,7 +313,10 @@ def write(self, data):
             self.bytes_sent += len(data)
 
         # XXX check Content-Length and truncate if too many bytes written?
-        self._write(data)
+        if not self.chunked:
+            self._write(data)
+        elif data:
+            self._write(b'%x\r\n%s\r\n' % (len(data), data))
         self._flush()
 
 
@@ -327,6 +348,9 @@ def finish_content(self):
             # that HEAD requests can be satisfied properly, see #3839)
             self.headers.setdefault('Content-Length', "0")
             self.send_headers()
+        elif self.chunked:
+            self._write(b'0\r\n\r\n')
+            self._flush()
         else:
             pass # XXX check if content-length was too short?
 
@@ -341,6 +365,7 @@ def close(self):
         finally:
             self.result = self.headers = self.status = self.environ = None
             self.bytes_sent = 0; self.headers_sent = False
+            self.chunked = False
 
 
     def send_headers(self):
@@ -11,13 +11,15 @@
 """
 
 from http.server import BaseHTTPRequestHandler, HTTPServer
+import socketserver
 import sys
 import urllib.parse
 from wsgiref.handlers import SimpleHandler
 from platform import python_implementation
 
 __version__ = "0.2"
-__all__ = ['WSGIServer', 'WSGIRequestHandler', 'demo_app', 'make_server']
+__all__ = ['WSGIServer', 'ThreadingWSGIServer', 'WSGIRequestHandler',
+           'demo_app', 'make_server']
 
 
 server_version = "WSGIServer/" + __version__
@@ -29,6 +31,48 @@ class ServerHandler(SimpleHandler):
 
     server_software = software_version
 
+    def __init__(self, *args, **kwargs):
+        SimpleHandler.__init__(self, *args, **kwargs)
+        self._buffer = []
+
+    def finish_response(self):
+        result = self.result
+        if (type(result) in (list, tuple) and len(result) > 1
+                and all(type(data) is bytes for data in result)):
+            # Every block is already available, so joining them delays
+            # nothing and lets the response carry a Content-Length.
+            self.result = [b''.join(result)]
+        SimpleHandler.finish_response(self)
+
+    def cleanup_headers(self):
+        SimpleHandler.cleanup_headers(self)
+        request_handler = self.request_handler
+        if 'Content-Length' not in self.headers and not self.chunked:
+            # The end of the body can only be signalled by closing
+            request_handler.close_connection = True
+        if request_handler.close_connection:
+            if self.http_version >= "1.1":
+                self.headers.setdefault('Connection', 'close')
+        elif request_handler.request_version == 'HTTP/1.0':
+            self.headers.setdefault('Connection', 'keep-alive')
+
+    def finish_content(self):
+        SimpleHandler.finish_content(self)
+        # The headers of a response without a body are still buffered
+        self._flush()
+
+    def _write(self, data):
+        # Collect the status line, headers and data written between two
+        # flushes, so that they go out in a single send.
+        self._buffer.append(data)
+
+    def _flush(self):
+        if self._buffer:
+            data = b''.join(self._buffer)
+            self._buffer.clear()
+            SimpleHandler._write(self, data)
+        self.stdout.flush()
+
     def close(self):
         try:
             self.request_handler.log_request(
@@ -68,6 +112,68 @@ def set_app(self,application):
 
 
 
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+
+    """WSGIServer that handles each connection in a separate thread"""
+
+    daemon_threads = True
+
+
+
+class _InputStream:
+
+    """Request body stream that stops at the end of the body
+
+    Used for persistent connections, so that reading the body of one
+    request never consumes the next request on the connection.
+    """
+
+    def __init__(self, rfile, length):
+        self.rfile = rfile
+        self.remaining = length
+
+    def _limit(self, size):
+        if size is None or size < 0 or size > self.remaining:
+            return self.remaining
+        return size
+
+    def read(self, size=-1):
+        data = self.rfile.read(self._limit(size))
+        self.remaining -= len(data)
+        return data
+
+    def readline(self, size=-1):
+        size = self._limit(size)
+        if not size:
+            return b''
+        data = self.rfile.readline(size)
+        self.remaining -= len(data)
+        return data
+
+    def readlines(self, hint=-1):
+        lines = []
+        total = 0
+        for line in self:
+            lines.append(line)
+            total += len(line)
+            if 0 < hint <= total:
+                break
+        return lines
+
+    def __iter__(self):
+        while line := self.readline():
+            yield line
+
+    def discard(self, limit):
+        """Skip the rest of the body; return False if it is over limit"""
+        if self.remaining > limit:
+            return False
+        while self.remaining and self.read(self.remaining):
+            pass
+        return not self.remaining
+
+
+
 class WSGIRequestHandler(BaseHTTPRequestHandler):
 
     server_version = "WSGIServer/" + __version__
@@ -108,27 +214,55 @@ def get_environ(self):
     def get_stderr(self):
         return sys.stderr
 
-    def handle(self):
+    def handle_one_request(self):
         """Handle a single HTTP request"""
 
-        self.raw_requestline = self.rfile.readline(65537)
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+        except TimeoutError as e:
+            self.log_error("Request timed out: %r", e)
+            self.close_connection = True
+            return
         if len(self.raw_requestline) > 65536:
             self.requestline = ''
             self.request_version = ''
             self.command = ''
             self.send_error(414)
             return
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
 
         if not self.parse_request(): # An error code has been sent, just exit
             return
 
+        environ = self.get_environ()
+        stdin = self.rfile
+        try:
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or 'Transfer-Encoding' in self.headers:
+            # We can't tell where the request body ends
+            self.close_connection = True
+        elif environ.get('CONTENT_LENGTH') or not self.close_connection:
+            stdin = _InputStream(self.rfile, length)
+
         handler = ServerHandler(
-            self.rfile, self.wfile, self.get_stderr(), self.get_environ(),
-            multithread=False,
+            stdin, self.wfile, self.get_stderr(), environ,
+            multithread=isinstance(self.server, socketserver.ThreadingMixIn),
         )
         handler.request_handler = self      # backpointer for logging
+        if self.protocol_version >= "HTTP/1.1":
+            handler.http_version = "1.1"
         handler.run(self.server.get_app())
 
+        # run() only resets the handler once a complete response was sent
+        if handler.status is not None:
+            self.close_connection = True
+        elif not self.close_connection and not stdin.discard(65536):
+            self.close_connection = True
+
 
 
 def demo_app(environ,start_response):
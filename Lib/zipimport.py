@@ -393,6 +393,7 @@ def _read_directory(archive):
                 central_directory_size = _unpack_uint64(buffer[40:48])
                 central_directory_position = _unpack_uint64(buffer[48:56])
                 num_entries = _unpack_uint64(buffer[24:32])
+                end_record = data[pos64:]
             elif pos >= 0:
                 buffer = data[pos:pos+END_CENTRAL_DIR_SIZE]
                 if len(buffer) != END_CENTRAL_DIR_SIZE:
@@ -406,6 +407,7 @@ def _read_directory(archive):
                 central_directory_size = _unpack_uint32(buffer[12:16])
                 central_directory_position = _unpack_uint32(buffer[16:20])
                 num_entries = _unpack_uint16(buffer[8:10])
+                end_record = data[pos:]
 
                 # N.b. if someday you want to prefer the standard (non-zip64) EOCD,
                 # you need to adjust position by 76 for arc to be 0.
@@ -429,6 +431,24 @@ def _read_directory(archive):
             if arc_offset < 0:
                 raise ZipImportError(f'bad central directory size or offset: {archive!r}', path=archive)
 
+            # The end of central directory record and the archive's size and
+            # modification time validate a persistent copy of the directory.
+            index_path = _directory_index_path(archive)
+            if index_path is not None:
+                try:
+                    mtime = _bootstrap_external._path_stat(archive).st_mtime
+                except OSError:
+                    index_path = None
+                else:
+                    stamp = (_DIRECTORY_INDEX_VERSION, archive, mtime,
+                             file_size, end_record)
+                    files = _read_directory_index(index_path, stamp)
+                    if files is not None:
+                        _bootstrap._verbose_message(
+                            'zipimport: found {} names in {!r} (indexed)',
+                            len(files), archive)
+                        return files
+
             files = {}
             # Start of Central Directory
             count = 0
@@ -554,8 +574,43 @@ def _read_directory(archive):
         finally:
             fp.seek(start_offset)
     _bootstrap._verbose_message('zipimport: found {} names in {!r}', count, archive)
+    if index_path is not None:
+        _write_directory_index(index_path, stamp, files)
     return files
 
+
+# When the PYTHONIMPORTINDEX environment variable names a directory, the
+# parsed central directory of each archive is stored there, so that later
+# processes can skip decoding every entry of a large archive.
+_DIRECTORY_INDEX_VERSION = 1
+
+def _directory_index_path(archive):
+    directory = _bootstrap_external._import_index_dir()
+    if directory is None:
+        return None
+    key = _bootstrap_external._path_abspath(archive)
+    key = key.encode('utf-8', 'surrogatepass')
+    digest = _imp.source_hash(_bootstrap_external._RAW_MAGIC_NUMBER, key).hex()
+    return _bootstrap_external._path_join(directory, f'zipindex.{digest}')
+
+def _read_directory_index(index_path, stamp):
+    try:
+        with _io.FileIO(index_path, 'r') as file:
+            data = marshal.loads(file.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (type(data) is tuple and len(data) == 2 and data[0] == stamp
+            and type(data[1]) is dict):
+        return data[1]
+    return None
+
+def _write_directory_index(index_path, stamp, files):
+    try:
+        _bootstrap_external._write_atomic(index_path,
+                                          marshal.dumps((stamp, files)))
+    except OSError:
+        pass
+
 # During bootstrap, we may need to load the encodings
 # package from a ZIP file. But the cp437 encoding is implemented
 # in Python in the encodings package.
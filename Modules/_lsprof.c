@@ -35,13 +35,23 @@ typedef struct _ProfilerEntry {
     long recursivecallcount; /* how many times called recursively */
     long recursionLevel;
     rotating_node_t *calls;
+    rotating_node_t *lines; /* ProfilerLineEntry's if lines are profiled */
 } ProfilerEntry;
 
+/* represents a line of a code object whose lines are profiled */
+typedef struct _ProfilerLineEntry {
+    rotating_node_t header;  /* the key is the line number */
+    PyTime_t tt; /* time from the start of the line to the start of the next */
+    long hits; /* how many times the line started */
+} ProfilerLineEntry;
+
 typedef struct _ProfilerContext {
     PyTime_t t0;
     PyTime_t subt;
     struct _ProfilerContext *previous;
     ProfilerEntry *ctxEntry;
+    int lineno; /* the current line, -1 if unknown or not profiled */
+    PyTime_t line_t0; /* when the current line started */
 } ProfilerContext;
 
 typedef struct {
@@ -54,6 +64,7 @@ typedef struct {
     double externalTimerUnit;
     int tool_id;
     PyObject* missing;
+    PyObject *line_codes; /* set of the code objects whose lines are profiled */
 } ProfilerObject;
 
 #define POF_ENABLED     0x001
@@ -221,6 +232,7 @@ newProfilerEntry(ProfilerObject *pObj, void *key, PyObject *userObj)
     self->recursivecallcount = 0;
     self->recursionLevel = 0;
     self->calls = EMPTY_ROTATING_TREE;
+    self->lines = EMPTY_ROTATING_TREE;
     RotatingTree_Add(&pObj->profilerEntries, &self->header);
     return self;
 }
@@ -257,6 +269,26 @@ newSubEntry(ProfilerObject *pObj,  ProfilerEntry *caller, ProfilerEntry* entry)
     return self;
 }
 
+static ProfilerLineEntry *
+getLineEntry(ProfilerObject *pObj, ProfilerEntry *entry, int lineno)
+{
+    void *key = (void *)(uintptr_t)lineno;
+    ProfilerLineEntry *self;
+    self = (ProfilerLineEntry*) RotatingTree_Get(&entry->lines, key);
+    if (self != NULL)
+        return self;
+    self = (ProfilerLineEntry*) PyMem_Malloc(sizeof(ProfilerLineEntry));
+    if (self == NULL) {
+        pObj->flags |= POF_NOMEMORY;
+        return NULL;
+    }
+    self->header.key = key;
+    self->tt = 0;
+    self->hits = 0;
+    RotatingTree_Add(&entry->lines, &self->header);
+    return self;
+}
+
 static int freeSubEntry(rotating_node_t *header, void *arg)
 {
     ProfilerSubEntry *subentry = (ProfilerSubEntry*) header;
@@ -264,10 +296,17 @@ static int freeSubEntry(rotating_node_t *header, void *arg)
     return 0;
 }
 
+static int freeLineEntry(rotating_node_t *header, void *arg)
+{
+    PyMem_Free(header);
+    return 0;
+}
+
 static int freeEntry(rotating_node_t *header, void *arg)
 {
     ProfilerEntry *entry = (ProfilerEntry*) header;
     RotatingTree_Enum(entry->calls, freeSubEntry, NULL);
+    RotatingTree_Enum(entry->lines, freeLineEntry, NULL);
     Py_DECREF(entry->userObj);
     PyMem_Free(entry);
     return 0;
@@ -295,6 +334,7 @@ initContext(ProfilerObject *pObj, ProfilerContext *self, ProfilerEntry *entry)
 {
     self->ctxEntry = entry;
     self->subt = 0;
+    self->lineno = -1;
     self->previous = pObj->currentProfilerContext;
     pObj->currentProfilerContext = self;
     ++entry->recursionLevel;
@@ -310,10 +350,25 @@ initContext(ProfilerObject *pObj, ProfilerContext *self, ProfilerEntry *entry)
     self->t0 = call_timer(pObj);
 }
 
+/* account the time since the start of the current line of a context */
+static void
+flushLine(ProfilerObject *pObj, ProfilerContext *self, PyTime_t now)
+{
+    ProfilerLineEntry *lineEntry = getLineEntry(pObj, self->ctxEntry,
+                                                self->lineno);
+    if (lineEntry) {
+        lineEntry->tt += now - self->line_t0;
+        lineEntry->hits++;
+    }
+}
+
 static void
 Stop(ProfilerObject *pObj, ProfilerContext *self, ProfilerEntry *entry)
 {
-    PyTime_t tt = call_timer(pObj) - self->t0;
+    PyTime_t now = call_timer(pObj);
+    PyTime_t tt = now - self->t0;
+    if (self->lineno >= 0)
+        flushLine(pObj, self, now);
     PyTime_t it = tt - self->subt;
     if (self->previous)
         self->previous->subt += tt;
@@ -426,6 +481,7 @@ static PyStructSequence_Field profiler_entry_fields[] = {
     {"totaltime",    "total time in this entry"},
     {"inlinetime",   "inline time in this entry (not in subcalls)"},
     {"calls",        "details of the calls"},
+    {"lines",        "details of the profiled lines"},
     {0}
 };
 
@@ -455,6 +511,7 @@ static PyStructSequence_Desc profiler_subentry_desc = {
 typedef struct {
     PyObject *list;
     PyObject *sublist;
+    PyObject *linelist;
     double factor;
     _lsprof_state *state;
 } statscollector_t;
@@ -480,6 +537,23 @@ static int statsForSubEntry(rotating_node_t *node, void *arg)
     return err;
 }
 
+static int statsForLineEntry(rotating_node_t *node, void *arg)
+{
+    ProfilerLineEntry *lentry = (ProfilerLineEntry*) node;
+    statscollector_t *collect = (statscollector_t*) arg;
+    int err;
+    PyObject *linfo;
+    linfo = Py_BuildValue("(ild)",
+                          (int)(uintptr_t)lentry->header.key,
+                          lentry->hits,
+                          collect->factor * lentry->tt);
+    if (linfo == NULL)
+        return -1;
+    err = PyList_Append(collect->linelist, linfo);
+    Py_DECREF(linfo);
+    return err;
+}
+
 static int statsForEntry(rotating_node_t *node, void *arg)
 {
     ProfilerEntry *entry = (ProfilerEntry*) node;
@@ -503,15 +577,34 @@ static int statsForEntry(rotating_node_t *node, void *arg)
         collect->sublist = Py_NewRef(Py_None);
     }
 
+    if (entry->lines != EMPTY_ROTATING_TREE) {
+        collect->linelist = PyList_New(0);
+        if (collect->linelist == NULL) {
+            Py_DECREF(collect->sublist);
+            return -1;
+        }
+        if (RotatingTree_Enum(entry->lines,
+                              statsForLineEntry, collect) != 0) {
+            Py_DECREF(collect->sublist);
+            Py_DECREF(collect->linelist);
+            return -1;
+        }
+    }
+    else {
+        collect->linelist = Py_NewRef(Py_None);
+    }
+
     info = PyObject_CallFunction((PyObject*) collect->state->stats_entry_type,
-                                 "((OllddO))",
+                                 "((OllddOO))",
                                  entry->userObj,
                                  entry->callcount,
                                  entry->recursivecallcount,
                                  collect->factor * entry->tt,
                                  collect->factor * entry->it,
-                                 collect->sublist);
+                                 collect->sublist,
+                                 collect->linelist);
     Py_DECREF(collect->sublist);
+    Py_DECREF(collect->linelist);
     if (info == NULL)
         return -1;
     err = PyList_Append(collect->list, info);
@@ -538,6 +631,7 @@ following attributes:
     totaltime     total time in this entry
     inlinetime    inline time in this entry (not in subcalls)
     calls         details of the calls
+    lines         details of the profiled lines
 
 The calls attribute is either None or a list of
 profiler_subentry objects:
@@ -547,11 +641,16 @@ profiler_subentry objects:
     reccallcount  how many times this is called recursively
     totaltime     total time spent in this call
     inlinetime    inline time (not in further subcalls)
+
+The lines attribute is None unless the lines of the code object
+were profiled, see profile_lines(), and a list of (lineno, hits,
+time) tuples otherwise.  The lines attribute is not part of the
+tuple.
 [clinic start generated code]*/
 
 static PyObject *
 _lsprof_Profiler_getstats_impl(ProfilerObject *self, PyTypeObject *cls)
-/*[clinic end generated code: output=1806ef720019ee03 input=445e193ef4522902]*/
+/*[clinic end generated code: output=1806ef720019ee03 input=767b0c04ae0fae8b]*/
 {
     statscollector_t collect;
     collect.state = _PyType_GetModuleState(cls);
@@ -676,6 +775,134 @@ PyObject* creturn_callback(ProfilerObject* self, PyObject *const *args, Py_ssize
     Py_RETURN_NONE;
 }
 
+PyObject* line_callback(ProfilerObject* self, PyObject *const *args, Py_ssize_t size)
+{
+    PyObject* code = args[0];
+    ProfilerContext *pContext = self->currentProfilerContext;
+
+    /* Ignore the lines of a frame entered before enabling the profiler */
+    if (pContext && pContext->ctxEntry->header.key == (void *)code) {
+        int lineno = PyLong_AsInt(args[1]);
+        if (lineno == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+        PyTime_t now = call_timer(self);
+        if (pContext->lineno >= 0) {
+            flushLine(self, pContext, now);
+        }
+        pContext->lineno = lineno;
+        pContext->line_t0 = now;
+    }
+    Py_RETURN_NONE;
+}
+
+/* Set the local events of all the code objects whose lines are profiled */
+static int
+set_line_events(ProfilerObject *self, PyObject *monitoring, int events)
+{
+    if (self->line_codes == NULL) {
+        return 0;
+    }
+    PyObject *it = PyObject_GetIter(self->line_codes);
+    if (it == NULL) {
+        return -1;
+    }
+    PyObject *code;
+    while ((code = PyIter_Next(it)) != NULL) {
+        PyObject *result = PyObject_CallMethod(monitoring, "set_local_events",
+                                               "iOi", self->tool_id, code,
+                                               events);
+        Py_DECREF(code);
+        if (result == NULL) {
+            Py_DECREF(it);
+            return -1;
+        }
+        Py_DECREF(result);
+    }
+    Py_DECREF(it);
+    return PyErr_Occurred() ? -1 : 0;
+}
+
+static int
+enable_line_events(ProfilerObject *self, PyObject *monitoring)
+{
+    PyObject* callback = PyObject_GetAttrString((PyObject*)self, "_line_callback");
+    if (!callback) {
+        return -1;
+    }
+    PyObject *result = PyObject_CallMethod(monitoring, "register_callback", "iiO",
+                                           self->tool_id,
+                                           (1 << PY_MONITORING_EVENT_LINE),
+                                           callback);
+    Py_DECREF(callback);
+    if (result == NULL) {
+        return -1;
+    }
+    Py_DECREF(result);
+    return set_line_events(self, monitoring, 1 << PY_MONITORING_EVENT_LINE);
+}
+
+/*[clinic input]
+_lsprof.Profiler.profile_lines
+
+    code: object
+    /
+
+Profile the lines of a code object or a function.
+
+Record how many times each line of the code starts and the time from
+its start to the start of the next line or the end of the call.
+The results are in the lines attribute of the entries of getstats().
+[clinic start generated code]*/
+
+static PyObject *
+_lsprof_Profiler_profile_lines(ProfilerObject *self, PyObject *code)
+/*[clinic end generated code: output=e3b443fe0b60a60a input=e139cab5031a8bea]*/
+{
+    PyObject *co;
+    if (PyCode_Check(code)) {
+        co = Py_NewRef(code);
+    }
+    else {
+        if (PyObject_GetOptionalAttrString(code, "__code__", &co) < 0) {
+            return NULL;
+        }
+        if (co == NULL || !PyCode_Check(co)) {
+            Py_XDECREF(co);
+            PyErr_Format(PyExc_TypeError,
+                         "expected a code object or a function, not %T",
+                         code);
+            return NULL;
+        }
+    }
+    if (self->line_codes == NULL) {
+        self->line_codes = PySet_New(NULL);
+        if (self->line_codes == NULL) {
+            Py_DECREF(co);
+            return NULL;
+        }
+    }
+    if (PySet_Add(self->line_codes, co) < 0) {
+        Py_DECREF(co);
+        return NULL;
+    }
+    Py_DECREF(co);
+
+    if (self->flags & POF_ENABLED) {
+        /* The callback may not be registered yet */
+        PyObject* monitoring = _PyImport_GetModuleAttrString("sys", "monitoring");
+        if (!monitoring) {
+            return NULL;
+        }
+        int err = enable_line_events(self, monitoring);
+        Py_DECREF(monitoring);
+        if (err < 0) {
+            return NULL;
+        }
+    }
+    Py_RETURN_NONE;
+}
+
 static const struct {
     int event;
     const char* callback_method;
@@ -746,6 +973,11 @@ profiler_enable(ProfilerObject *self, PyObject *args, PyObject *kwds)
         return NULL;
     }
 
+    if (self->line_codes != NULL && enable_line_events(self, monitoring) < 0) {
+        Py_DECREF(monitoring);
+        return NULL;
+    }
+
     Py_DECREF(monitoring);
 
     self->flags |= POF_ENABLED;
@@ -802,6 +1034,20 @@ profiler_disable(ProfilerObject *self, PyObject* noarg)
         }
         Py_DECREF(result);
 
+        if (self->line_codes != NULL) {
+            result = PyObject_CallMethod(monitoring, "register_callback", "iiO", self->tool_id,
+                                         (1 << PY_MONITORING_EVENT_LINE), Py_None);
+            if (!result) {
+                Py_DECREF(monitoring);
+                return NULL;
+            }
+            Py_DECREF(result);
+            if (set_line_events(self, monitoring, 0) < 0) {
+                Py_DECREF(monitoring);
+                return NULL;
+            }
+        }
+
         result = PyObject_CallMethod(monitoring, "free_tool_id", "i", self->tool_id);
         if (!result) {
             Py_DECREF(monitoring);
@@ -838,6 +1084,7 @@ static int
 profiler_traverse(ProfilerObject *op, visitproc visit, void *arg)
 {
     Py_VISIT(Py_TYPE(op));
+    Py_VISIT(op->line_codes);
     return 0;
 }
 
@@ -855,6 +1102,7 @@ profiler_dealloc(ProfilerObject *op)
     flush_unmatched(op);
     clearEntries(op);
     Py_XDECREF(op->externalTimer);
+    Py_XDECREF(op->line_codes);
     PyTypeObject *tp = Py_TYPE(op);
     tp->tp_free(op);
     Py_DECREF(tp);
@@ -896,6 +1144,7 @@ profiler_init(ProfilerObject *pObj, PyObject *args, PyObject *kw)
 
 static PyMethodDef profiler_methods[] = {
     _LSPROF_PROFILER_GETSTATS_METHODDEF
+    _LSPROF_PROFILER_PROFILE_LINES_METHODDEF
     {"enable",             _PyCFunction_CAST(profiler_enable),
                     METH_VARARGS | METH_KEYWORDS,       enable_doc},
     {"disable",            (PyCFunction)profiler_disable,
@@ -910,6 +1159,8 @@ static PyMethodDef profiler_methods[] = {
                     METH_FASTCALL,                       NULL},
     {"_creturn_callback", _PyCFunction_CAST(creturn_callback),
                     METH_FASTCALL,                       NULL},
+    {"_line_callback",     _PyCFunction_CAST(line_callback),
+                    METH_FASTCALL,                       NULL},
     {NULL, NULL}
 };
 
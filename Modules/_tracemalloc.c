@@ -185,6 +185,50 @@ _tracemalloc_reset_peak_impl(PyObject *module)
 }
 
 
+/*[clinic input]
+_tracemalloc.checkpoint
+
+Take a checkpoint of the memory allocated per traceback.
+
+Start tracking the size and the number of memory blocks allocated at
+each traceback, and record them as the reference of later comparisons.
+[clinic start generated code]*/
+
+static PyObject *
+_tracemalloc_checkpoint_impl(PyObject *module)
+/*[clinic end generated code: output=076d28bcd09c0211 input=92d3be7e1c36e411]*/
+{
+    if (_PyTraceMalloc_Checkpoint() < 0) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+
+/*[clinic input]
+_tracemalloc._get_checkpoint_diff
+
+    limit: Py_ssize_t
+    checkpoint: bool
+    /
+
+Get the tracebacks whose memory changed the most since the last checkpoint.
+
+Return a list of at most limit (all of them if limit is negative)
+(traceback: tuple, total_nframe: int, size: int, size_diff: int,
+count: int, count_diff: int) tuples, sorted by decreasing absolute size
+difference.  Take a new checkpoint if checkpoint is true.
+[clinic start generated code]*/
+
+static PyObject *
+_tracemalloc__get_checkpoint_diff_impl(PyObject *module, Py_ssize_t limit,
+                                       int checkpoint)
+/*[clinic end generated code: output=175d598583b862eb input=69f980abfe4ec222]*/
+{
+    return _PyTraceMalloc_GetCheckpointDiff(limit, checkpoint);
+}
+
+
 static PyMethodDef module_methods[] = {
     _TRACEMALLOC_IS_TRACING_METHODDEF
     _TRACEMALLOC_CLEAR_TRACES_METHODDEF
@@ -196,6 +240,8 @@ static PyMethodDef module_methods[] = {
     _TRACEMALLOC_GET_TRACEMALLOC_MEMORY_METHODDEF
     _TRACEMALLOC_GET_TRACED_MEMORY_METHODDEF
     _TRACEMALLOC_RESET_PEAK_METHODDEF
+    _TRACEMALLOC_CHECKPOINT_METHODDEF
+    _TRACEMALLOC__GET_CHECKPOINT_DIFF_METHODDEF
     /* sentinel */
     {NULL, NULL}
 };
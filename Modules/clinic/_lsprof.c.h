@@ -20,6 +20,7 @@ PyDoc_STRVAR(_lsprof_Profiler_getstats__doc__,
 "    totaltime     total time in this entry\n"
 "    inlinetime    inline time in this entry (not in subcalls)\n"
 "    calls         details of the calls\n"
+"    lines         details of the profiled lines\n"
 "\n"
 "The calls attribute is either None or a list of\n"
 "profiler_subentry objects:\n"
@@ -28,7 +29,12 @@ PyDoc_STRVAR(_lsprof_Profiler_getstats__doc__,
 "    callcount     how many times this is called\n"
 "    reccallcount  how many times this is called recursively\n"
 "    totaltime     total time spent in this call\n"
-"    inlinetime    inline time (not in further subcalls)");
+"    inlinetime    inline time (not in further subcalls)\n"
+"\n"
+"The lines attribute is None unless the lines of the code object\n"
+"were profiled, see profile_lines(), and a list of (lineno, hits,\n"
+"time) tuples otherwise.  The lines attribute is not part of the\n"
+"tuple.");
 
 #define _LSPROF_PROFILER_GETSTATS_METHODDEF    \
     {"getstats", _PyCFunction_CAST(_lsprof_Profiler_getstats), METH_METHOD|METH_FASTCALL|METH_KEYWORDS, _lsprof_Profiler_getstats__doc__},
@@ -45,4 +51,17 @@ _lsprof_Profiler_getstats(ProfilerObject *self, PyTypeObject *cls, PyObject *con
     }
     return _lsprof_Profiler_getstats_impl(self, cls);
 }
-/*[clinic end generated code: output=5c9d87d89863dc83 input=a9049054013a1b77]*/
+
+PyDoc_STRVAR(_lsprof_Profiler_profile_lines__doc__,
+"profile_lines($self, code, /)\n"
+"--\n"
+"\n"
+"Profile the lines of a code object or a function.\n"
+"\n"
+"Record how many times each line of the code starts and the time from\n"
+"its start to the start of the next line or the end of the call.\n"
+"The results are in the lines attribute of the entries of getstats().");
+
+#define _LSPROF_PROFILER_PROFILE_LINES_METHODDEF    \
+    {"profile_lines", (PyCFunction)_lsprof_Profiler_profile_lines, METH_O, _lsprof_Profiler_profile_lines__doc__},
+/*[clinic end generated code: output=ff1f2fc1283a8407 input=a9049054013a1b77]*/
@@ -2,6 +2,7 @@
 preserve
 [clinic start generated code]*/
 
+#include "pycore_abstract.h"      // _PyNumber_Index()
 #include "pycore_modsupport.h"    // _PyArg_CheckPositional()
 
 PyDoc_STRVAR(_tracemalloc_is_tracing__doc__,
@@ -214,4 +215,75 @@ _tracemalloc_reset_peak(PyObject *module, PyObject *Py_UNUSED(ignored))
 {
     return _tracemalloc_reset_peak_impl(module);
 }
-/*[clinic end generated code: output=9d4d884b156c2ddb input=a9049054013a1b77]*/
+
+PyDoc_STRVAR(_tracemalloc_checkpoint__doc__,
+"checkpoint($module, /)\n"
+"--\n"
+"\n"
+"Take a checkpoint of the memory allocated per traceback.\n"
+"\n"
+"Start tracking the size and the number of memory blocks allocated at\n"
+"each traceback, and record them as the reference of later comparisons.");
+
+#define _TRACEMALLOC_CHECKPOINT_METHODDEF    \
+    {"checkpoint", (PyCFunction)_tracemalloc_checkpoint, METH_NOARGS, _tracemalloc_checkpoint__doc__},
+
+static PyObject *
+_tracemalloc_checkpoint_impl(PyObject *module);
+
+static PyObject *
+_tracemalloc_checkpoint(PyObject *module, PyObject *Py_UNUSED(ignored))
+{
+    return _tracemalloc_checkpoint_impl(module);
+}
+
+PyDoc_STRVAR(_tracemalloc__get_checkpoint_diff__doc__,
+"_get_checkpoint_diff($module, limit, checkpoint, /)\n"
+"--\n"
+"\n"
+"Get the tracebacks whose memory changed the most since the last checkpoint.\n"
+"\n"
+"Return a list of at most limit (all of them if limit is negative)\n"
+"(traceback: tuple, total_nframe: int, size: int, size_diff: int,\n"
+"count: int, count_diff: int) tuples, sorted by decreasing absolute size\n"
+"difference.  Take a new checkpoint if checkpoint is true.");
+
+#define _TRACEMALLOC__GET_CHECKPOINT_DIFF_METHODDEF    \
+    {"_get_checkpoint_diff", _PyCFunction_CAST(_tracemalloc__get_checkpoint_diff), METH_FASTCALL, _tracemalloc__get_checkpoint_diff__doc__},
+
+static PyObject *
+_tracemalloc__get_checkpoint_diff_impl(PyObject *module, Py_ssize_t limit,
+                                       int checkpoint);
+
+static PyObject *
+_tracemalloc__get_checkpoint_diff(PyObject *module, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    Py_ssize_t limit;
+    int checkpoint;
+
+    if (!_PyArg_CheckPositional("_get_checkpoint_diff", nargs, 2, 2)) {
+        goto exit;
+    }
+    {
+        Py_ssize_t ival = -1;
+        PyObject *iobj = _PyNumber_Index(args[0]);
+        if (iobj != NULL) {
+            ival = PyLong_AsSsize_t(iobj);
+            Py_DECREF(iobj);
+        }
+        if (ival == -1 && PyErr_Occurred()) {
+            goto exit;
+        }
+        limit = ival;
+    }
+    checkpoint = PyObject_IsTrue(args[1]);
+    if (checkpoint < 0) {
+        goto exit;
+    }
+    return_value = _tracemalloc__get_checkpoint_diff_impl(module, limit, checkpoint);
+
+exit:
+    return return_value;
+}
+/*[clinic end generated code: output=926329e588dcac06 input=a9049054013a1b77]*/
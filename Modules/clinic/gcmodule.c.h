@@ -585,4 +585,65 @@ gc_get_freeze_count(PyObject *module, PyObject *Py_UNUSED(ignored))
 exit:
     return return_value;
 }
-/*[clinic end generated code: output=0a7e91917adcb937 input=a9049054013a1b77]*/
+
+PyDoc_STRVAR(gc_enable_type_stats__doc__,
+"enable_type_stats($module, /)\n"
+"--\n"
+"\n"
+"Tally the objects tracked by the collector by type during the collections.\n"
+"\n"
+"The statistics are returned by get_type_stats().");
+
+#define GC_ENABLE_TYPE_STATS_METHODDEF    \
+    {"enable_type_stats", (PyCFunction)gc_enable_type_stats, METH_NOARGS, gc_enable_type_stats__doc__},
+
+static PyObject *
+gc_enable_type_stats_impl(PyObject *module);
+
+static PyObject *
+gc_enable_type_stats(PyObject *module, PyObject *Py_UNUSED(ignored))
+{
+    return gc_enable_type_stats_impl(module);
+}
+
+PyDoc_STRVAR(gc_disable_type_stats__doc__,
+"disable_type_stats($module, /)\n"
+"--\n"
+"\n"
+"Stop tallying the objects by type and clear the statistics.");
+
+#define GC_DISABLE_TYPE_STATS_METHODDEF    \
+    {"disable_type_stats", (PyCFunction)gc_disable_type_stats, METH_NOARGS, gc_disable_type_stats__doc__},
+
+static PyObject *
+gc_disable_type_stats_impl(PyObject *module);
+
+static PyObject *
+gc_disable_type_stats(PyObject *module, PyObject *Py_UNUSED(ignored))
+{
+    return gc_disable_type_stats_impl(module);
+}
+
+PyDoc_STRVAR(gc_get_type_stats__doc__,
+"get_type_stats($module, /)\n"
+"--\n"
+"\n"
+"Return the number and size of the tracked objects by type.\n"
+"\n"
+"Return a dict mapping the fully qualified names of the types to\n"
+"(count, size) tuples, as of the last complete collection cycle.\n"
+"The dict is empty if no cycle was completed since enable_type_stats()\n"
+"was called.");
+
+#define GC_GET_TYPE_STATS_METHODDEF    \
+    {"get_type_stats", (PyCFunction)gc_get_type_stats, METH_NOARGS, gc_get_type_stats__doc__},
+
+static PyObject *
+gc_get_type_stats_impl(PyObject *module);
+
+static PyObject *
+gc_get_type_stats(PyObject *module, PyObject *Py_UNUSED(ignored))
+{
+    return gc_get_type_stats_impl(module);
+}
+/*[clinic end generated code: output=0fec6f1bee026c27 input=a9049054013a1b77]*/
@@ -461,6 +461,60 @@ gc_get_freeze_count_impl(PyObject *module)
     return _PyGC_GetFreezeCount(interp);
 }
 
+/*[clinic input]
+gc.enable_type_stats
+
+Tally the objects tracked by the collector by type during the collections.
+
+The statistics are returned by get_type_stats().
+[clinic start generated code]*/
+
+static PyObject *
+gc_enable_type_stats_impl(PyObject *module)
+/*[clinic end generated code: output=71bb625ec83b121a input=e891a70bb6bb444f]*/
+
+{
+    PyInterpreterState *interp = _PyInterpreterState_GET();
+    _PyGC_EnableTypeStats(interp, 1);
+    Py_RETURN_NONE;
+}
+
+/*[clinic input]
+gc.disable_type_stats
+
+Stop tallying the objects by type and clear the statistics.
+[clinic start generated code]*/
+
+static PyObject *
+gc_disable_type_stats_impl(PyObject *module)
+/*[clinic end generated code: output=6f388d70106a3441 input=6c327cad26824a8f]*/
+
+{
+    PyInterpreterState *interp = _PyInterpreterState_GET();
+    _PyGC_EnableTypeStats(interp, 0);
+    Py_RETURN_NONE;
+}
+
+/*[clinic input]
+gc.get_type_stats
+
+Return the number and size of the tracked objects by type.
+
+Return a dict mapping the fully qualified names of the types to
+(count, size) tuples, as of the last complete collection cycle.
+The dict is empty if no cycle was completed since enable_type_stats()
+was called.
+[clinic start generated code]*/
+
+static PyObject *
+gc_get_type_stats_impl(PyObject *module)
+/*[clinic end generated code: output=0b3722d9e96650ea input=90f637ab6b283d37]*/
+
+{
+    PyInterpreterState *interp = _PyInterpreterState_GET();
+    return _PyGC_GetTypeStats(interp);
+}
+
 
 PyDoc_STRVAR(gc__doc__,
 "This module provides access to the garbage collector for reference cycles.\n"
@@ -482,7 +536,10 @@ PyDoc_STRVAR(gc__doc__,
 "get_referents() -- Return the list of objects that an object refers to.\n"
 "freeze() -- Freeze all tracked objects and ignore them for future collections.\n"
 "unfreeze() -- Unfreeze all objects in the permanent generation.\n"
-"get_freeze_count() -- Return the number of objects in the permanent generation.\n");
+"get_freeze_count() -- Return the number of objects in the permanent generation.\n"
+"enable_type_stats() -- Tally the tracked objects by type during the collections.\n"
+"disable_type_stats() -- Stop tallying the objects by type.\n"
+"get_type_stats() -- Return the number and size of the tracked objects by type.\n");
 
 static PyMethodDef GcMethods[] = {
     GC_ENABLE_METHODDEF
@@ -503,6 +560,9 @@ static PyMethodDef GcMethods[] = {
     GC_FREEZE_METHODDEF
     GC_UNFREEZE_METHODDEF
     GC_GET_FREEZE_COUNT_METHODDEF
+    GC_ENABLE_TYPE_STATS_METHODDEF
+    GC_DISABLE_TYPE_STATS_METHODDEF
+    GC_GET_TYPE_STATS_METHODDEF
     {NULL,      NULL}           /* Sentinel */
 };
 
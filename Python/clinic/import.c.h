@@ -616,6 +616,132 @@ exit:
     return return_value;
 }
 
+PyDoc_STRVAR(_imp__shared_bytecode__doc__,
+"_shared_bytecode($module, enable=None, /)\n"
+"--\n"
+"\n"
+"(internal-only) Enable or disable the shared bytecode cache.\n"
+"\n"
+"Return whether the cache was enabled.  If enable is None, the setting\n"
+"is not changed.  Disabling the cache also empties it.");
+
+#define _IMP__SHARED_BYTECODE_METHODDEF    \
+    {"_shared_bytecode", _PyCFunction_CAST(_imp__shared_bytecode), METH_FASTCALL, _imp__shared_bytecode__doc__},
+
+static PyObject *
+_imp__shared_bytecode_impl(PyObject *module, PyObject *enable);
+
+static PyObject *
+_imp__shared_bytecode(PyObject *module, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    PyObject *enable = Py_None;
+
+    if (!_PyArg_CheckPositional("_shared_bytecode", nargs, 0, 1)) {
+        goto exit;
+    }
+    if (nargs < 1) {
+        goto skip_optional;
+    }
+    enable = args[0];
+skip_optional:
+    return_value = _imp__shared_bytecode_impl(module, enable);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_imp__shared_bytecode_get__doc__,
+"_shared_bytecode_get($module, path, /)\n"
+"--\n"
+"\n"
+"(internal-only) Return the cached contents of a bytecode file, or None.");
+
+#define _IMP__SHARED_BYTECODE_GET_METHODDEF    \
+    {"_shared_bytecode_get", (PyCFunction)_imp__shared_bytecode_get, METH_O, _imp__shared_bytecode_get__doc__},
+
+static PyObject *
+_imp__shared_bytecode_get_impl(PyObject *module, PyObject *path);
+
+static PyObject *
+_imp__shared_bytecode_get(PyObject *module, PyObject *arg)
+{
+    PyObject *return_value = NULL;
+    PyObject *path;
+
+    if (!PyUnicode_Check(arg)) {
+        _PyArg_BadArgument("_shared_bytecode_get", "argument", "str", arg);
+        goto exit;
+    }
+    path = arg;
+    return_value = _imp__shared_bytecode_get_impl(module, path);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_imp__shared_bytecode_set__doc__,
+"_shared_bytecode_set($module, path, data, /)\n"
+"--\n"
+"\n"
+"(internal-only) Cache the contents of a bytecode file.\n"
+"\n"
+"Do nothing if the shared bytecode cache is disabled.");
+
+#define _IMP__SHARED_BYTECODE_SET_METHODDEF    \
+    {"_shared_bytecode_set", _PyCFunction_CAST(_imp__shared_bytecode_set), METH_FASTCALL, _imp__shared_bytecode_set__doc__},
+
+static PyObject *
+_imp__shared_bytecode_set_impl(PyObject *module, PyObject *path,
+                               Py_buffer *data);
+
+static PyObject *
+_imp__shared_bytecode_set(PyObject *module, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    PyObject *path;
+    Py_buffer data = {NULL, NULL};
+
+    if (!_PyArg_CheckPositional("_shared_bytecode_set", nargs, 2, 2)) {
+        goto exit;
+    }
+    if (!PyUnicode_Check(args[0])) {
+        _PyArg_BadArgument("_shared_bytecode_set", "argument 1", "str", args[0]);
+        goto exit;
+    }
+    path = args[0];
+    if (PyObject_GetBuffer(args[1], &data, PyBUF_SIMPLE) != 0) {
+        goto exit;
+    }
+    return_value = _imp__shared_bytecode_set_impl(module, path, &data);
+
+exit:
+    /* Cleanup for data */
+    if (data.obj) {
+       PyBuffer_Release(&data);
+    }
+
+    return return_value;
+}
+
+PyDoc_STRVAR(_imp__shared_bytecode_clear__doc__,
+"_shared_bytecode_clear($module, /)\n"
+"--\n"
+"\n"
+"(internal-only) Empty the shared bytecode cache.");
+
+#define _IMP__SHARED_BYTECODE_CLEAR_METHODDEF    \
+    {"_shared_bytecode_clear", (PyCFunction)_imp__shared_bytecode_clear, METH_NOARGS, _imp__shared_bytecode_clear__doc__},
+
+static PyObject *
+_imp__shared_bytecode_clear_impl(PyObject *module);
+
+static PyObject *
+_imp__shared_bytecode_clear(PyObject *module, PyObject *Py_UNUSED(ignored))
+{
+    return _imp__shared_bytecode_clear_impl(module);
+}
+
 #ifndef _IMP_CREATE_DYNAMIC_METHODDEF
     #define _IMP_CREATE_DYNAMIC_METHODDEF
 #endif /* !defined(_IMP_CREATE_DYNAMIC_METHODDEF) */
@@ -623,4 +749,4 @@ exit:
 #ifndef _IMP_EXEC_DYNAMIC_METHODDEF
     #define _IMP_EXEC_DYNAMIC_METHODDEF
 #endif /* !defined(_IMP_EXEC_DYNAMIC_METHODDEF) */
-/*[clinic end generated code: output=dbd63707bd40b07c input=a9049054013a1b77]*/
+/*[clinic end generated code: output=8ea74cd0c746856a input=a9049054013a1b77]*/
@@ -6,6 +6,7 @@
 #include "pycore_ceval.h"         // _Py_set_eval_breaker_bit()
 #include "pycore_context.h"
 #include "pycore_dict.h"          // _PyDict_MaybeUntrack()
+#include "pycore_hashtable.h"     // _Py_hashtable_new_full()
 #include "pycore_initconfig.h"
 #include "pycore_interp.h"        // PyInterpreterState.gc
 #include "pycore_object.h"
@@ -1394,6 +1395,190 @@ expand_region_transitively_reachable(PyGC_Head *container, PyGC_Head *gc, GCStat
     return arg.size;
 }
 
+/* Statistics of the objects by type, see gc.get_type_stats().
+
+   The incremental collections scan each object once per cycle, so the
+   survivors of the increments of a cycle are tallied in type_stats_pending
+   and the totals are published when the cycle completes.  The survivors of
+   an increment are first counted in a table keyed by borrowed references
+   to their types, which the survivors keep alive, then the table is added
+   to type_stats_pending by the names of the types, so that the types can
+   be freed before the end of the cycle. */
+
+typedef struct {
+    Py_ssize_t count;
+    Py_ssize_t size;
+} type_stats_entry;
+
+static _Py_hashtable_t *
+type_stats_new(void)
+{
+    return _Py_hashtable_new_full(_Py_hashtable_hash_ptr,
+                                  _Py_hashtable_compare_direct,
+                                  NULL, PyMem_Free, NULL);
+}
+
+/* Size of the object, as computed by sys.getsizeof() for the objects
+   whose __sizeof__() is not overridden, and for lists, dicts and sets. */
+static Py_ssize_t
+gc_object_size(PyObject *op)
+{
+    PyTypeObject *tp = Py_TYPE(op);
+    Py_ssize_t size = _PyType_PreHeaderSize(tp);
+    if (PyDict_Check(op)) {
+        return size + _PyDict_SizeOf_LockHeld((PyDictObject *)op);
+    }
+    size += tp->tp_basicsize;
+    if (tp->tp_itemsize > 0) {
+        size += Py_SIZE(op) * tp->tp_itemsize;
+    }
+    if (PyList_Check(op)) {
+        size += ((PyListObject *)op)->allocated * sizeof(PyObject *);
+    }
+    else if (PyAnySet_Check(op)) {
+        PySetObject *so = (PySetObject *)op;
+        if (so->table != so->smalltable) {
+            size += (so->mask + 1) * sizeof(setentry);
+        }
+    }
+    return size;
+}
+
+static int
+type_stats_add(_Py_hashtable_t *table, PyGC_Head *list)
+{
+    PyTypeObject *last_type = NULL;
+    type_stats_entry *entry = NULL;
+    for (PyGC_Head *gc = GC_NEXT(list); gc != list; gc = GC_NEXT(gc)) {
+        PyObject *op = FROM_GC(gc);
+        PyTypeObject *tp = Py_TYPE(op);
+        /* Consecutive objects often have the same type */
+        if (tp != last_type) {
+            entry = _Py_hashtable_get(table, tp);
+            if (entry == NULL) {
+                entry = PyMem_Calloc(1, sizeof(type_stats_entry));
+                if (entry == NULL) {
+                    return -1;
+                }
+                if (_Py_hashtable_set(table, tp, entry) < 0) {
+                    PyMem_Free(entry);
+                    return -1;
+                }
+            }
+            last_type = tp;
+        }
+        entry->count++;
+        entry->size += gc_object_size(op);
+    }
+    return 0;
+}
+
+static int
+type_stats_add_to_dict(_Py_hashtable_t *table, const void *key,
+                       const void *value, void *dict)
+{
+    const type_stats_entry *entry = value;
+    Py_ssize_t count = entry->count;
+    Py_ssize_t size = entry->size;
+    PyObject *name = PyType_GetFullyQualifiedName((PyTypeObject *)key);
+    if (name == NULL) {
+        return -1;
+    }
+    /* Distinct types can have the same name */
+    PyObject *item;
+    if (PyDict_GetItemRef(dict, name, &item) < 0) {
+        Py_DECREF(name);
+        return -1;
+    }
+    if (item != NULL) {
+        count += PyLong_AsSsize_t(PyTuple_GET_ITEM(item, 0));
+        size += PyLong_AsSsize_t(PyTuple_GET_ITEM(item, 1));
+        Py_DECREF(item);
+    }
+    item = Py_BuildValue("(nn)", count, size);
+    if (item == NULL) {
+        Py_DECREF(name);
+        return -1;
+    }
+    int res = PyDict_SetItem(dict, name, item);
+    Py_DECREF(name);
+    Py_DECREF(item);
+    return res;
+}
+
+static void
+type_stats_clear_pending(GCState *gcstate)
+{
+    Py_CLEAR(gcstate->type_stats_pending);
+}
+
+static void
+type_stats_new_pending(GCState *gcstate)
+{
+    type_stats_clear_pending(gcstate);
+    gcstate->type_stats_pending = PyDict_New();
+    if (gcstate->type_stats_pending == NULL) {
+        PyErr_FormatUnraisable("Exception ignored while computing "
+                               "the statistics of the objects by type");
+    }
+}
+
+/* Tally the survivors of a collection into the statistics of the cycle */
+static void
+type_stats_tally(GCState *gcstate, PyGC_Head *survivors)
+{
+    if (gcstate->type_stats_pending == NULL) {
+        return;
+    }
+    _Py_hashtable_t *table = type_stats_new();
+    if (table == NULL
+        || type_stats_add(table, survivors) < 0
+        || _Py_hashtable_foreach(table, type_stats_add_to_dict,
+                                 gcstate->type_stats_pending) != 0)
+    {
+        if (PyErr_Occurred()) {
+            PyErr_FormatUnraisable("Exception ignored while computing "
+                                   "the statistics of the objects by type");
+        }
+        /* Skip the rest of the cycle */
+        type_stats_clear_pending(gcstate);
+    }
+    if (table != NULL) {
+        _Py_hashtable_destroy(table);
+    }
+}
+
+static void
+type_stats_publish_pending(GCState *gcstate)
+{
+    if (gcstate->type_stats_pending != NULL) {
+        Py_XSETREF(gcstate->type_stats, gcstate->type_stats_pending);
+        gcstate->type_stats_pending = NULL;
+    }
+}
+
+void
+_PyGC_EnableTypeStats(PyInterpreterState *interp, int enable)
+{
+    GCState *gcstate = &interp->gc;
+    /* The tallies start with the next cycle */
+    gcstate->type_stats_enabled = enable;
+    if (!enable) {
+        type_stats_clear_pending(gcstate);
+        Py_CLEAR(gcstate->type_stats);
+    }
+}
+
+PyObject *
+_PyGC_GetTypeStats(PyInterpreterState *interp)
+{
+    GCState *gcstate = &interp->gc;
+    if (gcstate->type_stats == NULL) {
+        return PyDict_New();
+    }
+    return PyDict_Copy(gcstate->type_stats);
+}
+
 /* Do bookkeeping for a completed GC cycle */
 static void
 completed_cycle(GCState *gcstate)
@@ -1412,6 +1597,10 @@ completed_cycle(GCState *gcstate)
         gc = next;
     }
     gcstate->work_to_do = 0;
+    type_stats_publish_pending(gcstate);
+    if (gcstate->type_stats_enabled) {
+        type_stats_new_pending(gcstate);
+    }
 }
 
 static void
@@ -1445,6 +1634,7 @@ gc_collect_increment(PyThreadState *tstate, struct gc_collection_stats *stats)
     gc_list_init(&survivors);
     gc_collect_region(tstate, &increment, &survivors, UNTRACK_TUPLES, stats);
     gc_list_validate_space(&survivors, gcstate->visited_space);
+    type_stats_tally(gcstate, &survivors);
     gc_list_merge(&survivors, visited);
     assert(gc_list_is_empty(&increment));
     gcstate->work_to_do += gcstate->heap_size / SCAN_RATE_DIVISOR / scale_factor;
@@ -1477,6 +1667,15 @@ gc_collect_full(PyThreadState *tstate,
     gc_collect_region(tstate, visited, visited,
                       UNTRACK_TUPLES | UNTRACK_DICTS,
                       stats);
+    if (gcstate->type_stats_enabled) {
+        /* The full collection scans all the objects: tally them as a
+           complete cycle */
+        type_stats_new_pending(gcstate);
+        type_stats_tally(gcstate, visited);
+        /* The next increment completes the current cycle, the tallies
+           start again with the following one */
+        type_stats_publish_pending(gcstate);
+    }
     gcstate->young.count = 0;
     gcstate->old[0].count = 0;
     gcstate->old[1].count = 0;
@@ -1903,6 +2102,8 @@ _PyGC_Fini(PyInterpreterState *interp)
     GCState *gcstate = &interp->gc;
     Py_CLEAR(gcstate->garbage);
     Py_CLEAR(gcstate->callbacks);
+    type_stats_clear_pending(gcstate);
+    Py_CLEAR(gcstate->type_stats);
 
     /* We expect that none of this interpreters objects are shared
        with other interpreters.
@@ -4,6 +4,7 @@
 #include "pycore_ceval.h"         // _Py_set_eval_breaker_bit()
 #include "pycore_context.h"
 #include "pycore_dict.h"          // _PyDict_MaybeUntrack()
+#include "pycore_hashtable.h"     // _Py_hashtable_new_full()
 #include "pycore_initconfig.h"
 #include "pycore_interp.h"        // PyInterpreterState.gc
 #include "pycore_object.h"
@@ -60,6 +61,11 @@ struct collection_state {
     struct worklist legacy_finalizers;
     struct worklist wrcb_to_call;
     struct worklist objs_to_decref;
+    /* Number and size of the surviving objects by type, or NULL if the
+       objects are not tallied, see type_stats_count() */
+    _Py_hashtable_t *type_stats;
+    PyTypeObject *type_stats_last_type;
+    void *type_stats_entry;
 };
 
 // iterate over a worklist
@@ -500,6 +506,9 @@ has_legacy_finalizer(PyObject *op)
     return Py_TYPE(op)->tp_del != NULL;
 }
 
+static void
+type_stats_count(struct collection_state *state, PyObject *op);
+
 static bool
 scan_heap_visitor(const mi_heap_t *heap, const mi_heap_area_t *area,
                   void *block, size_t block_size, void *args)
@@ -532,6 +541,9 @@ scan_heap_visitor(const mi_heap_t *heap, const mi_heap_area_t *area,
         // object is reachable, restore `ob_tid`; we're done with these objects
         gc_restore_tid(op);
         state->long_lived_total++;
+        if (state->type_stats != NULL) {
+            type_stats_count(state, op);
+        }
     }
 
     return true;
@@ -1042,6 +1054,11 @@ record_deallocation(PyThreadState *tstate)
     }
 }
 
+static void
+type_stats_keep_types(struct collection_state *state);
+static void
+type_stats_discard(struct collection_state *state);
+
 static void
 gc_collect_internal(PyInterpreterState *interp, struct collection_state *state, int generation)
 {
@@ -1068,6 +1085,9 @@ gc_collect_internal(PyInterpreterState *interp, struct collection_state *state,
         goto error;
     }
 
+    // The type statistics are published after the world is restarted
+    type_stats_keep_types(state);
+
     // Print debugging information.
     if (interp->gc.debug & _PyGC_DEBUG_COLLECTABLE) {
         PyObject *op;
@@ -1112,6 +1132,7 @@ gc_collect_internal(PyInterpreterState *interp, struct collection_state *state,
     return;
 
 error:
+    type_stats_discard(state);
     cleanup_worklist(&state->unreachable);
     cleanup_worklist(&state->legacy_finalizers);
     cleanup_worklist(&state->wrcb_to_call);
@@ -1120,6 +1141,217 @@ gc_collect_internal(PyInterpreterState *interp, struct collection_state *state,
     PyErr_FormatUnraisable("Out of memory during garbage collection");
 }
 
+/* Statistics of the objects by type, see gc.get_type_stats().
+
+   The collections scan the whole heap, so the objects that survive are
+   tallied by scan_heap_visitor() while the world is stopped, in a table
+   keyed by borrowed references to their types.  The types are then
+   referenced until the statistics are published, after the world is
+   restarted. */
+
+typedef struct {
+    Py_ssize_t count;
+    Py_ssize_t size;
+} type_stats_entry;
+
+static _Py_hashtable_t *
+type_stats_new(void)
+{
+    return _Py_hashtable_new_full(_Py_hashtable_hash_ptr,
+                                  _Py_hashtable_compare_direct,
+                                  NULL, PyMem_Free, NULL);
+}
+
+/* Size of the object, as computed by sys.getsizeof() for the objects
+   whose __sizeof__() is not overridden, and for lists, dicts and sets.
+   The world must be stopped. */
+static Py_ssize_t
+gc_object_size(PyObject *op)
+{
+    PyTypeObject *tp = Py_TYPE(op);
+    Py_ssize_t size = _PyType_PreHeaderSize(tp);
+    if (PyDict_Check(op)) {
+        return size + _PyDict_SizeOf_LockHeld((PyDictObject *)op);
+    }
+    size += tp->tp_basicsize;
+    if (tp->tp_itemsize > 0) {
+        size += Py_SIZE(op) * tp->tp_itemsize;
+    }
+    if (PyList_Check(op)) {
+        size += ((PyListObject *)op)->allocated * sizeof(PyObject *);
+    }
+    else if (PyAnySet_Check(op)) {
+        PySetObject *so = (PySetObject *)op;
+        if (so->table != so->smalltable) {
+            size += (so->mask + 1) * sizeof(setentry);
+        }
+    }
+    return size;
+}
+
+/* Tally a surviving object.  The world must be stopped. */
+static void
+type_stats_count(struct collection_state *state, PyObject *op)
+{
+    PyTypeObject *tp = Py_TYPE(op);
+    type_stats_entry *entry = state->type_stats_entry;
+    /* Consecutive objects often have the same type */
+    if (tp != state->type_stats_last_type) {
+        entry = _Py_hashtable_get(state->type_stats, tp);
+        if (entry == NULL) {
+            entry = PyMem_Calloc(1, sizeof(type_stats_entry));
+            if (entry == NULL
+                || _Py_hashtable_set(state->type_stats, tp, entry) < 0)
+            {
+                /* Skip the statistics of this collection */
+                PyMem_Free(entry);
+                type_stats_discard(state);
+                return;
+            }
+        }
+        state->type_stats_last_type = tp;
+        state->type_stats_entry = entry;
+    }
+    entry->count++;
+    entry->size += gc_object_size(op);
+}
+
+static int
+type_stats_incref_type(_Py_hashtable_t *table, const void *key,
+                       const void *value, void *unused)
+{
+    Py_INCREF((PyObject *)key);
+    return 0;
+}
+
+static int
+type_stats_decref_type(_Py_hashtable_t *table, const void *key,
+                       const void *value, void *unused)
+{
+    Py_DECREF((PyObject *)key);
+    return 0;
+}
+
+/* Keep the tallied types alive until the statistics are published.  The
+   world must be stopped, after scan_heap_visitor() restored the ob_tid
+   fields. */
+static void
+type_stats_keep_types(struct collection_state *state)
+{
+    if (state->type_stats != NULL) {
+        _Py_hashtable_foreach(state->type_stats, type_stats_incref_type, NULL);
+    }
+}
+
+/* Destroy the table of a collection whose types were not kept alive */
+static void
+type_stats_discard(struct collection_state *state)
+{
+    if (state->type_stats != NULL) {
+        _Py_hashtable_destroy(state->type_stats);
+        state->type_stats = NULL;
+    }
+}
+
+static int
+type_stats_add_to_dict(_Py_hashtable_t *table, const void *key,
+                       const void *value, void *dict)
+{
+    const type_stats_entry *entry = value;
+    Py_ssize_t count = entry->count;
+    Py_ssize_t size = entry->size;
+    PyObject *name = PyType_GetFullyQualifiedName((PyTypeObject *)key);
+    if (name == NULL) {
+        return -1;
+    }
+    /* Distinct types can have the same name */
+    PyObject *item;
+    if (PyDict_GetItemRef(dict, name, &item) < 0) {
+        Py_DECREF(name);
+        return -1;
+    }
+    if (item != NULL) {
+        count += PyLong_AsSsize_t(PyTuple_GET_ITEM(item, 0));
+        size += PyLong_AsSsize_t(PyTuple_GET_ITEM(item, 1));
+        Py_DECREF(item);
+    }
+    item = Py_BuildValue("(nn)", count, size);
+    if (item == NULL) {
+        Py_DECREF(name);
+        return -1;
+    }
+    int res = PyDict_SetItem(dict, name, item);
+    Py_DECREF(name);
+    Py_DECREF(item);
+    return res;
+}
+
+static void
+type_stats_publish(GCState *gcstate, _Py_hashtable_t *table)
+{
+    PyObject *stats = PyDict_New();
+    if (stats == NULL
+        || _Py_hashtable_foreach(table, type_stats_add_to_dict, stats) != 0)
+    {
+        Py_XDECREF(stats);
+        PyErr_FormatUnraisable("Exception ignored while computing "
+                               "the statistics of the objects by type");
+        return;
+    }
+    PyMutex_Lock(&gcstate->type_stats_mutex);
+    if (gcstate->type_stats_enabled) {
+        PyObject *old = gcstate->type_stats;
+        gcstate->type_stats = stats;
+        stats = old;
+    }
+    PyMutex_Unlock(&gcstate->type_stats_mutex);
+    Py_XDECREF(stats);
+}
+
+/* Publish the statistics tallied by a collection */
+static void
+type_stats_tally(struct collection_state *state)
+{
+    _Py_hashtable_t *table = state->type_stats;
+    if (table == NULL) {
+        return;
+    }
+    state->type_stats = NULL;
+    type_stats_publish(state->gcstate, table);
+    _Py_hashtable_foreach(table, type_stats_decref_type, NULL);
+    _Py_hashtable_destroy(table);
+}
+
+void
+_PyGC_EnableTypeStats(PyInterpreterState *interp, int enable)
+{
+    GCState *gcstate = &interp->gc;
+    PyMutex_Lock(&gcstate->type_stats_mutex);
+    gcstate->type_stats_enabled = enable;
+    PyObject *stats = NULL;
+    if (!enable) {
+        stats = gcstate->type_stats;
+        gcstate->type_stats = NULL;
+    }
+    PyMutex_Unlock(&gcstate->type_stats_mutex);
+    Py_XDECREF(stats);
+}
+
+PyObject *
+_PyGC_GetTypeStats(PyInterpreterState *interp)
+{
+    GCState *gcstate = &interp->gc;
+    PyMutex_Lock(&gcstate->type_stats_mutex);
+    PyObject *stats = Py_XNewRef(gcstate->type_stats);
+    PyMutex_Unlock(&gcstate->type_stats_mutex);
+    if (stats == NULL) {
+        return PyDict_New();
+    }
+    /* The published dicts are not modified */
+    Py_SETREF(stats, PyDict_Copy(stats));
+    return stats;
+}
+
 /* This is the main function.  Read this to understand how the
  * collection process works. */
 static Py_ssize_t
@@ -1178,8 +1410,15 @@ gc_collect_main(PyThreadState *tstate, int generation, _PyGC_Reason reason)
         .gcstate = gcstate,
     };
 
+    if (gcstate->type_stats_enabled && reason != _Py_GC_REASON_SHUTDOWN) {
+        /* Ignore failures: the statistics are not updated */
+        state.type_stats = type_stats_new();
+    }
+
     gc_collect_internal(interp, &state, generation);
 
+    type_stats_tally(&state);
+
     m = state.collected;
     n = state.uncollectable;
 
@@ -1553,6 +1792,7 @@ _PyGC_Fini(PyInterpreterState *interp)
     GCState *gcstate = &interp->gc;
     Py_CLEAR(gcstate->garbage);
     Py_CLEAR(gcstate->callbacks);
+    Py_CLEAR(gcstate->type_stats);
 
     /* We expect that none of this interpreters objects are shared
        with other interpreters.
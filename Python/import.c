@@ -1505,6 +1505,223 @@ _extensions_cache_clear_all(void)
 #undef HTSEP
 
 
+/*******************************/
+/* the shared bytecode cache */
+/*******************************/
+
+/* The path based loaders of every interpreter in the process can share
+   the contents of the bytecode files they read or write, so that a module
+   imported in one interpreter does not need to be read from disk (or
+   compiled, if its bytecode file cannot be written) again in the others.
+   Only bytes are shared: each interpreter validates and unmarshals the
+   data itself, exactly as if it had read the file.  This saves I/O and
+   compilation, not memory: the code objects are not shared. */
+
+#define BYTECODE _PyRuntime.imports.bytecode
+
+/* The cache is bounded: the oldest entries are evicted when the total size
+   of the cached data would exceed this. */
+#define BYTECODE_CACHE_MAX_SIZE (64 * 1024 * 1024)
+
+struct bytecode_cache_value {
+    /* The entries are linked in insertion order, for the eviction. */
+    struct bytecode_cache_value *prev;
+    struct bytecode_cache_value *next;
+    /* The value owns the key. */
+    char *key;
+    size_t size;
+    char data[];
+};
+
+static inline void
+bytecode_lock_acquire(void)
+{
+    PyMutex_Lock(&BYTECODE.mutex);
+}
+
+static inline void
+bytecode_lock_release(void)
+{
+    PyMutex_Unlock(&BYTECODE.mutex);
+}
+
+static int
+bytecode_cache_enabled(void)
+{
+    return _Py_atomic_load_int_relaxed(&BYTECODE.enabled);
+}
+
+static void
+del_bytecode_cache_value(void *value)
+{
+    if (value != NULL) {
+        PyMem_RawFree(((struct bytecode_cache_value *)value)->key);
+        PyMem_RawFree(value);
+    }
+}
+
+/* Return the key of path as a bytes object.  The paths are encoded with
+   surrogatepass, so that undecodable file names (see PEP 383) can be cached
+   too.  Return None if the path cannot be used as a key. */
+static PyObject *
+bytecode_cache_key(PyObject *path)
+{
+    PyObject *key = PyUnicode_AsEncodedString(path, "utf-8", "surrogatepass");
+    if (key == NULL) {
+        return NULL;
+    }
+    if (strlen(PyBytes_AS_STRING(key)) != (size_t)PyBytes_GET_SIZE(key)) {
+        // Embedded null character: not a valid path.
+        Py_DECREF(key);
+        Py_RETURN_NONE;
+    }
+    return key;
+}
+
+/* Remove value from the hashtable and the linked list, and free it.
+   The lock must be held. */
+static void
+bytecode_cache_remove(struct bytecode_cache_value *value)
+{
+    (void)_Py_hashtable_steal(BYTECODE.hashtable, value->key);
+    if (value->prev != NULL) {
+        value->prev->next = value->next;
+    }
+    else {
+        BYTECODE.first = value->next;
+    }
+    if (value->next != NULL) {
+        value->next->prev = value->prev;
+    }
+    else {
+        BYTECODE.last = value->prev;
+    }
+    BYTECODE.size -= value->size;
+    del_bytecode_cache_value(value);
+}
+
+static PyObject *
+_bytecode_cache_get(PyObject *path)
+{
+    PyObject *key = bytecode_cache_key(path);
+    if (key == NULL || key == Py_None) {
+        return key;
+    }
+    PyObject *data = Py_None;
+    bytecode_lock_acquire();
+    if (BYTECODE.hashtable != NULL) {
+        struct bytecode_cache_value *value =
+                _Py_hashtable_get(BYTECODE.hashtable, PyBytes_AS_STRING(key));
+        if (value != NULL) {
+            data = PyBytes_FromStringAndSize(value->data, value->size);
+        }
+    }
+    bytecode_lock_release();
+    Py_DECREF(key);
+    return data == Py_None ? Py_NewRef(data) : data;
+}
+
+static int
+_bytecode_cache_set(PyObject *path, const void *data, size_t size)
+{
+    if (size > BYTECODE_CACHE_MAX_SIZE) {
+        return 0;
+    }
+    PyObject *keyobj = bytecode_cache_key(path);
+    if (keyobj == NULL) {
+        return -1;
+    }
+    if (keyobj == Py_None) {
+        Py_DECREF(keyobj);
+        return 0;
+    }
+    struct bytecode_cache_value *value =
+            PyMem_RawMalloc(sizeof(struct bytecode_cache_value) + size);
+    if (value == NULL) {
+        Py_DECREF(keyobj);
+        PyErr_NoMemory();
+        return -1;
+    }
+    size_t keysize = (size_t)PyBytes_GET_SIZE(keyobj) + 1;
+    value->key = PyMem_RawMalloc(keysize);
+    if (value->key == NULL) {
+        PyMem_RawFree(value);
+        Py_DECREF(keyobj);
+        PyErr_NoMemory();
+        return -1;
+    }
+    memcpy(value->key, PyBytes_AS_STRING(keyobj), keysize);
+    Py_DECREF(keyobj);
+    value->prev = NULL;
+    value->next = NULL;
+    value->size = size;
+    memcpy(value->data, data, size);
+
+    int res = -1;
+    bytecode_lock_acquire();
+    if (BYTECODE.hashtable == NULL) {
+        _Py_hashtable_allocator_t alloc = {PyMem_RawMalloc, PyMem_RawFree};
+        BYTECODE.hashtable = _Py_hashtable_new_full(
+            hashtable_hash_str,
+            hashtable_compare_str,
+            NULL,  // key: owned by the value
+            del_bytecode_cache_value,  // value
+            &alloc
+        );
+        if (BYTECODE.hashtable == NULL) {
+            goto finally;
+        }
+    }
+    struct bytecode_cache_value *old =
+            _Py_hashtable_get(BYTECODE.hashtable, value->key);
+    if (old != NULL) {
+        bytecode_cache_remove(old);
+    }
+    while (BYTECODE.first != NULL
+           && BYTECODE.size + size > BYTECODE_CACHE_MAX_SIZE)
+    {
+        bytecode_cache_remove(BYTECODE.first);
+    }
+    if (_Py_hashtable_set(BYTECODE.hashtable, value->key, value) < 0) {
+        goto finally;
+    }
+    value->prev = BYTECODE.last;
+    if (BYTECODE.last != NULL) {
+        BYTECODE.last->next = value;
+    }
+    else {
+        BYTECODE.first = value;
+    }
+    BYTECODE.last = value;
+    BYTECODE.size += size;
+    value = NULL;
+    res = 0;
+
+finally:
+    bytecode_lock_release();
+    if (res < 0) {
+        del_bytecode_cache_value(value);
+        PyErr_NoMemory();
+    }
+    return res;
+}
+
+static void
+_bytecode_cache_clear(void)
+{
+    bytecode_lock_acquire();
+    _Py_hashtable_t *hashtable = BYTECODE.hashtable;
+    BYTECODE.hashtable = NULL;
+    BYTECODE.first = NULL;
+    BYTECODE.last = NULL;
+    BYTECODE.size = 0;
+    bytecode_lock_release();
+    if (hashtable != NULL) {
+        _Py_hashtable_destroy(hashtable);
+    }
+}
+
+
 static bool
 check_multi_interp_extensions(PyInterpreterState *interp)
 {
@@ -4025,6 +4242,11 @@ _PyImport_Fini(void)
     // ever dlclose() the module files?
     _extensions_cache_clear_all();
 
+    /* The runtime is finalizing, so no other interpreter can use the
+       shared bytecode cache anymore. */
+    _bytecode_cache_clear();
+    _Py_atomic_store_int_relaxed(&BYTECODE.enabled, 0);
+
     /* Use the same memory allocator as _PyImport_Init(). */
     PyMemAllocatorEx old_alloc;
     _PyMem_SetDefaultAllocator(PYMEM_DOMAIN_RAW, &old_alloc);
@@ -4820,6 +5042,94 @@ _imp_source_hash_impl(PyObject *module, long key, Py_buffer *source)
     return PyBytes_FromStringAndSize(hash.data, sizeof(hash.data));
 }
 
+/*[clinic input]
+_imp._shared_bytecode
+
+    enable: object = None
+    /
+
+(internal-only) Enable or disable the shared bytecode cache.
+
+Return whether the cache was enabled.  If enable is None, the setting
+is not changed.  Disabling the cache also empties it.
+[clinic start generated code]*/
+
+static PyObject *
+_imp__shared_bytecode_impl(PyObject *module, PyObject *enable)
+/*[clinic end generated code: output=811646561d91b6d6 input=66e4a8caed1a7903]*/
+{
+    int previous = bytecode_cache_enabled();
+    if (enable != Py_None) {
+        int value = PyObject_IsTrue(enable);
+        if (value < 0) {
+            return NULL;
+        }
+        _Py_atomic_store_int_relaxed(&BYTECODE.enabled, value);
+        if (!value) {
+            _bytecode_cache_clear();
+        }
+    }
+    return PyBool_FromLong(previous);
+}
+
+/*[clinic input]
+_imp._shared_bytecode_get
+
+    path: unicode
+    /
+
+(internal-only) Return the cached contents of a bytecode file, or None.
+[clinic start generated code]*/
+
+static PyObject *
+_imp__shared_bytecode_get_impl(PyObject *module, PyObject *path)
+/*[clinic end generated code: output=de908daaa969e319 input=facb08cb39f2c141]*/
+{
+    if (!bytecode_cache_enabled()) {
+        Py_RETURN_NONE;
+    }
+    return _bytecode_cache_get(path);
+}
+
+/*[clinic input]
+_imp._shared_bytecode_set
+
+    path: unicode
+    data: Py_buffer
+    /
+
+(internal-only) Cache the contents of a bytecode file.
+
+Do nothing if the shared bytecode cache is disabled.
+[clinic start generated code]*/
+
+static PyObject *
+_imp__shared_bytecode_set_impl(PyObject *module, PyObject *path,
+                               Py_buffer *data)
+/*[clinic end generated code: output=28f1ce1556312f72 input=f1477d79aba58766]*/
+{
+    if (bytecode_cache_enabled()) {
+        if (_bytecode_cache_set(path, data->buf, (size_t)data->len) < 0) {
+            return NULL;
+        }
+    }
+    Py_RETURN_NONE;
+}
+
+/*[clinic input]
+_imp._shared_bytecode_clear
+
+(internal-only) Empty the shared bytecode cache.
+[clinic start generated code]*/
+
+static PyObject *
+_imp__shared_bytecode_clear_impl(PyObject *module)
+/*[clinic end generated code: output=90ec69944362b5db input=884c7604a4f15b91]*/
+{
+    _bytecode_cache_clear();
+    Py_RETURN_NONE;
+}
+
 
 PyDoc_STRVAR(doc_imp,
 "(Extremely) low-level import machinery bits as used by importlib.");
@@ -4844,6 +5154,10 @@ static PyMethodDef imp_methods[] = {
     _IMP_EXEC_BUILTIN_METHODDEF
     _IMP__FIX_CO_FILENAME_METHODDEF
     _IMP_SOURCE_HASH_METHODDEF
+    _IMP__SHARED_BYTECODE_METHODDEF
+    _IMP__SHARED_BYTECODE_GET_METHODDEF
+    _IMP__SHARED_BYTECODE_SET_METHODDEF
+    _IMP__SHARED_BYTECODE_CLEAR_METHODDEF
     {NULL, NULL}  /* sentinel */
 };
 
@@ -224,6 +224,8 @@ The following implementation-specific options are available:\n\
 -X showrefcount: output the total reference count and number of used\n\
          memory blocks when the program finishes or after each statement in\n\
          the interactive interpreter; only works on debug builds\n\
+-X sitetime: show how long each step of the site module's initialization\n\
+         takes\n\
 -X tracemalloc[=N]: trace Python memory allocations; N sets a traceback limit\n\
          of N frames (default: 1); also PYTHONTRACEMALLOC=N\n\
 -X utf8[=0|1]: enable (1) or disable (0) UTF-8 mode; also PYTHONUTF8\n\
@@ -241,6 +243,7 @@ static const char usage_envvars[] =
 "                  The default module search path uses %s.\n"
 "PYTHONPLATLIBDIR: override sys.platlibdir\n"
 "PYTHONCASEOK    : ignore case in 'import' statements (Windows)\n"
+"PYTHONIMPORTINDEX: directory of persistent indexes of module locations\n"
 "PYTHONIOENCODING: encoding[:errors] used for stdin/stdout/stderr\n"
 "PYTHONHASHSEED  : if this variable is set to 'random', a random value is used\n"
 "                  to seed the hashes of str and bytes objects.  It can also be\n"
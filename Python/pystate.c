@@ -398,6 +398,7 @@ _Py_COMP_DIAG_POP
         &(runtime)->xi.registry.mutex, \
         &(runtime)->unicode_state.ids.mutex, \
         &(runtime)->imports.extensions.mutex, \
+        &(runtime)->imports.bytecode.mutex, \
         &(runtime)->ceval.pending_mainthread.mutex, \
         &(runtime)->ceval.sys_trace_profile_mutex, \
         &(runtime)->atexit.mutex, \
@@ -223,6 +223,7 @@ static const char* _Py_stdlib_module_names[] = {
 "resource",
 "rlcompleter",
 "runpy",
+"sampleprofile",
 "sched",
 "secrets",
 "select",
@@ -78,6 +78,19 @@ typedef struct {
 #define tracemalloc_tracebacks _PyRuntime.tracemalloc.tracebacks
 #define tracemalloc_traces _PyRuntime.tracemalloc.traces
 #define tracemalloc_domains _PyRuntime.tracemalloc.domains
+#define tracemalloc_stats _PyRuntime.tracemalloc.stats
+
+
+/* Memory blocks allocated at a traceback, maintained once a checkpoint
+   was taken */
+typedef struct {
+    size_t size;
+    size_t count;
+
+    /* size and count when the last checkpoint was taken */
+    size_t checkpoint_size;
+    size_t checkpoint_count;
+} traceback_stat_t;
 
 
 #ifdef TRACE_DEBUG
@@ -439,6 +452,46 @@ tracemalloc_get_traces_table(unsigned int domain)
 }
 
 
+/* Get the statistics of traceback, create them if needed.
+   TABLES_LOCK() must be held and a checkpoint must have been taken. */
+static traceback_stat_t*
+tracemalloc_get_stat(traceback_t *traceback)
+{
+    traceback_stat_t *stat = _Py_hashtable_get(tracemalloc_stats, traceback);
+    if (stat != NULL) {
+        return stat;
+    }
+
+    stat = raw_malloc(sizeof(traceback_stat_t));
+    if (stat == NULL) {
+        return NULL;
+    }
+    memset(stat, 0, sizeof(traceback_stat_t));
+    if (_Py_hashtable_set(tracemalloc_stats, traceback, stat) < 0) {
+        raw_free(stat);
+        return NULL;
+    }
+    return stat;
+}
+
+
+/* Remove trace from the statistics of its traceback.
+   TABLES_LOCK() must be held and a checkpoint must have been taken. */
+static void
+tracemalloc_stat_remove(const trace_t *trace)
+{
+    traceback_stat_t *stat = _Py_hashtable_get(tracemalloc_stats,
+                                               trace->traceback);
+    assert(stat != NULL);
+    if (stat == NULL) {
+        return;
+    }
+    assert(stat->size >= trace->size && stat->count >= 1);
+    stat->size -= trace->size;
+    stat->count--;
+}
+
+
 static void
 tracemalloc_remove_trace(unsigned int domain, uintptr_t ptr)
 {
@@ -455,6 +508,9 @@ tracemalloc_remove_trace(unsigned int domain, uintptr_t ptr)
     }
     assert(tracemalloc_traced_memory >= trace->size);
     tracemalloc_traced_memory -= trace->size;
+    if (tracemalloc_stats != NULL) {
+        tracemalloc_stat_remove(trace);
+    }
     raw_free(trace);
 }
 
@@ -473,6 +529,14 @@ tracemalloc_add_trace(unsigned int domain, uintptr_t ptr,
         return -1;
     }
 
+    traceback_stat_t *stat = NULL;
+    if (tracemalloc_stats != NULL) {
+        stat = tracemalloc_get_stat(traceback);
+        if (stat == NULL) {
+            return -1;
+        }
+    }
+
     _Py_hashtable_t *traces = tracemalloc_get_traces_table(domain);
     if (traces == NULL) {
         traces = tracemalloc_create_traces_table();
@@ -491,6 +555,9 @@ tracemalloc_add_trace(unsigned int domain, uintptr_t ptr,
         /* the memory block is already tracked */
         assert(tracemalloc_traced_memory >= trace->size);
         tracemalloc_traced_memory -= trace->size;
+        if (stat != NULL) {
+            tracemalloc_stat_remove(trace);
+        }
 
         trace->size = size;
         trace->traceback = traceback;
@@ -510,6 +577,11 @@ tracemalloc_add_trace(unsigned int domain, uintptr_t ptr,
         }
     }
 
+    if (stat != NULL) {
+        stat->size += size;
+        stat->count++;
+    }
+
     assert(tracemalloc_traced_memory <= SIZE_MAX - size);
     tracemalloc_traced_memory += size;
     if (tracemalloc_traced_memory > tracemalloc_peak_traced_memory) {
@@ -787,6 +859,10 @@ tracemalloc_clear_traces(void)
     TABLES_LOCK();
     _Py_hashtable_clear(tracemalloc_traces);
     _Py_hashtable_clear(tracemalloc_domains);
+    if (tracemalloc_stats != NULL) {
+        _Py_hashtable_destroy(tracemalloc_stats);
+        tracemalloc_stats = NULL;
+    }
     tracemalloc_traced_memory = 0;
     tracemalloc_peak_traced_memory = 0;
     TABLES_UNLOCK();
@@ -1380,6 +1456,18 @@ _PyTraceMalloc_TraceRef(PyObject *op, PyRefTracerEvent event, void* Py_UNUSED(ig
     if (trace != NULL) {
         /* update the traceback of the memory block */
         traceback_t *traceback = traceback_new();
+        traceback_stat_t *stat = NULL;
+        if (traceback != NULL && tracemalloc_stats != NULL) {
+            stat = tracemalloc_get_stat(traceback);
+            if (stat == NULL) {
+                traceback = NULL;
+            }
+            else {
+                tracemalloc_stat_remove(trace);
+                stat->size += trace->size;
+                stat->count++;
+            }
+        }
         if (traceback != NULL) {
             trace->traceback = traceback;
             res = 0;
@@ -1537,6 +1625,10 @@ _PyTraceMalloc_GetMemory(void) {
     size += _Py_hashtable_size(tracemalloc_traces);
     _Py_hashtable_foreach(tracemalloc_domains,
                           tracemalloc_get_tracemalloc_memory_cb, &size);
+    if (tracemalloc_stats != NULL) {
+        size += _Py_hashtable_size(tracemalloc_stats);
+        size += _Py_hashtable_len(tracemalloc_stats) * sizeof(traceback_stat_t);
+    }
     TABLES_UNLOCK();
     return size;
 }
@@ -1568,3 +1660,241 @@ _PyTraceMalloc_ResetPeak(void)
     tracemalloc_peak_traced_memory = tracemalloc_traced_memory;
     TABLES_UNLOCK();
 }
+
+
+static int
+tracemalloc_stat_add_trace(_Py_hashtable_t *traces,
+                           const void *key, const void *value,
+                           void *user_data)
+{
+    const trace_t *trace = (const trace_t *)value;
+    traceback_stat_t *stat = tracemalloc_get_stat(trace->traceback);
+    if (stat == NULL) {
+        return -1;
+    }
+    stat->size += trace->size;
+    stat->count++;
+    return 0;
+}
+
+
+static int
+tracemalloc_stat_add_domain(_Py_hashtable_t *domains,
+                            const void *key, const void *value,
+                            void *user_data)
+{
+    _Py_hashtable_t *traces = (_Py_hashtable_t *)value;
+    return _Py_hashtable_foreach(traces, tracemalloc_stat_add_trace, NULL);
+}
+
+
+static int
+tracemalloc_stat_checkpoint(_Py_hashtable_t *stats,
+                            const void *key, const void *value,
+                            void *user_data)
+{
+    traceback_stat_t *stat = (traceback_stat_t *)value;
+    stat->checkpoint_size = stat->size;
+    stat->checkpoint_count = stat->count;
+    return 0;
+}
+
+
+/* Create the statistics table from the current traces.
+   TABLES_LOCK() must be held. */
+static int
+tracemalloc_create_stats(void)
+{
+    tracemalloc_stats = hashtable_new(_Py_hashtable_hash_ptr,
+                                      _Py_hashtable_compare_direct,
+                                      NULL, raw_free);
+    if (tracemalloc_stats == NULL) {
+        return -1;
+    }
+
+    int err = _Py_hashtable_foreach(tracemalloc_traces,
+                                    tracemalloc_stat_add_trace, NULL);
+    if (!err) {
+        err = _Py_hashtable_foreach(tracemalloc_domains,
+                                    tracemalloc_stat_add_domain, NULL);
+    }
+    if (err) {
+        _Py_hashtable_destroy(tracemalloc_stats);
+        tracemalloc_stats = NULL;
+        return -1;
+    }
+    return 0;
+}
+
+
+int
+_PyTraceMalloc_Checkpoint(void)
+{
+    if (!tracemalloc_config.tracing) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "the tracemalloc module must be tracing memory "
+                        "allocations to take a checkpoint");
+        return -1;
+    }
+
+    int res = 0;
+    TABLES_LOCK();
+    if (tracemalloc_stats == NULL) {
+        res = tracemalloc_create_stats();
+    }
+    if (res == 0) {
+        _Py_hashtable_foreach(tracemalloc_stats,
+                              tracemalloc_stat_checkpoint, NULL);
+    }
+    TABLES_UNLOCK();
+
+    if (res < 0) {
+        PyErr_NoMemory();
+    }
+    return res;
+}
+
+
+typedef struct {
+    traceback_t *traceback;
+    size_t size;
+    Py_ssize_t size_diff;
+    size_t count;
+    Py_ssize_t count_diff;
+} stat_diff_t;
+
+
+typedef struct {
+    stat_diff_t *diffs;
+    size_t ndiff;
+} get_diffs_t;
+
+
+static int
+tracemalloc_get_diffs_fill(_Py_hashtable_t *stats,
+                           const void *key, const void *value,
+                           void *user_data)
+{
+    get_diffs_t *get_diffs = user_data;
+    const traceback_stat_t *stat = (const traceback_stat_t *)value;
+
+    if (stat->size == stat->checkpoint_size
+        && stat->count == stat->checkpoint_count)
+    {
+        return 0;
+    }
+    stat_diff_t *diff = &get_diffs->diffs[get_diffs->ndiff++];
+    diff->traceback = (traceback_t *)key;
+    diff->size = stat->size;
+    diff->size_diff = (Py_ssize_t)(stat->size - stat->checkpoint_size);
+    diff->count = stat->count;
+    diff->count_diff = (Py_ssize_t)(stat->count - stat->checkpoint_count);
+    return 0;
+}
+
+
+#define CMP(a, b) (((a) > (b)) - ((a) < (b)))
+
+/* Sort by decreasing absolute size difference, size, absolute count
+   difference and count, like StatisticDiff._sort_key() in Python */
+static int
+stat_diff_compare(const void *first, const void *second)
+{
+    const stat_diff_t *a = first, *b = second;
+    size_t abs_a, abs_b;
+    int res;
+
+    abs_a = a->size_diff < 0 ? -(size_t)a->size_diff : (size_t)a->size_diff;
+    abs_b = b->size_diff < 0 ? -(size_t)b->size_diff : (size_t)b->size_diff;
+    if ((res = CMP(abs_b, abs_a)) != 0) {
+        return res;
+    }
+    if ((res = CMP(b->size, a->size)) != 0) {
+        return res;
+    }
+    abs_a = a->count_diff < 0 ? -(size_t)a->count_diff : (size_t)a->count_diff;
+    abs_b = b->count_diff < 0 ? -(size_t)b->count_diff : (size_t)b->count_diff;
+    if ((res = CMP(abs_b, abs_a)) != 0) {
+        return res;
+    }
+    return CMP(b->count, a->count);
+}
+
+#undef CMP
+
+
+PyObject *
+_PyTraceMalloc_GetCheckpointDiff(Py_ssize_t limit, int checkpoint)
+{
+    if (!tracemalloc_config.tracing) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "the tracemalloc module must be tracing memory "
+                        "allocations to compare to a checkpoint");
+        return NULL;
+    }
+
+    get_diffs_t get_diffs = {NULL, 0};
+    int no_checkpoint = 0;
+
+    // Copy the differences so that converting them to Python objects below
+    // doesn't hold the lock.  Tracebacks are only freed by
+    // tracemalloc_clear_traces() which requires the GIL.
+    TABLES_LOCK();
+    if (tracemalloc_stats == NULL) {
+        no_checkpoint = 1;
+    }
+    else {
+        size_t len = _Py_hashtable_len(tracemalloc_stats);
+        get_diffs.diffs = raw_malloc(Py_MAX(len, 1) * sizeof(stat_diff_t));
+        if (get_diffs.diffs != NULL) {
+            _Py_hashtable_foreach(tracemalloc_stats,
+                                  tracemalloc_get_diffs_fill, &get_diffs);
+            if (checkpoint) {
+                _Py_hashtable_foreach(tracemalloc_stats,
+                                      tracemalloc_stat_checkpoint, NULL);
+            }
+        }
+    }
+    TABLES_UNLOCK();
+
+    if (no_checkpoint) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "no checkpoint was taken: call "
+                        "tracemalloc.checkpoint() first");
+        return NULL;
+    }
+    if (get_diffs.diffs == NULL) {
+        return PyErr_NoMemory();
+    }
+
+    qsort(get_diffs.diffs, get_diffs.ndiff, sizeof(stat_diff_t),
+          stat_diff_compare);
+    size_t n = get_diffs.ndiff;
+    if (limit >= 0 && (size_t)limit < n) {
+        n = (size_t)limit;
+    }
+
+    // Convert the differences to a list of tuples
+    set_reentrant(1);
+    PyObject *list = PyList_New(n);
+    for (size_t i = 0; list != NULL && i < n; i++) {
+        stat_diff_t *diff = &get_diffs.diffs[i];
+        PyObject *frames = traceback_to_pyobject(diff->traceback, NULL);
+        PyObject *item = NULL;
+        if (frames != NULL) {
+            item = Py_BuildValue("(Ninnnn)", frames,
+                                 (int)diff->traceback->total_nframe,
+                                 (Py_ssize_t)diff->size, diff->size_diff,
+                                 (Py_ssize_t)diff->count, diff->count_diff);
+        }
+        if (item == NULL) {
+            Py_CLEAR(list);
+            break;
+        }
+        PyList_SET_ITEM(list, i, item);
+    }
+    set_reentrant(0);
+
+    raw_free(get_diffs.diffs);
+    return list;
+}
@@ -17,6 +17,9 @@
 # of times. A fairness of 1/N means that only one thread ever acquired the
 # lock.
 # See https://en.wikipedia.org/wiki/Fairness_measure#Jain's_fairness_index
+#
+# See syncbench.py for the Python-level primitives (threading, queue,
+# concurrent.futures) and shared containers.
 
 from _testinternalcapi import benchmark_locks
 import sys
@@ -0,0 +1,315 @@
+# Measure the throughput and fairness of the Python-level synchronization
+# primitives and shared containers under contention.
+#
+# Usage: python Tools/lockbench/syncbench.py [-t THREADS] [-c LENGTHS]
+#            [-d SECONDS] [-b BENCHMARK ...] [--json FILE]
+#
+# Each benchmark runs its operation in a loop in every thread for the given
+# duration, for each thread count and critical section length:
+#
+#   Lock, RLock, Semaphore, BoundedSemaphore, Condition: acquire, do the
+#     critical section's work, release (and notify for Condition).
+#   Queue, SimpleQueue: put an item then get one from a shared queue.
+#   ThreadPoolExecutor: submit the critical section's work to an executor
+#     with as many workers as threads and wait for its result; the latency
+#     of each round trip is also reported.
+#   dict, list: store then read a key of a shared dict, append to then pop
+#     from a shared list (the critical section's work is done in between).
+#   PyMutex, PyThread_type_lock: the C locks of lockbench.py, if the
+#     _testinternalcapi module is available.
+#
+# How to interpret the results:
+#
+# Operations (kHz): Thousands of operations per second, for all threads
+# together.  With the GIL, the threads mostly take turns, so values for 2+
+# threads mostly measure the cost of switching; on `--disable-gil` builds
+# they measure the scalability of the primitive.
+#
+# Fairness: Jain's fairness index of the numbers of operations of the
+# threads, see lockbench.py.
+#
+# The --json option writes the results, with information about the build, in
+# a machine-readable format for regression tracking.
+
+import argparse
+import concurrent.futures
+import json
+import platform
+import queue
+import statistics
+import sys
+import threading
+import time
+
+
+def jains_fairness(values):
+    # Jain's fairness index
+    # See https://en.wikipedia.org/wiki/Fairness_measure
+    total = sum(values)
+    if not total:
+        return 0.0
+    return (total ** 2) / (len(values) * sum(x ** 2 for x in values))
+
+
+def work(length):
+    # The "work" done in the critical section
+    x = 0
+    for i in range(length):
+        x += i
+    return x
+
+
+class State:
+    running = True
+
+
+def run_threads(num_threads, worker, duration):
+    """Call worker(state) in num_threads threads, set state.running to
+    false after duration seconds, and return the elapsed time and the list
+    of the values returned by the threads."""
+    state = State()
+    results = [None] * num_threads
+    barrier = threading.Barrier(num_threads + 1)
+
+    def target(index):
+        barrier.wait()
+        results[index] = worker(state)
+
+    threads = [threading.Thread(target=target, args=(index,))
+               for index in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    time.sleep(duration)
+    state.running = False
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, results
+
+
+def bench_lock(factory):
+    def bench(num_threads, length, duration):
+        lock = factory()
+
+        def worker(state):
+            count = 0
+            while state.running:
+                with lock:
+                    work(length)
+                count += 1
+            return count
+
+        elapsed, counts = run_threads(num_threads, worker, duration)
+        return elapsed, counts, {}
+    return bench
+
+
+def bench_condition(num_threads, length, duration):
+    cond = threading.Condition()
+
+    def worker(state):
+        count = 0
+        while state.running:
+            with cond:
+                work(length)
+                cond.notify()
+            count += 1
+        return count
+
+    elapsed, counts = run_threads(num_threads, worker, duration)
+    return elapsed, counts, {}
+
+
+def bench_queue(factory):
+    def bench(num_threads, length, duration):
+        q = factory()
+
+        # Every thread gets an item after putting one, so the queue holds
+        # at least as many items as there are threads waiting in get().
+        def worker(state):
+            count = 0
+            while state.running:
+                q.put(count)
+                work(length)
+                q.get()
+                count += 1
+            return count
+
+        elapsed, counts = run_threads(num_threads, worker, duration)
+        return elapsed, counts, {}
+    return bench
+
+
+def bench_executor(num_threads, length, duration):
+    with concurrent.futures.ThreadPoolExecutor(num_threads) as executor:
+        latencies = []
+
+        def worker(state):
+            clock = time.perf_counter
+            times = []
+            while state.running:
+                start = clock()
+                executor.submit(work, length).result()
+                times.append(clock() - start)
+            latencies.extend(times)
+            return len(times)
+
+        elapsed, counts = run_threads(num_threads, worker, duration)
+    extra = {}
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100)
+        extra = {"latency_median_us": statistics.median(latencies) * 1e6,
+                 "latency_p99_us": cuts[98] * 1e6}
+    return elapsed, counts, extra
+
+
+def bench_dict(num_threads, length, duration):
+    shared = {}
+
+    def worker(state):
+        count = 0
+        while state.running:
+            key = count & 1023
+            shared[key] = count
+            work(length)
+            shared.get(key)
+            count += 1
+        return count
+
+    elapsed, counts = run_threads(num_threads, worker, duration)
+    return elapsed, counts, {}
+
+
+def bench_list(num_threads, length, duration):
+    shared = []
+
+    def worker(state):
+        count = 0
+        while state.running:
+            shared.append(count)
+            work(length)
+            shared.pop()
+            count += 1
+        return count
+
+    elapsed, counts = run_threads(num_threads, worker, duration)
+    return elapsed, counts, {}
+
+
+def bench_c_lock(use_pymutex):
+    def bench(num_threads, length, duration):
+        from _testinternalcapi import benchmark_locks
+        time_ms = max(int(duration * 1000), 1)
+        acquisitions, counts = benchmark_locks(num_threads, use_pymutex,
+                                               length, time_ms)
+        # benchmark_locks() reports acquisitions per second
+        elapsed = sum(counts) / acquisitions if acquisitions else duration
+        return elapsed, counts, {}
+    return bench
+
+
+BENCHMARKS = {
+    "Lock": bench_lock(threading.Lock),
+    "RLock": bench_lock(threading.RLock),
+    "Semaphore": bench_lock(threading.Semaphore),
+    "BoundedSemaphore": bench_lock(threading.BoundedSemaphore),
+    "Condition": bench_condition,
+    "Queue": bench_queue(queue.Queue),
+    "SimpleQueue": bench_queue(queue.SimpleQueue),
+    "ThreadPoolExecutor": bench_executor,
+    "dict": bench_dict,
+    "list": bench_list,
+}
+
+try:
+    import _testinternalcapi
+except ImportError:
+    pass
+else:
+    BENCHMARKS["PyMutex"] = bench_c_lock(True)
+    BENCHMARKS["PyThread_type_lock"] = bench_c_lock(False)
+
+
+def int_list(text):
+    try:
+        values = [int(value) for value in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected comma separated integers: {text!r}")
+    if any(value < 0 for value in values):
+        raise argparse.ArgumentTypeError(f"negative value in {text!r}")
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark synchronization primitives under contention.")
+    parser.add_argument("-t", "--threads", type=int_list,
+                        default=[1, 2, 4, 8],
+                        help="comma separated thread counts "
+                             "(default: 1,2,4,8)")
+    parser.add_argument("-c", "--critical-section", type=int_list,
+                        default=[1], metavar="LENGTHS",
+                        help="comma separated lengths of the work done "
+                             "while holding the primitive (default: 1)")
+    parser.add_argument("-d", "--duration", type=float, default=1.0,
+                        help="seconds per measurement (default: 1)")
+    parser.add_argument("-b", "--benchmark", action="append",
+                        choices=list(BENCHMARKS),
+                        help="benchmark to run, can be repeated "
+                             "(default: all)")
+    parser.add_argument("--json", metavar="FILE",
+                        help="write the results as JSON to FILE "
+                             "('-' for stdout)")
+    args = parser.parse_args()
+    if 0 in args.threads:
+        parser.error("thread counts must be positive")
+
+    names = args.benchmark or list(BENCHMARKS)
+    to_stdout = args.json == "-"
+    out = sys.stderr if to_stdout else sys.stdout
+    results = []
+    print("Benchmark           Threads  Length  Operations (kHz)  Fairness",
+          file=out)
+    for name in names:
+        bench = BENCHMARKS[name]
+        for length in args.critical_section:
+            for num_threads in args.threads:
+                elapsed, counts, extra = bench(num_threads, length,
+                                               args.duration)
+                ops_per_sec = sum(counts) / elapsed
+                fairness = jains_fairness(counts)
+                line = (f"{name: <20}{num_threads: >7}{length: >8}"
+                        f"{ops_per_sec / 1000: >18.1f}{fairness: >10.2f}")
+                if "latency_median_us" in extra:
+                    line += (f"  latency median "
+                             f"{extra['latency_median_us']:.1f} us, "
+                             f"p99 {extra['latency_p99_us']:.1f} us")
+                print(line, file=out, flush=True)
+                results.append({"benchmark": name,
+                                "threads": num_threads,
+                                "critical_section_length": length,
+                                "ops_per_sec": ops_per_sec,
+                                "fairness": fairness,
+                                "thread_ops": counts,
+                                **extra})
+
+    if args.json is not None:
+        gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+        data = {"python": sys.version,
+                "platform": platform.platform(),
+                "gil_enabled": gil_enabled,
+                "duration": args.duration,
+                "results": results}
+        if to_stdout:
+            json.dump(data, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+                f.write("\n")
+
+
+if __name__ == "__main__":
+    main()